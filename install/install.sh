@@ -403,6 +403,7 @@ wget -q $REPO/web/templates/taknet-ps-status.html -O /opt/adsb/web/templates/tak
 wget -q $REPO/web/static/css/style.css -O /opt/adsb/web/static/css/style.css
 wget -q $REPO/web/static/js/setup.js -O /opt/adsb/web/static/js/setup.js
 wget -q $REPO/web/static/js/dashboard.js -O /opt/adsb/web/static/js/dashboard.js
+wget -q $REPO/web/static/js/jobs.js -O /opt/adsb/web/static/js/jobs.js
 wget -q $REPO/web/static/taknet-ps_shield.png -O /opt/adsb/web/static/taknet-ps_shield.png 2>/dev/null || echo "  (logo not found, skipping)"
 chmod +x /opt/adsb/web/app.py
 
@@ -1112,6 +1113,7 @@ WorkingDirectory=/opt/adsb/config
 EnvironmentFile=/opt/adsb/config/.env
 ExecStartPre=/usr/bin/python3 /opt/adsb/scripts/config_builder.py
 ExecStart=/usr/bin/docker compose up -d --no-color
+ExecStartPost=/usr/bin/python3 /opt/adsb/scripts/config_builder.py --mark-deployed
 ExecStartPost=/bin/bash -c 'echo "Waiting for containers to be ready..." >&2; \
     max_attempts=60; \
     attempt=0; \
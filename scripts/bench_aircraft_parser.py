@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: projected aircraft.json parser vs json.load
+Generates a readsb-style aircraft.json and times the web app's
+AircraftJSONReader against a full json.load + per-aircraft dict walk
+
+Usage: bench_aircraft_parser.py [aircraft_count] [iterations]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# web/app.py (run from the repo, or /opt/adsb when installed)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'web'))
+
+from app import AircraftJSONReader
+
+def make_aircraft_json(count, now=1700000000.0):
+    """aircraft.json in readsb's layout: header, then one aircraft object per line"""
+    rng = random.Random(1090)
+    lines = []
+    for i in range(count):
+        aircraft = {
+            'hex': f'{rng.randrange(0x1000000):06x}',
+            'type': 'adsb_icao',
+            'flight': f'TST{i:04d} ',
+            'alt_baro': rng.randrange(0, 40000, 25),
+            'gs': round(rng.uniform(100, 500), 1),
+            'track': round(rng.uniform(0, 360), 2),
+            'squawk': f'{rng.randrange(7777):04d}',
+            'nav_modes': ['autopilot', 'tcas'],
+            'mlat': [],
+            'tisb': [],
+            'messages': rng.randrange(10, 50000),
+            'seen': round(rng.uniform(0, 90), 1),
+            'rssi': round(rng.uniform(-30, -3), 1)
+        }
+        roll = rng.random()
+        if roll < 0.7:
+            aircraft['lat'] = round(rng.uniform(30, 40), 6)
+            aircraft['lon'] = round(rng.uniform(-120, -110), 6)
+            aircraft['seen_pos'] = round(rng.uniform(0, 90), 1)
+        elif roll < 0.8:
+            aircraft['lastPosition'] = {
+                'lat': round(rng.uniform(30, 40), 6),
+                'lon': round(rng.uniform(-120, -110), 6),
+                'nic': 8, 'rc': 186,
+                'seen_pos': round(rng.uniform(60, 300), 1)
+            }
+        lines.append(json.dumps(aircraft, separators=(',', ':')))
+    return (
+        f'{{ "now" : {now:.1f},\n  "messages" : 123456789,\n  "aircraft" : [\n'
+        + ',\n'.join(lines)
+        + '\n  ]\n}\n'
+    ).encode()
+
+def summarize_full(path):
+    """Reference: json.load the whole document, then aggregate the same way"""
+    return AircraftJSONReader._summarize_decoded(path.read_bytes())
+
+def peak_kb(fn):
+    """Peak Python allocation while running fn once"""
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def timed(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    return (time.perf_counter() - start) / iterations * 1000, result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'aircraft.json'
+        data = make_aircraft_json(count)
+        path.write_bytes(data)
+        print(f"aircraft.json: {count} aircraft, {len(data) / 1024:.0f} KB, {iterations} iterations")
+
+        full_ms, expected = timed(lambda: summarize_full(path), iterations)
+        projected_ms, result = timed(lambda: AircraftJSONReader.summarize(path.read_bytes()), iterations)
+        if result != expected:
+            print(f"✗ Results differ:\n  json.load: {expected}\n  projected: {result}")
+            return 1
+
+        # Same snapshot rewritten (new mtime, same `now`): only the header is read
+        reader = AircraftJSONReader(path)
+        reader.get()
+        def rewrite_same_now():
+            os.utime(path)
+            reader._signature = None  # mtime resolution can hide back-to-back rewrites
+            return reader.get()
+        unchanged_ms, _ = timed(rewrite_same_now, iterations)
+
+        full_kb = peak_kb(lambda: summarize_full(path))
+        projected_kb = peak_kb(lambda: AircraftJSONReader.summarize(path.read_bytes()))
+
+        print(f"  json.load + dicts      {full_ms:8.3f} ms  peak {full_kb:7.0f} KB")
+        print(f"  projected parser       {projected_ms:8.3f} ms  peak {projected_kb:7.0f} KB"
+              f"  ({full_ms / projected_ms:.1f}x faster)")
+        print(f"  unchanged `now`        {unchanged_ms:8.3f} ms  (parses: {reader.parse_count})")
+        print(f"✓ Results match: {result}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,10 +6,109 @@ Builds ULTRAFEEDER_CONFIG with TAKNET-PS Server as hardcoded priority
 Supports primary/fallback connection modes with automatic configuration repair
 """
 
+import os
+import re
 import sys
+import json
+import shutil
 import socket
+import hashlib
+import tempfile
+import threading
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX development hosts
+    fcntl = None
+
+_env_write_lock = threading.Lock()
+_log_sink = threading.local()
+
+ENV_FILE = Path("/opt/adsb/config/.env")
+COMPOSE_FILE = Path("/opt/adsb/config/docker-compose.yml")
+BUILD_STATE_FILE = Path("/opt/adsb/config/.build-state.json")
+
+# Tailnet that TAKNET-PS feeders must be joined to for the primary (secure) host
+TAKNET_TAILNET_SUFFIX = 'tail4d77be.ts.net'
+
+# Optional in-process source of `tailscale status --json` data (see set_tailscale_status_source)
+_tailscale_status_source = None
+
+_ENV_REFERENCE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)')
+
+class BuildResult:
+    """Outcome of an in-process build (see build())"""
+
+    def __init__(self, env_vars, ultrafeeder_config, compose, repairs, log):
+        self.env_vars = env_vars                      # env after repairs + ULTRAFEEDER_CONFIG
+        self.ultrafeeder_config = ultrafeeder_config  # ULTRAFEEDER_CONFIG string
+        self.compose = compose                        # docker-compose.yml as a dict
+        self.repairs = repairs                        # [(key, old_value, new_value), ...]
+        self.log = log                                # builder output lines
+        self.service_digests = compute_service_digests(compose, env_vars)
+        self.digest = _digest({'ultrafeeder_config': ultrafeeder_config, 'services': self.service_digests})
+        self.files_changed = False                    # set by apply_build()
+        self.changed_services = list(self.service_digests)  # vs. last deployed state
+
+    @property
+    def unchanged(self):
+        """True when no service differs from what was last deployed"""
+        return not self.changed_services
+
+    @property
+    def active_feeds(self):
+        return len(self.ultrafeeder_config.split(';')) if self.ultrafeeder_config else 0
+
+def _digest(obj):
+    """Stable SHA-256 of a JSON-serialisable structure"""
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+def compute_service_digests(compose, env_vars):
+    """
+    Digest each service's effective definition
+    Includes the values of every ${VAR} the service interpolates from .env,
+    so e.g. a new ULTRAFEEDER_CONFIG marks ultrafeeder (and only it) as changed
+    """
+    networks = compose.get('networks')
+    digests = {}
+    for name, service in compose.get('services', {}).items():
+        references = sorted(set(_ENV_REFERENCE.findall(json.dumps(service))))
+        digests[name] = _digest({
+            'service': service,
+            'networks': networks,
+            'env': {key: env_vars.get(key) for key in references}
+        })
+    return digests
+
+def read_build_state(state_file=BUILD_STATE_FILE):
+    """Digests recorded by the last successful deploy ({} if none)"""
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def mark_deployed(result, services=None, state_file=BUILD_STATE_FILE):
+    """Record that `services` (default: all) are now running this build's definitions"""
+    services = set(result.service_digests if services is None else services)
+    state = read_build_state(state_file)
+    deployed = state.get('services', {})
+    for name in services:
+        if name in result.service_digests:
+            deployed[name] = result.service_digests[name]
+    state['services'] = deployed
+    state['digest'] = result.digest
+    _atomic_write_text(state_file, json.dumps(state, indent=2, sort_keys=True) + '\n')
+    result.changed_services = [name for name in result.changed_services if name not in services]
+
+def log(message):
+    """Print a builder message and record it for the in-process caller, if any"""
+    print(message)
+    lines = getattr(_log_sink, 'lines', None)
+    if lines is not None:
+        lines.append(message)
+
 def read_env(env_file):
     """Read .env file and return as dict"""
     env_vars = {}
@@ -21,31 +120,100 @@ def read_env(env_file):
                 env_vars[key.strip()] = value.strip()
     return env_vars
 
+def _atomic_write_text(path, text):
+    """Write via temp file + fsync + rename so readers never see a torn file"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{path.name}.tmp.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(str(path.parent), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+def update_env_file(env_file, updates):
+    """
+    Apply a batch of KEY=VALUE changes to a .env file in a single pass
+    Comments, blank lines and key order are preserved; unknown keys are appended.
+    The write is atomic and skipped entirely when nothing would change.
+    Shared by the web app and this builder.
+    Returns: True if the file was rewritten
+    """
+    env_file = Path(env_file)
+    updates = {key: str(value) for key, value in updates.items()}
+    
+    with _env_write_lock:
+        lock_file = None
+        if fcntl is not None:
+            lock_file = open(env_file.parent / f"{env_file.name}.lock", 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            try:
+                original = env_file.read_text()
+            except FileNotFoundError:
+                original = ''
+            
+            lines = []
+            written = set()
+            for line in original.splitlines(keepends=True):
+                stripped = line.strip()
+                if stripped and not stripped.startswith('#') and '=' in stripped:
+                    key, current = stripped.split('=', 1)
+                    key = key.strip()
+                    if key in updates and current.strip() != updates[key]:
+                        lines.append(f"{key}={updates[key]}\n")
+                        written.add(key)
+                        continue
+                    written.add(key)
+                lines.append(line)
+            
+            missing = [key for key in updates if key not in written]
+            if missing and lines and not lines[-1].endswith('\n'):
+                lines[-1] += '\n'
+            for key in missing:
+                lines.append(f"{key}={updates[key]}\n")
+            
+            text = ''.join(lines)
+            if text == original:
+                return False
+            _atomic_write_text(env_file, text)
+            return True
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
 def write_env(env_file, env_vars):
     """Write env vars back to .env file"""
-    lines = []
-    with open(env_file) as f:
-        for line in f:
-            stripped = line.strip()
-            if stripped and not stripped.startswith('#') and '=' in stripped:
-                key = stripped.split('=', 1)[0].strip()
-                if key in env_vars:
-                    lines.append(f"{key}={env_vars[key]}\n")
-                else:
-                    lines.append(line)
-            else:
-                lines.append(line)
-    
-    with open(env_file, 'w') as f:
-        f.writelines(lines)
+    return update_env_file(env_file, env_vars)
 
-def ensure_taknet_config(env_vars, env_file):
+def repair_taknet_config(env_vars):
     """
     Ensure TAKNET-PS configuration exists
     Builds missing values automatically to prevent user skip
     Uses FQDNs for automatic Tailscale detection
     Migrates old IP addresses to FQDNs
-    Returns: (env_vars, was_repaired)
+    Updates env_vars in place, returns: [(key, old_value, new_value), ...]
     """
     required_config = {
         'TAKNET_PS_ENABLED': 'true',
@@ -57,14 +225,14 @@ def ensure_taknet_config(env_vars, env_file):
         'TAKNET_PS_MLAT_PORT': '30105'
     }
     
-    was_repaired = False
+    repairs = []
     
     # First pass: add missing keys
     for key, default_value in required_config.items():
         if key not in env_vars or not env_vars[key]:
-            print(f"⚠ Missing {key}, auto-configuring: {default_value}")
+            log(f"⚠ Missing {key}, auto-configuring: {default_value}")
+            repairs.append((key, env_vars.get(key), default_value))
             env_vars[key] = default_value
-            was_repaired = True
     
     # Second pass: migrate old IP values to FQDNs
     ip_migrations = {
@@ -80,16 +248,25 @@ def ensure_taknet_config(env_vars, env_file):
             old_value = env_vars[key]
             if old_value in ip_migrations:
                 new_value = ip_migrations[old_value]
-                print(f"✓ Migrating {key}: {old_value} → {new_value}")
+                log(f"✓ Migrating {key}: {old_value} → {new_value}")
+                repairs.append((key, old_value, new_value))
                 env_vars[key] = new_value
-                was_repaired = True
+    
+    return repairs
+
+def ensure_taknet_config(env_vars, env_file):
+    """
+    Repair TAKNET-PS configuration and save it if anything changed
+    Returns: (env_vars, was_repaired)
+    """
+    repairs = repair_taknet_config(env_vars)
     
     # Write back if repaired
-    if was_repaired:
-        write_env(env_file, env_vars)
-        print("✓ TAKNET-PS configuration auto-repaired and saved")
+    if repairs:
+        update_env_file(env_file, {key: new for key, _, new in repairs})
+        log("✓ TAKNET-PS configuration auto-repaired and saved")
     
-    return env_vars, was_repaired
+    return env_vars, bool(repairs)
 
 def check_host_reachable(host, port, timeout=2):
     """Check if a host:port is reachable"""
@@ -102,6 +279,52 @@ def check_host_reachable(host, port, timeout=2):
     except:
         return False
 
+def summarize_tailscale_status(status):
+    """
+    Reduce `tailscale status --json` (or LocalAPI /status) output to the fields we use
+    This is the single place the TAKNET-PS tailnet is validated
+    """
+    status = status or {}
+    backend_state = status.get('BackendState', '')
+    self_info = status.get('Self') or {}
+    tailscale_ips = self_info.get('TailscaleIPs') or []
+    dns_name = (self_info.get('DNSName') or '').rstrip('.')  # Remove trailing dot
+    running = backend_state == 'Running'
+    on_correct_tailnet = dns_name.endswith(TAKNET_TAILNET_SUFFIX) if dns_name else False
+    
+    return {
+        'backend_state': backend_state,
+        'running': running,
+        'ips': tailscale_ips,
+        'ip': tailscale_ips[0] if tailscale_ips else None,
+        'dns_name': dns_name,
+        'on_correct_tailnet': on_correct_tailnet,
+        'wrong_tailnet': running and not on_correct_tailnet,
+        'connected': running and on_correct_tailnet and bool(tailscale_ips)
+    }
+
+def set_tailscale_status_source(source):
+    """
+    Let an embedding process (the web app) supply cached Tailscale status
+    source() returns the parsed status dict, None if tailscaled is not running,
+    and raises FileNotFoundError if Tailscale is not installed
+    """
+    global _tailscale_status_source
+    _tailscale_status_source = source
+
+def _tailscale_status_from_cli():
+    """Fallback for standalone CLI runs: `tailscale status --json`"""
+    import subprocess
+    if shutil.which('tailscale') is None:
+        raise FileNotFoundError('tailscale')
+    result = subprocess.run(['tailscale', 'status', '--json'],
+                          capture_output=True,
+                          text=True,
+                          timeout=5)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout)
+
 def check_tailscale_running():
     """
     Check if Tailscale is running and connected to TAKNET-PS tailnet
@@ -109,62 +332,44 @@ def check_tailscale_running():
     """
     import subprocess
     try:
-        # Check if tailscale command exists
-        result = subprocess.run(['which', 'tailscale'], 
-                              capture_output=True, 
-                              timeout=2)
-        if result.returncode != 0:
-            print("⚠ Tailscale: Not installed")
+        source = _tailscale_status_source or _tailscale_status_from_cli
+        try:
+            status = source()
+        except FileNotFoundError:
+            log("⚠ Tailscale: Not installed")
             return (False, None)
         
-        # Check tailscale status
-        result = subprocess.run(['tailscale', 'status', '--json'], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=5)
-        
-        if result.returncode != 0:
-            print("⚠ Tailscale: Not running")
+        if status is None:
+            log("⚠ Tailscale: Not running")
             return (False, None)
         
-        # Parse JSON output
-        import json
-        status = json.loads(result.stdout)
+        summary = summarize_tailscale_status(status)
         
         # Check if we're connected (BackendState should be "Running")
-        backend_state = status.get('BackendState', '')
-        if backend_state == 'Running':
-            # Get our Tailscale IP and DNS name
-            self_info = status.get('Self', {})
-            tailscale_ips = self_info.get('TailscaleIPs', [])
-            dns_name = self_info.get('DNSName', '').rstrip('.')  # Remove trailing dot
-            
-            if tailscale_ips:
-                # CRITICAL: Verify we're on the TAKNET-PS tailnet
-                expected_suffix = 'tail4d77be.ts.net'
-                
-                if dns_name.endswith(expected_suffix):
-                    # Correct tailnet!
-                    print(f"✓ Tailscale: Running on TAKNET-PS tailnet ({tailscale_ips[0]})")
-                    print(f"  DNS: {dns_name}")
-                    return (True, tailscale_ips[0])
-                else:
-                    # Wrong tailnet - private or different network
-                    print(f"❌ Tailscale: Connected to WRONG tailnet!")
-                    print(f"   Current: {dns_name}")
-                    print(f"   Expected: *.{expected_suffix}")
-                    print(f"   This is NOT the TAKNET-PS network.")
-                    print(f"   Falling back to public IP connection.")
-                    return (False, None)
+        if summary['running'] and summary['ip']:
+            # CRITICAL: Verify we're on the TAKNET-PS tailnet
+            if summary['on_correct_tailnet']:
+                # Correct tailnet!
+                log(f"✓ Tailscale: Running on TAKNET-PS tailnet ({summary['ip']})")
+                log(f"  DNS: {summary['dns_name']}")
+                return (True, summary['ip'])
+            else:
+                # Wrong tailnet - private or different network
+                log(f"❌ Tailscale: Connected to WRONG tailnet!")
+                log(f"   Current: {summary['dns_name']}")
+                log(f"   Expected: *.{TAKNET_TAILNET_SUFFIX}")
+                log(f"   This is NOT the TAKNET-PS network.")
+                log(f"   Falling back to public IP connection.")
+                return (False, None)
         
-        print(f"⚠ Tailscale: State={backend_state}")
+        log(f"⚠ Tailscale: State={summary['backend_state']}")
         return (False, None)
         
     except subprocess.TimeoutExpired:
-        print("⚠ Tailscale: Check timed out")
+        log("⚠ Tailscale: Check timed out")
         return (False, None)
     except Exception as e:
-        print(f"⚠ Tailscale: Check failed: {e}")
+        log(f"⚠ Tailscale: Check failed: {e}")
         return (False, None)
 
 def select_taknet_host(env_vars):
@@ -182,11 +387,11 @@ def select_taknet_host(env_vars):
     
     # Force modes (for debugging/override)
     if mode == 'primary' and primary:
-        print(f"ℹ TAKNET-PS: Forced to primary: {primary}")
+        log(f"ℹ TAKNET-PS: Forced to primary: {primary}")
         return (primary, 'primary-forced')
     
     if mode == 'fallback' and fallback:
-        print(f"ℹ TAKNET-PS: Forced to fallback: {fallback}")
+        log(f"ℹ TAKNET-PS: Forced to fallback: {fallback}")
         return (fallback, 'fallback-forced')
     
     # Auto mode - detect Tailscale and select appropriate FQDN
@@ -195,16 +400,16 @@ def select_taknet_host(env_vars):
         
         if tailscale_running:
             # Tailscale is running - use primary (secure.tak-solutions.com)
-            print(f"✓ TAKNET-PS: Tailscale active, using primary: {primary}")
+            log(f"✓ TAKNET-PS: Tailscale active, using primary: {primary}")
             return (primary, 'tailscale-active')
         else:
             # Tailscale is NOT running - use fallback (adsb.tak-solutions.com)
-            print(f"⚠ TAKNET-PS: Tailscale inactive, using fallback: {fallback}")
+            log(f"⚠ TAKNET-PS: Tailscale inactive, using fallback: {fallback}")
             return (fallback, 'tailscale-inactive')
     
     # Monitor mode (Phase 2) - use primary, external monitor will handle failover
     if mode == 'monitor' and primary:
-        print(f"ℹ TAKNET-PS: Monitor mode, using primary: {primary}")
+        log(f"ℹ TAKNET-PS: Monitor mode, using primary: {primary}")
         return (primary, 'monitor-mode')
     
     # Fallback to primary if nothing else works
@@ -228,26 +433,26 @@ def build_config(env_vars):
         if taknet_host:
             # Beast feed
             config_parts.append(f"adsb,{taknet_host},{port},beast_reduce_plus_out")
-            print(f"✓ TAKNET-PS Beast: {taknet_host}:{port} ({connection_type})")
+            log(f"✓ TAKNET-PS Beast: {taknet_host}:{port} ({connection_type})")
             
             # MLAT feed (if enabled)
             if env_vars.get('TAKNET_PS_MLAT_ENABLED', 'true').lower() == 'true':
                 config_parts.append(f"mlat,{taknet_host},{mlat_port},39001")
-                print(f"✓ TAKNET-PS MLAT: {taknet_host}:{mlat_port}")
+                log(f"✓ TAKNET-PS MLAT: {taknet_host}:{mlat_port}")
             else:
-                print("ℹ TAKNET-PS MLAT: Disabled")
+                log("ℹ TAKNET-PS MLAT: Disabled")
         else:
-            print("✗ TAKNET-PS Server: No valid host configuration found")
+            log("✗ TAKNET-PS Server: No valid host configuration found")
     else:
-        print("ℹ TAKNET-PS Server: Disabled (not recommended)")
+        log("ℹ TAKNET-PS Server: Disabled (not recommended)")
     
     # FlightRadar24 - Uses dedicated container, not ultrafeeder
     # The FR24 container connects directly to ultrafeeder's Beast output
     if env_vars.get('FR24_ENABLED', '').lower() == 'true':
         if env_vars.get('FR24_SHARING_KEY', '').strip():
-            print("✓ FlightRadar24 (via dedicated container)")
+            log("✓ FlightRadar24 (via dedicated container)")
         else:
-            print("⚠ FlightRadar24 enabled but no sharing key provided")
+            log("⚠ FlightRadar24 enabled but no sharing key provided")
     
     # adsb.fi
     if env_vars.get('ADSBFI_ENABLED', '').lower() == 'true':
@@ -255,7 +460,7 @@ def build_config(env_vars):
         # but it's better to track your station
         config_parts.append("adsb,feed.adsb.fi,30004,beast_reduce_plus_out")
         config_parts.append("mlat,feed.adsb.fi,31090,39003")
-        print("✓ adsb.fi")
+        log("✓ adsb.fi")
     
     # adsb.lol
     if env_vars.get('ADSBLOL_ENABLED', '').lower() == 'true':
@@ -264,9 +469,9 @@ def build_config(env_vars):
         if feeder_uuid:
             config_parts.append("adsb,feed.adsb.lol,30004,beast_reduce_plus_out")
             config_parts.append("mlat,in.adsb.lol,31090,39001")
-            print(f"✓ adsb.lol (UUID: {feeder_uuid[:8]}...)")
+            log(f"✓ adsb.lol (UUID: {feeder_uuid[:8]}...)")
         else:
-            print("⚠ adsb.lol enabled but no UUID found - skipping")
+            log("⚠ adsb.lol enabled but no UUID found - skipping")
     
     # ADSBexchange
     if env_vars.get('ADSBX_ENABLED', '').lower() == 'true':
@@ -275,18 +480,40 @@ def build_config(env_vars):
         if feeder_uuid:
             config_parts.append(f"adsb,feed1.adsbexchange.com,30004,beast_reduce_plus_out,uuid={feeder_uuid}")
             config_parts.append(f"mlat,feed.adsbexchange.com,31090,39004,uuid={feeder_uuid}")
-            print(f"✓ ADSBexchange (UUID: {feeder_uuid[:8]}...)")
+            log(f"✓ ADSBexchange (UUID: {feeder_uuid[:8]}...)")
         else:
-            print("⚠ ADSBexchange enabled but no UUID found - skipping")
+            log("⚠ ADSBexchange enabled but no UUID found - skipping")
     
     # Airplanes.Live (no UUID required - they identify by IP address)
     if env_vars.get('AIRPLANESLIVE_ENABLED', '').lower() == 'true':
         config_parts.append("adsb,feed.airplanes.live,30004,beast_reduce_plus_out")
         config_parts.append("mlat,feed.airplanes.live,31090,39002")
-        print("✓ Airplanes.Live")
+        log("✓ Airplanes.Live")
     
     return ';'.join(config_parts)
 
+def parse_ultrafeeder_config(config):
+    """
+    Parse an ULTRAFEEDER_CONFIG string back into its adsb/mlat feed entries
+    Returns: [{'type', 'host', 'port', 'options'}] in config order
+    """
+    feeds = []
+    for part in (config or '').split(';'):
+        fields = [f.strip() for f in part.split(',')]
+        if len(fields) < 3 or fields[0] not in ('adsb', 'mlat'):
+            continue
+        try:
+            port = int(fields[2])
+        except ValueError:
+            continue
+        feeds.append({
+            'type': fields[0],
+            'host': fields[1],
+            'port': port,
+            'options': fields[3:]
+        })
+    return feeds
+
 def build_docker_compose(env_vars):
     """Build docker-compose.yml with conditional FR24 service"""
     compose = {
@@ -394,42 +621,99 @@ def build_docker_compose(env_vars):
     return compose
 
 def write_docker_compose(compose_dict, compose_file):
-    """Write docker-compose.yml from dict"""
+    """
+    Write docker-compose.yml from dict
+    Skips the write when the file already has identical content
+    Returns: True if the file was rewritten
+    """
     import yaml
-    with open(compose_file, 'w') as f:
-        yaml.dump(compose_dict, f, default_flow_style=False, sort_keys=False)
+    text = yaml.dump(compose_dict, default_flow_style=False, sort_keys=False)
+    try:
+        if Path(compose_file).read_text() == text:
+            return False
+    except FileNotFoundError:
+        pass
+    _atomic_write_text(compose_file, text)
+    return True
+
+def build(env_vars):
+    """
+    Build everything from an env dict without touching the filesystem
+    Returns a BuildResult (ULTRAFEEDER_CONFIG, compose dict, repairs, log lines)
+    """
+    env_vars = dict(env_vars)
+    previous_sink = getattr(_log_sink, 'lines', None)
+    _log_sink.lines = lines = []
+    try:
+        # Ensure TAKNET-PS config exists (auto-repair if missing)
+        repairs = repair_taknet_config(env_vars)
+        
+        # Build config
+        config_str = build_config(env_vars)
+        env_vars['ULTRAFEEDER_CONFIG'] = config_str
+        
+        # Build docker-compose.yml
+        compose_dict = build_docker_compose(env_vars)
+    finally:
+        _log_sink.lines = previous_sink
+    
+    return BuildResult(env_vars, config_str, compose_dict, repairs, lines)
+
+def apply_build(result, env_file=ENV_FILE, compose_file=COMPOSE_FILE, state_file=BUILD_STATE_FILE):
+    """
+    Persist a BuildResult: repaired keys + ULTRAFEEDER_CONFIG to .env, and the compose file
+    Identical content is never rewritten. Also works out which services differ
+    from the last deployed state (result.changed_services / result.unchanged)
+    """
+    changes = {key: new for key, _, new in result.repairs}
+    changes['ULTRAFEEDER_CONFIG'] = result.ultrafeeder_config
+    env_written = update_env_file(env_file, changes)
+    compose_written = write_docker_compose(result.compose, compose_file)
+    result.files_changed = env_written or compose_written
+    
+    deployed = read_build_state(state_file).get('services', {})
+    result.changed_services = [
+        name for name, digest in result.service_digests.items()
+        if deployed.get(name) != digest
+    ]
+    if result.unchanged:
+        message = "✓ Configuration unchanged since last deploy"
+    else:
+        message = f"ℹ Services with changed definitions: {', '.join(result.changed_services)}"
+    log(message)
+    result.log.append(message)
+
+def run(env_file=ENV_FILE, compose_file=COMPOSE_FILE, state_file=BUILD_STATE_FILE):
+    """Read .env, build, and write the results - the importable equivalent of main()"""
+    env_file = Path(env_file)
+    if not env_file.exists():
+        raise FileNotFoundError(f"{env_file} not found")
+    
+    result = build(read_env(env_file))
+    apply_build(result, env_file, compose_file, state_file)
+    return result
 
 def main():
-    env_file = Path("/opt/adsb/config/.env")
+    env_file = ENV_FILE
     
     if not env_file.exists():
         print(f"✗ Error: {env_file} not found")
         sys.exit(1)
     
-    # Read environment
-    env_vars = read_env(env_file)
-    
-    # Ensure TAKNET-PS config exists (auto-repair if missing)
-    env_vars, was_repaired = ensure_taknet_config(env_vars, env_file)
-    
-    # Build config
-    config_str = build_config(env_vars)
-    
-    # Update ULTRAFEEDER_CONFIG
-    env_vars['ULTRAFEEDER_CONFIG'] = config_str
-    
-    # Write back to .env
-    write_env(env_file, env_vars)
+    # ultrafeeder.service ExecStartPost: `docker compose up -d` just brought every
+    # service up from the files ExecStartPre wrote - record that as deployed
+    if '--mark-deployed' in sys.argv[1:]:
+        result = build(read_env(env_file))
+        mark_deployed(result)
+        print(f"✓ Recorded deployed state for {len(result.service_digests)} services")
+        return
     
-    # Build and write docker-compose.yml
-    compose_dict = build_docker_compose(env_vars)
-    compose_file = Path("/opt/adsb/config/docker-compose.yml")
-    write_docker_compose(compose_dict, compose_file)
+    result = run(env_file, COMPOSE_FILE)
     
     print(f"\n✓ Configuration built successfully")
-    if was_repaired:
+    if result.repairs:
         print("✓ Missing TAKNET-PS settings were automatically configured")
-    print(f"Active feeds: {len(config_str.split(';')) if config_str else 0}")
+    print(f"Active feeds: {result.active_feeds}")
 
 if __name__ == "__main__":
     main()
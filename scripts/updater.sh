@@ -110,6 +110,37 @@ run_update() {
     fi
 }
 
+# Function to pre-pull container images while the old containers keep running
+stage_images() {
+    echo "📦 Staging container images (feeds stay up while images download)..."
+    
+    RESPONSE=$(curl -sf -X POST -H 'Content-Type: application/json' -d '{"refresh": true}' \
+        http://127.0.0.1:5000/api/images/stage)
+    STAGE_ID=$(echo "$RESPONSE" | grep -o '"id": *"[0-9a-f]*"' | grep -o '[0-9a-f]*"$' | tr -d '"')
+    if [ -z "$STAGE_ID" ]; then
+        echo "   ⚠ Image staging unavailable - images will be pulled on restart"
+        return 0
+    fi
+    
+    # Poll our own stage (a deploy may be staging too) for up to 30 minutes (slow LTE
+    # links); a restarted web service resumes the plan under the same id
+    for i in $(seq 1 360); do
+        sleep 5
+        STATUS=$(curl -sf "http://127.0.0.1:5000/api/images/stage?id=$STAGE_ID") || continue
+        if echo "$STATUS" | grep -q '"status": *"done"'; then
+            echo "   ✓ Images staged"
+            return 0
+        fi
+        if echo "$STATUS" | grep -q '"status": *"failed"'; then
+            echo "   ⚠ Image staging failed - images will be pulled on restart"
+            return 0
+        fi
+    done
+    
+    echo "   ⚠ Image staging still running - continuing with restart"
+    return 0
+}
+
 # Function to restart services
 restart_services() {
     echo "🔄 Restarting services..."
@@ -165,7 +196,8 @@ main() {
     
     echo ""
     
-    # Step 4: Restart services
+    # Step 4: Stage images, then restart services (downtime is just the container swap)
+    stage_images
     restart_services
     
     # Show new version
@@ -4,15 +4,29 @@ TAKNET-PS-ADSB-Feeder Web Interface v2.1
 Flask app with Tailscale hostname management
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
 import subprocess
 import os
+import sys
 from pathlib import Path
 import json
 import threading
 import time
 import uuid
+import re
+import hashlib
+import struct
+import tempfile
+import queue
 import socket
+import http.client
+from types import MappingProxyType
+import calendar
+import atexit
+import signal
+from array import array
+from collections import deque
+from urllib.parse import quote, urlencode, urlsplit
 
 app = Flask(__name__)
 
@@ -26,47 +40,264 @@ def get_version():
 
 VERSION = get_version()
 
-# Global progress tracking
-service_progress = {
+# =============================================================
+# Background Jobs
+# =============================================================
+
+progress_changed = threading.Event()  # Wakes the dashboard event producer
+
+class Job:
+    """
+    One long-running operation: status, kind-specific progress, log lines and
+    result. Work functions reach their job through jobs.current()
+    """
+
+    def __init__(self, engine, kind, fn, args, progress=None, log_lines=500, group=None):
+        self._engine = engine
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.group = group or kind  # Jobs sharing a group run one at a time
+        self.fn = fn
+        self.args = tuple(args)
+        self.status = 'queued'  # queued, running, succeeded, failed
+        self.progress = dict(progress or {})
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._log = deque(maxlen=log_lines)
+        self._log_start = 0  # Absolute index of the oldest retained line
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def update(self, **fields):
+        """Merge fields into the progress dict"""
+        with self._engine._cond:
+            self.progress.update(fields)
+            self._engine._touch(self)
+
+    def set_progress(self, progress):
+        """Replace the progress dict"""
+        with self._engine._cond:
+            self.progress = dict(progress)
+            self._engine._touch(self)
+
+    def log(self, line):
+        with self._engine._cond:
+            if len(self._log) == self._log.maxlen:
+                self._log_start += 1
+            self._log.append(line.rstrip())
+            self._engine._touch(self)
+
+    def fail(self, error):
+        """Mark the job failed once its function returns (for work that reports rather than raises)"""
+        with self._engine._cond:
+            self.error = str(error)
+            self._engine._touch(self)
+
+    def snapshot(self, log_since=0):
+        """JSON-ready state; `log` holds lines from absolute index log_since on (None: no lines)"""
+        with self._engine._cond:
+            lines = [] if log_since is None else list(self._log)[max(log_since - self._log_start, 0):]
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'progress': dict(self.progress),
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'version': self.version,
+                'log': lines,
+                'log_next': self._log_start + len(self._log)
+            }
+
+class JobEngine:
+    """
+    Bounded worker pool for operations too slow for a request thread
+    Handlers submit() and return the job id at once; progress, logs and the
+    result are read (or streamed) from /api/jobs/<id>. Jobs of one group
+    (default: their kind) run one at a time, in submission order
+    """
+
+    def __init__(self, workers=3, keep=50):
+        self.workers = workers
+        self.keep = keep
+        self._cond = threading.Condition()
+        self._jobs = {}  # id -> Job, oldest first
+        self._queue = queue.Queue()
+        self._busy_groups = set()  # Groups with a job queued on, or running in, the pool
+        self._waiting = {}  # group -> deque of jobs held back behind that group's current one
+        self._local = threading.local()
+        self._threads = []
+
+    def _touch(self, job):
+        """Caller holds _cond"""
+        job.version += 1
+        self._cond.notify_all()
+        progress_changed.set()
+
+    def submit(self, kind, fn, args=(), progress=None, dedupe=None, group=None):
+        """
+        Queue fn(*args) as a job of `kind` and return it
+        dedupe='queued' returns a not-yet-started job of the same kind and args
+        instead (it will see the latest state anyway); dedupe='active' also
+        reuses a running one (e.g. a double-clicked registration)
+        group: serialize with other kinds (e.g. everything that runs compose)
+        """
+        args = tuple(args)
+        with self._cond:
+            if dedupe:
+                for job in reversed(list(self._jobs.values())):
+                    if job.kind != kind or job.args != args:
+                        continue
+                    if job.status == 'queued' or (dedupe == 'active' and job.active):
+                        return job
+            
+            job = Job(self, kind, fn, args, progress, group=group)
+            self._jobs[job.id] = job
+            if job.group in self._busy_groups:
+                self._waiting.setdefault(job.group, deque()).append(job)
+            else:
+                self._busy_groups.add(job.group)
+                self._queue.put(job)
+            self._prune()
+            self._touch(job)
+            
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return job
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond `keep` (caller holds _cond)"""
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def latest(self, kind):
+        """Most recently submitted job of `kind`, or None"""
+        with self._cond:
+            for job in reversed(list(self._jobs.values())):
+                if job.kind == kind:
+                    return job
+        return None
+
+    def list(self):
+        with self._cond:
+            return list(reversed(list(self._jobs.values())))
+
+    def current(self):
+        """The job running on this thread, if any"""
+        return getattr(self._local, 'job', None)
+
+    def log(self, line):
+        """Append to the current job's log (no-op outside a job)"""
+        job = self.current()
+        if job is not None:
+            job.log(line)
+
+    def wait(self, job, version, timeout):
+        """Block until job.version moves past `version`; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: job.version != version, timeout)
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            with self._cond:
+                job.status = 'running'
+                job.started_at = time.time()
+                self._touch(job)
+            self._local.job = job
+            
+            try:
+                result = job.fn(*job.args)
+            except Exception as e:
+                print(f"❌ Job {job.kind} ({job.id}) failed: {e}")
+                import traceback
+                traceback.print_exc()
+                result = None
+                if job.error is None:
+                    job.error = str(e)
+            finally:
+                self._local.job = None
+            
+            with self._cond:
+                job.result = result
+                # Handlers' {'success': False, ...} payloads count as failures too
+                if job.error is None and isinstance(result, dict) and result.get('success') is False:
+                    job.error = result.get('message') or 'Failed'
+                job.status = 'failed' if job.error is not None else 'succeeded'
+                job.finished_at = time.time()
+                
+                pending = self._waiting.get(job.group)
+                if pending:
+                    self._queue.put(pending.popleft())
+                else:
+                    self._busy_groups.discard(job.group)
+                self._touch(job)
+
+jobs = JobEngine()
+
+# Every job that runs `docker compose` on the project shares this group
+COMPOSE_JOBS = 'compose'
+
+# /api/service/progress shape of the latest deploy job
+IDLE_PROGRESS = {
     'service': 'idle',
     'progress': 0,
     'total': 0,
     'status': 'Ready',
     'details': ''
 }
-progress_lock = threading.Lock()
 
-# Tailscale installation progress tracking
-tailscale_progress = {
-    'status': 'idle',  # idle, downloading, installing, registering, completed, failed
-    'download_progress': 0,
-    'install_progress': 0,
-    'register_progress': 0,
-    'message': '',
-    'download_bytes': 0,
-    'total_bytes': 0,
-    'error': None
-}
-tailscale_progress_lock = threading.Lock()
-
-def update_progress(service, progress, total=100, status='', details=''):
-    """Update global progress state"""
-    global service_progress
-    with progress_lock:
-        service_progress = {
-            'service': service,
-            'progress': progress,
-            'total': total,
-            'status': status,
-            'details': details
-        }
+def update_progress(service, progress, total=100, status='', details='', extra=None):
+    """Report deploy progress on the current job (extra: additional structured fields, e.g. 'pull')"""
+    job = jobs.current()
+    if job is None:
+        return
+    fields = {
+        'service': service,
+        'progress': progress,
+        'total': total,
+        'status': status,
+        'details': details
+    }
+    if extra:
+        fields.update(extra)
+    job.set_progress(fields)
 
 def reset_progress():
     """Reset progress to idle"""
     update_progress('idle', 0, 100, 'Ready', '')
 
+def deploy_progress():
+    """(version, progress) of the latest deploy job, in the /api/service/progress shape"""
+    job = jobs.latest('deploy')
+    if job is None:
+        return None, dict(IDLE_PROGRESS)
+    snapshot = job.snapshot(log_since=None)
+    return (job.id, snapshot['version']), dict(snapshot['progress'] or IDLE_PROGRESS, job_id=job.id)
+
 ENV_FILE = Path("/opt/adsb/config/.env")
-CONFIG_BUILDER = "/opt/adsb/scripts/config_builder.py"
+COMPOSE_FILE = Path("/opt/adsb/config/docker-compose.yml")
+
+# config_builder.py lives in ../scripts (/opt/adsb/scripts when installed)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+import config_builder
+from config_builder import update_env_file
 
 # TAKNET-PS Server hardcoded connection details - NEVER allow user to change these
 TAK_PROTECTED_SETTINGS = {
@@ -76,27 +307,81 @@ TAK_PROTECTED_SETTINGS = {
     'TAKNET_PS_CONNECTION_MODE': 'auto'
 }
 
-def read_env():
-    """Read .env file and return as dict"""
+def parse_env_lines(lines):
+    """Parse KEY=VALUE lines (comments and blanks ignored) into a dict"""
     env_vars = {}
-    if ENV_FILE.exists():
-        with open(ENV_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#') and '=' in line:
+            key, value = line.split('=', 1)
+            env_vars[key.strip()] = value.strip()
     return env_vars
 
+class ConfigStore:
+    """
+    Process-wide parsed view of the .env file
+    Parses once and revalidates with a stat() (mtime/size/inode) on each access,
+    handing out the same immutable snapshot until the file actually changes
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._snapshot = None
+        self.parse_count = 0
+        self.generation = 0  # Bumped whenever a new snapshot is published
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def snapshot(self):
+        """Return a read-only mapping of the current .env contents"""
+        signature = self._stat_signature()
+        with self._lock:
+            if self._snapshot is not None and signature == self._signature:
+                return self._snapshot
+            env_vars = {}
+            if signature is not None:
+                try:
+                    with open(self.path) as f:
+                        env_vars = parse_env_lines(f)
+                except FileNotFoundError:
+                    signature = None
+            self._snapshot = MappingProxyType(env_vars)
+            self._signature = signature
+            self.parse_count += 1
+            self.generation += 1
+            return self._snapshot
+
+    def version(self):
+        """Cheap version of the current contents (revalidates like snapshot())"""
+        self.snapshot()
+        return self.generation
+
+    def invalidate(self):
+        """Force the next snapshot() to re-read the file (called on every write)"""
+        with self._lock:
+            self._snapshot = None
+            self._signature = None
+
+config_store = ConfigStore(ENV_FILE)
+
+def read_env():
+    """Return the current .env values as a dict (a private copy of the cached snapshot)"""
+    return dict(config_store.snapshot())
+
 def get_taknet_connection_status(env_vars):
     """
     Get current TAKNET-PS connection status by running Tailscale detection
     Returns dict with selected_host, connection_type, etc.
     """
-    import sys
-    sys.path.insert(0, '/opt/adsb/scripts')
     try:
-        from config_builder import check_tailscale_running, select_taknet_host
+        from config_builder import select_taknet_host
         
         if env_vars.get('TAKNET_PS_ENABLED', 'true').lower() != 'true':
             return None
@@ -119,26 +404,30 @@ def get_taknet_connection_status(env_vars):
         print(f"Error getting TAKNET-PS status: {e}")
         return None
 
+def update_env(changes):
+    """
+    Apply several .env changes in one atomic, comment-preserving write
+    Returns True if the file changed (unchanged values cause no write at all)
+    """
+    try:
+        return update_env_file(ENV_FILE, changes)
+    finally:
+        config_store.invalidate()
+
 def write_env(env_vars):
     """Write dict to .env file"""
-    lines = []
-    for key, value in env_vars.items():
-        lines.append(f"{key}={value}\n")
-    with open(ENV_FILE, 'w') as f:
-        f.writelines(lines)
+    return update_env(env_vars)
 
 def update_env_var(key, value):
     """Update a single environment variable in .env file"""
-    env_vars = read_env()
-    env_vars[key] = value
-    write_env(env_vars)
+    return update_env({key: value})
 
 def get_or_create_feeder_uuid():
     """
     Get existing feeder UUID from .env or generate a new one.
     The UUID persists across reboots and is used by aggregators like adsb.lol
     """
-    env_vars = read_env()
+    env_vars = config_store.snapshot()
     
     # Check if UUID already exists
     if 'FEEDER_UUID' in env_vars and env_vars['FEEDER_UUID']:
@@ -148,90 +437,1421 @@ def get_or_create_feeder_uuid():
     feeder_uuid = str(uuid.uuid4())
     
     # Save to .env
-    env_vars['FEEDER_UUID'] = feeder_uuid
-    write_env(env_vars)
+    update_env_var('FEEDER_UUID', feeder_uuid)
     
     print(f"Generated new feeder UUID: {feeder_uuid}")
     return feeder_uuid
 
-def get_docker_status():
-    """Get Docker container status"""
+# ========================================
+# Probe Coalescing (single-flight)
+# ========================================
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical probes into one in-flight execution
+    The first caller for a key runs the probe; callers that arrive while it is
+    still running wait and receive the same result (or exception)
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            stats = self._stats.setdefault(key, {'calls': 0, 'executions': 0, 'coalesced': 0, 'errors': 0})
+            stats['calls'] += 1
+            call = self._inflight.get(key)
+            if call is not None:
+                stats['coalesced'] += 1
+                leader = False
+            else:
+                call = self._inflight[key] = self._Call()
+                stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        """Per-probe counters: calls, executions, coalesced, errors"""
+        with self._lock:
+            return {
+                ':'.join(str(part) for part in key) if isinstance(key, tuple) else str(key): dict(value)
+                for key, value in self._stats.items()
+            }
+
+probe_flights = SingleFlight()
+
+# ========================================
+# Docker Engine API Client
+# ========================================
+
+DOCKER_SOCKET = '/var/run/docker.sock'
+
+class DockerAPIError(Exception):
+    """Raised when the Docker Engine API cannot be reached or returns an error"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status  # HTTP status, when the daemon answered
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket (used for /var/run/docker.sock)"""
+
+    def __init__(self, socket_path, timeout=5):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+class DockerClient:
+    """
+    Minimal in-process Docker Engine API client
+    Talks to the daemon over its Unix socket with a small pool of keep-alive
+    connections, so status polls no longer fork a `docker ps` process each time
+    """
+
+    def __init__(self, socket_path=DOCKER_SOCKET, pool_size=4, timeout=5):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pool = []
+        self._pool_lock = threading.Lock()
+
+    def available(self):
+        """True if the Docker socket exists on this host"""
+        return os.path.exists(self.socket_path)
+
+    def _acquire(self):
+        with self._pool_lock:
+            if self._pool:
+                return self._pool.pop()
+        return UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+
+    def _release(self, conn):
+        with self._pool_lock:
+            if len(self._pool) < self.pool_size:
+                self._pool.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, path, params=None, body=None):
+        """
+        Send a request to the Engine API and return the decoded JSON body
+        Retries once on a fresh connection if a pooled keep-alive socket went stale
+        """
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = {'Host': 'docker'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+
+        last_error = None
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                last_error = e
+                continue
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            if response.status >= 400:
+                raise DockerAPIError(f"{method} {path} failed: HTTP {response.status} {data[:200]!r}", response.status)
+            if not data:
+                return None
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise DockerAPIError(f"Invalid JSON from Docker API: {e}")
+
+        raise DockerAPIError(f"Docker API unavailable: {last_error}")
+
+    def list_containers(self, all=False, filters=None):
+        """List containers (GET /containers/json)"""
+        params = {'all': '1' if all else '0'}
+        if filters:
+            params['filters'] = json.dumps(filters)
+        return self.request('GET', '/containers/json', params=params) or []
+
+    def container_statuses(self, all=False):
+        """Return {container_name: status}, the same map `docker ps` used to produce"""
+        containers = {}
+        for container in self.list_containers(all=all):
+            for name in container.get('Names') or []:
+                containers[name.lstrip('/')] = container.get('Status', '')
+        return containers
+
+    def inspect_container(self, name):
+        """Inspect a single container (GET /containers/<name>/json)"""
+        return self.request('GET', f"/containers/{quote(name, safe='')}/json")
+
+    def image_exists(self, image):
+        """True if the image reference is present locally (GET /images/<name>/json)"""
+        try:
+            self.request('GET', f"/images/{quote(image, safe='/:@')}/json")
+            return True
+        except DockerAPIError as e:
+            if e.status == 404:
+                return False
+            raise
+
+    def pull_image(self, image, on_event, timeout=300):
+        """
+        Pull an image (POST /images/create), passing each progress event to on_event
+        The daemon streams one JSON object per line until the pull finishes;
+        `timeout` bounds a stall between events, not the whole pull
+        """
+        name, tag = split_image_ref(image)
+        params = {'fromImage': name}
+        if tag:
+            params['tag'] = tag
+        conn = UnixHTTPConnection(self.socket_path, timeout=timeout)
+        try:
+            conn.request('POST', f'/images/create?{urlencode(params)}', headers={'Host': 'docker'})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise DockerAPIError(f"Pull {image} failed: HTTP {response.status} {response.read()[:200]!r}",
+                                     response.status)
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' in event:
+                    raise DockerAPIError(f"Pull {image} failed: {event['error']}")
+                on_event(event)
+        except (OSError, http.client.HTTPException) as e:
+            # Socket errors and stall timeouts surface like API errors, so callers fall back to compose
+            raise DockerAPIError(f"Pull {image} failed: {e or type(e).__name__}") from e
+        finally:
+            conn.close()
+
+def split_image_ref(image):
+    """'ghcr.io/org/name:tag' -> ('ghcr.io/org/name', 'tag'); digest references pass through whole"""
+    if '@' in image:
+        return image, None
+    name, sep, tag = image.rpartition(':')
+    if sep and '/' not in tag:  # A ':' in the last path segment is a tag, not a registry port
+        return name, tag
+    return image, 'latest'
+
+docker_client = DockerClient()
+
+def _docker_cli_statuses(all=False):
+    """Fallback for hosts where the Docker socket is not reachable"""
+    cmd = ['docker', 'ps', '--format', '{{.Names}}\t{{.Status}}']
+    if all:
+        cmd.insert(2, '-a')
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+    containers = {}
+    if result.returncode == 0:
+        for line in result.stdout.strip().split('\n'):
+            parts = line.split('\t', 1)
+            if len(parts) == 2:
+                name, status = parts
+                containers[name] = status
+    return containers
+
+def _docker_statuses(all=False):
+    """Container name → status map, preferring the event-fed table over live queries"""
+    if container_watcher.is_ready():
+        return container_watcher.statuses(all=all)
     try:
-        result = subprocess.run(
-            ['docker', 'ps', '--format', '{{.Names}}\t{{.Status}}'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            containers = {}
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    name, status = line.split('\t', 1)
-                    containers[name] = status
-            return containers
-        return {}
+        if docker_client.available():
+            return probe_flights.do('docker_api_ps_all' if all else 'docker_api_ps',
+                                    docker_client.container_statuses, all=all)
+    except DockerAPIError as e:
+        print(f"⚠ Docker API error, falling back to docker CLI: {e}")
+    try:
+        return probe_flights.do('docker_ps_all' if all else 'docker_ps', _docker_cli_statuses, all=all)
     except:
         return {}
 
+def get_docker_status():
+    """Get Docker container status"""
+    return _docker_statuses(all=False)
+
 def get_docker_status_all():
     """Get Docker container status for ALL containers (running and stopped)"""
-    try:
-        result = subprocess.run(
-            ['docker', 'ps', '-a', '--format', '{{.Names}}\t{{.Status}}'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            containers = {}
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    parts = line.split('\t', 1)
-                    if len(parts) == 2:
-                        name, status = parts
-                        containers[name] = status
-            return containers
-        return {}
-    except:
-        return {}
+    return _docker_statuses(all=True)
 
 def container_exists(container_name):
     """Check if a Docker container exists (running or stopped)"""
+    return container_name in get_docker_status_all()
+
+def container_running(container_name):
+    """Check if a Docker container is currently running"""
+    return 'Up' in get_docker_status().get(container_name, '')
+
+# ========================================
+# Event-driven Container State
+# ========================================
+
+def _parse_docker_time(value):
+    """Parse Docker's RFC3339Nano timestamps into epoch seconds (None if unset)"""
+    if not value or value.startswith('0001-01-01'):
+        return None
     try:
-        result = subprocess.run(
-            ['docker', 'ps', '-a', '--format', '{{.Names}}'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            containers = result.stdout.strip().split('\n')
-            return container_name in containers
-        return False
-    except:
-        return False
+        date_part, _, rest = value.partition('T')
+        time_part = rest.rstrip('Z')
+        offset = 0
+        for sign in ('+', '-'):
+            if sign in time_part:
+                time_part, tz = time_part.split(sign, 1)
+                hours, minutes = tz.split(':')
+                offset = (int(hours) * 3600 + int(minutes) * 60) * (1 if sign == '+' else -1)
+                break
+        whole, _, fraction = time_part.partition('.')
+        year, month, day = (int(x) for x in date_part.split('-'))
+        hour, minute, second = (int(x) for x in whole.split(':'))
+        epoch = calendar.timegm((year, month, day, hour, minute, second))
+        return epoch - offset + (float(f"0.{fraction}") if fraction else 0.0)
+    except (ValueError, TypeError):
+        return None
+
+def _human_duration(seconds):
+    """Same wording Docker uses in `docker ps` (Up 5 minutes, About an hour, ...)"""
+    seconds = max(0, int(seconds))
+    minutes = seconds // 60
+    hours = int(seconds / 3600 + 0.5)
+    if seconds < 1:
+        return 'Less than a second'
+    if seconds == 1:
+        return '1 second'
+    if seconds < 60:
+        return f'{seconds} seconds'
+    if minutes == 1:
+        return 'About a minute'
+    if minutes < 60:
+        return f'{minutes} minutes'
+    if hours == 1:
+        return 'About an hour'
+    if hours < 48:
+        return f'{hours} hours'
+    if hours < 24 * 7 * 2:
+        return f'{hours // 24} days'
+    if hours < 24 * 30 * 2:
+        return f'{hours // 24 // 7} weeks'
+    if hours < 24 * 365 * 2:
+        return f'{hours // 24 // 30} months'
+    return f'{hours // 24 // 365} years'
+
+def _format_container_status(entry, now=None):
+    """Render a `docker ps` style status string from an inspected container state"""
+    now = now or time.time()
+    state = entry.get('state', '')
+    started = entry.get('started_at')
+    finished = entry.get('finished_at')
+    exit_code = entry.get('exit_code', 0)
+
+    if state == 'running' or state == 'paused':
+        status = f"Up {_human_duration(now - started) if started else 'Less than a second'}"
+        if entry.get('paused'):
+            status += ' (Paused)'
+        health = entry.get('health')
+        if health == 'starting':
+            status += ' (health: starting)'
+        elif health:
+            status += f' ({health})'
+        return status
+    if state == 'restarting':
+        return f"Restarting ({exit_code}) {_human_duration(now - finished) if finished else 'Less than a second'} ago"
+    if state == 'exited':
+        if finished:
+            return f"Exited ({exit_code}) {_human_duration(now - finished)} ago"
+        return f"Exited ({exit_code})"
+    if state == 'removing':
+        return 'Removal In Progress'
+    if state == 'dead':
+        return 'Dead'
+    return 'Created'
+
+class ContainerStateWatcher:
+    """
+    Always-current in-memory container table
+    Takes one full snapshot, then follows the Docker events stream so readers
+    (/api/status, /api/service/<name>/state, /api/service/ready) never query Docker
+    """
+
+    WATCHED_EVENTS = ['create', 'start', 'stop', 'die', 'kill', 'restart',
+                      'pause', 'unpause', 'destroy', 'rename', 'health_status']
+
+    def __init__(self, client):
+        self.client = client
+        self._containers = {}  # container id -> state entry
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background watcher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='container-watcher', daemon=True)
+        self._thread.start()
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def statuses(self, all=False):
+        """Return {container_name: status} from the in-memory table"""
+        now = time.time()
+        with self._lock:
+            entries = list(self._containers.values())
+        return {
+            entry['name']: _format_container_status(entry, now)
+            for entry in entries
+            if all or entry['state'] in ('running', 'paused')
+        }
+
+    def pid(self, name):
+        """Host PID of a running container from the in-memory table (0 if unknown)"""
+        with self._lock:
+            for entry in self._containers.values():
+                if entry['name'] == name and entry['state'] == 'running':
+                    return entry['pid']
+        return 0
+
+    def _entry_from_inspect(self, info):
+        state = info.get('State') or {}
+        return {
+            'name': (info.get('Name') or '').lstrip('/'),
+            'state': state.get('Status', ''),
+            'paused': state.get('Paused', False),
+            'exit_code': state.get('ExitCode', 0),
+            'started_at': _parse_docker_time(state.get('StartedAt')),
+            'finished_at': _parse_docker_time(state.get('FinishedAt')),
+            'health': (state.get('Health') or {}).get('Status'),
+            'pid': state.get('Pid', 0)
+        }
+
+    def _refresh(self, container_id):
+        """Re-inspect one container and update (or drop) its entry"""
+        try:
+            info = self.client.inspect_container(container_id)
+        except DockerAPIError:
+            info = None
+        with self._lock:
+            if info:
+                self._containers[info.get('Id', container_id)] = self._entry_from_inspect(info)
+            else:
+                self._containers.pop(container_id, None)
+
+    def _snapshot(self):
+        """One `docker ps -a` equivalent to seed the table"""
+        containers = {}
+        for container in self.client.list_containers(all=True):
+            info = self.client.inspect_container(container['Id'])
+            if info:
+                containers[info['Id']] = self._entry_from_inspect(info)
+        with self._lock:
+            self._containers = containers
+
+    def _handle_event(self, event):
+        if event.get('Type', 'container') != 'container':
+            return
+        actor = event.get('Actor') or {}
+        container_id = actor.get('ID') or event.get('id')
+        action = (event.get('Action') or event.get('status') or '').split(':')[0]
+        if not container_id:
+            return
+        if action == 'destroy':
+            with self._lock:
+                self._containers.pop(container_id, None)
+        else:
+            self._refresh(container_id)
+
+    def _follow_events(self, since):
+        """Block on the events stream, applying each event to the table"""
+        params = urlencode({
+            'since': str(int(since)),
+            'filters': json.dumps({'type': ['container'], 'event': self.WATCHED_EVENTS})
+        })
+        conn = UnixHTTPConnection(self.client.socket_path, timeout=None)
+        try:
+            conn.request('GET', f'/events?{params}', headers={'Host': 'docker'})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise DockerAPIError(f"Events stream failed: HTTP {response.status}")
+            self._ready.set()
+            while True:
+                line = response.readline()
+                if not line:
+                    raise DockerAPIError('Events stream closed')
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._handle_event(json.loads(line))
+                except ValueError:
+                    continue
+        finally:
+            conn.close()
+
+    def _run(self):
+        backoff = 1
+        while True:
+            try:
+                if not self.client.available():
+                    raise DockerAPIError('Docker socket not found')
+                since = time.time()
+                self._snapshot()
+                backoff = 1
+                self._follow_events(since)
+            except Exception as e:
+                print(f"⚠ Container watcher: {e} (retrying in {backoff}s)")
+            self._ready.clear()
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+container_watcher = ContainerStateWatcher(docker_client)
+
+# =============================================================
+# Container Connection Inspector
+# =============================================================
+
+TCP_ESTABLISHED = '01'
+
+def _decode_proc_addr(hex_addr):
+    """'0100007F:1F90' (or a 32-digit IPv6 address) from /proc/net/tcp* -> 'ip:port'"""
+    host, port = hex_addr.split(':')
+    raw = bytes.fromhex(host)
+    if sys.byteorder == 'little':
+        # Stored as native-endian 32-bit words
+        raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    if len(raw) == 4:
+        return f"{socket.inet_ntop(socket.AF_INET, raw)}:{int(port, 16)}"
+    return f"[{socket.inet_ntop(socket.AF_INET6, raw)}]:{int(port, 16)}"
+
+class ConnectionInspector:
+    """
+    Established TCP connections of a container, read from the host side
+    Parses /proc/<pid>/net/tcp and tcp6 (the container's network namespace)
+    instead of exec'ing `ss` inside the container
+    """
+
+    def __init__(self, client, watcher):
+        self.client = client
+        self.watcher = watcher
+
+    def container_pid(self, name):
+        """Host PID of a running container (0 if not running)"""
+        if self.watcher.is_ready():
+            return self.watcher.pid(name)
+        try:
+            info = self.client.inspect_container(name) or {}
+        except (DockerAPIError, OSError):
+            return 0
+        state = info.get('State') or {}
+        return state.get('Pid', 0) if state.get('Running') else 0
+
+    def established(self, name, remote_ports):
+        """
+        One pass over the container's TCP tables
+        Returns {port: ['peer_ip:port', ...]} for every requested remote port,
+        or None if the container is not running
+        """
+        pid = self.container_pid(name)
+        if not pid:
+            return None
+
+        wanted = {int(port) for port in remote_ports}
+        peers = {port: [] for port in wanted}
+        found = False
+        for table in ('tcp', 'tcp6'):
+            try:
+                with open(f'/proc/{pid}/net/{table}') as f:
+                    lines = f.read().splitlines()[1:]
+            except OSError:
+                continue
+            found = True
+            for line in lines:
+                fields = line.split(None, 4)
+                if len(fields) < 4 or fields[3] != TCP_ESTABLISHED:
+                    continue
+                remote = fields[2]
+                port = int(remote[-4:], 16)
+                if port in wanted:
+                    peers[port].append(_decode_proc_addr(remote))
+
+        return peers if found else None
+
+connection_inspector = ConnectionInspector(docker_client, container_watcher)
+
+# =============================================================
+# Aggregator Feed Health
+# =============================================================
+
+# Display names by feed host domain (TAKNET-PS hosts come from .env)
+AGGREGATOR_NAMES = {
+    'adsb.fi': 'adsb.fi',
+    'adsb.lol': 'adsb.lol',
+    'adsbexchange.com': 'ADSBexchange',
+    'airplanes.live': 'Airplanes.Live'
+}
+
+def _peer_ip(peer):
+    """'1.2.3.4:30004' / '[::ffff:1.2.3.4]:30004' -> '1.2.3.4'"""
+    ip = peer.rsplit(':', 1)[0].strip('[]')
+    return ip[7:] if ip.startswith('::ffff:') else ip
+
+class FeedHealthMonitor:
+    """
+    Connected/disconnected state for every adsb/mlat entry in ULTRAFEEDER_CONFIG
+    All feeds are matched against one scan of ultrafeeder's established connections;
+    feed hosts are resolved (and cached) so feeds sharing a port are told apart
+    """
+
+    def __init__(self, inspector, container='ultrafeeder', resolve_ttl=300, address_ttl=3600):
+        self.inspector = inspector
+        self.container = container
+        self.resolve_ttl = resolve_ttl
+        self.address_ttl = address_ttl
+        self._addresses = {}  # host -> (resolved_at, {ip: last_seen})
+        self._address_lock = threading.Lock()  # Never held across a DNS lookup
+        self._states = {}  # (type, host, port) -> (connected, since)
+        self._lock = threading.Lock()
 
-# Cache for service states to prevent flickering
-service_state_cache = {}
-service_state_cache_time = {}
-SERVICE_STATE_CACHE_DURATION = 2  # seconds
+    def _resolve(self, host):
+        """
+        Every address `host` resolved to within address_ttl: round-robin and
+        GeoDNS answers rotate, while ultrafeeder stays on the one it picked
+        """
+        now = time.monotonic()
+        with self._address_lock:
+            cached = self._addresses.get(host)
+        if cached is None or now - cached[0] >= self.resolve_ttl:
+            try:
+                fresh = {info[4][0] for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)}
+            except OSError:
+                fresh = set()  # Keep what we saw until it ages out
+            with self._address_lock:
+                seen = dict(self._addresses.get(host, (0, {}))[1])
+                seen.update(dict.fromkeys(fresh, now))
+                seen = {ip: last_seen for ip, last_seen in seen.items() if now - last_seen < self.address_ttl}
+                cached = self._addresses[host] = (now, seen)
+        return set(cached[1])
+
+    @staticmethod
+    def aggregator_name(host, env):
+        taknet_hosts = {
+            env.get('TAKNET_PS_SERVER_HOST_PRIMARY', '').strip(),
+            env.get('TAKNET_PS_SERVER_HOST_FALLBACK', '').strip()
+        }
+        if host in taknet_hosts:
+            return 'TAKNET-PS'
+        for domain, name in AGGREGATOR_NAMES.items():
+            if host == domain or host.endswith('.' + domain):
+                return name
+        return host
+
+    def check(self, env):
+        """
+        Returns (ultrafeeder_running, [aggregator, ...]) where each aggregator is
+        {'name', 'connected', 'status', 'since', 'uptime_seconds', 'feeds': [...]}
+        """
+        feeds = config_builder.parse_ultrafeeder_config(env.get('ULTRAFEEDER_CONFIG', ''))
+        peers = self.inspector.established(self.container, {feed['port'] for feed in feeds})
+        running = peers is not None
+        peers = peers or {}
+
+        # Port is enough when only one feed uses it; otherwise match the peer address too
+        port_users = {}
+        for feed in feeds:
+            port_users[feed['port']] = port_users.get(feed['port'], 0) + 1
+
+        # Resolve before taking the state lock; a slow DNS server only delays this caller
+        addresses = {
+            feed['host']: self._resolve(feed['host']) for feed in feeds
+            if port_users[feed['port']] > 1 and peers.get(feed['port'])
+        }
+
+        now = time.time()
+        aggregators = {}
+        with self._lock:
+            states = {}
+            for feed in feeds:
+                port_peers = peers.get(feed['port'], [])
+                if feed['host'] in addresses:
+                    port_peers = [peer for peer in port_peers if _peer_ip(peer) in addresses[feed['host']]]
+                connected = bool(port_peers)
+
+                key = (feed['type'], feed['host'], feed['port'])
+                previous = self._states.get(key)
+                since = previous[1] if previous and previous[0] == connected else now
+                states[key] = (connected, since)
+
+                name = self.aggregator_name(feed['host'], env)
+                aggregator = aggregators.setdefault(name, {'name': name, 'feeds': []})
+                aggregator['feeds'].append({
+                    'type': feed['type'],
+                    'host': feed['host'],
+                    'port': feed['port'],
+                    'connected': connected,
+                    'peers': port_peers,
+                    'since': since,
+                    'uptime_seconds': int(now - since) if connected else 0
+                })
+            self._states = states
+
+        for aggregator in aggregators.values():
+            up = [feed['connected'] for feed in aggregator['feeds']]
+            connected = all(up)
+            aggregator['connected'] = connected
+            aggregator['status'] = 'connected' if connected else ('degraded' if any(up) else 'disconnected')
+            if connected:
+                aggregator['since'] = max(feed['since'] for feed in aggregator['feeds'])
+            else:
+                aggregator['since'] = max(feed['since'] for feed in aggregator['feeds']
+                                          if not feed['connected'])
+            aggregator['uptime_seconds'] = int(now - aggregator['since']) if connected else 0
+
+        return running, list(aggregators.values())
+
+feed_health = FeedHealthMonitor(connection_inspector)
+
+class FeedHistory:
+    """
+    Fixed-size ring buffer of feed connectivity samples
+    One shared timestamp array plus one byte array per feed (1 up, 0 down,
+    -1 no sample) - 24 h at 10 s is ~70 KB of timestamps and ~9 KB per feed
+    """
+
+    UNKNOWN = -1
+
+    def __init__(self, capacity=8640):
+        self.capacity = capacity
+        self._times = array('d', [0.0]) * capacity
+        self._series = {}  # feed key -> array('b')
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, timestamp, states):
+        """Append one sample: states is {feed_key: connected}"""
+        with self._lock:
+            i = self._next
+            self._times[i] = timestamp
+            for key, series in self._series.items():
+                series[i] = self.UNKNOWN
+            for key, connected in states.items():
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = array('b', [self.UNKNOWN]) * self.capacity
+                series[i] = 1 if connected else 0
+            self._next = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _window(self, since):
+        """Ring indexes (oldest first) of samples taken at or after `since`"""
+        start = (self._next - self._count) % self.capacity
+        indexes = [(start + n) % self.capacity for n in range(self._count)]
+        return [i for i in indexes if self._times[i] >= since]
+
+    def stats(self, window=None, now=None):
+        """
+        Per feed: percent uptime, flaps (up -> down transitions), longest and
+        current outage in seconds, over the last `window` seconds (default: all)
+        """
+        now = now or time.time()
+        since = now - window if window else 0
+        result = {}
+        with self._lock:
+            indexes = self._window(since)
+            times = [self._times[i] for i in indexes]
+            for key, series in self._series.items():
+                samples = up = flaps = 0
+                longest = 0.0
+                outage_start = None
+                previous = None
+                for t, i in zip(times, indexes):
+                    value = series[i]
+                    if value == self.UNKNOWN:
+                        continue
+                    samples += 1
+                    if value:
+                        up += 1
+                        if outage_start is not None:
+                            longest = max(longest, t - outage_start)
+                            outage_start = None
+                    elif outage_start is None:
+                        outage_start = t
+                        if previous == 1:
+                            flaps += 1
+                    previous = value
+                if not samples:
+                    continue
+                current_outage = now - outage_start if outage_start is not None else 0.0
+                result[key] = {
+                    'samples': samples,
+                    'uptime_percent': round(100.0 * up / samples, 2),
+                    'flaps': flaps,
+                    'longest_outage_seconds': int(max(longest, current_outage)),
+                    'current_outage_seconds': int(current_outage),
+                    'connected': previous == 1
+                }
+        return result
+
+class FeedHealthSampler:
+    """
+    Samples feed health on a fixed cadence so request handlers never probe
+    Keeps the latest check for /api/feeds/health and the history ring buffer
+    """
+
+    def __init__(self, monitor, interval=10, capacity=8640):
+        self.monitor = monitor
+        self.interval = interval
+        self.history = FeedHistory(capacity)
+        self.latest = None  # (sampled_at, ultrafeeder_running, aggregators)
+        self._thread = None
+
+    def start(self):
+        """Start the background sampler thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='feed-health-sampler', daemon=True)
+        self._thread.start()
+
+    def sample(self):
+        now = time.time()
+        running, aggregators = self.monitor.check(config_store.snapshot())
+        states = {}
+        for aggregator in aggregators:
+            for feed in aggregator['feeds']:
+                states[f"{aggregator['name']}:{feed['type']}"] = feed['connected']
+        self.history.record(now, states)
+        self.latest = (now, running, aggregators)
+
+    def _run(self):
+        next_run = time.monotonic()
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠ Feed health sampler: {e}")
+            next_run += self.interval
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                next_run = time.monotonic()  # Fell behind - don't burst to catch up
+                delay = 0
+            time.sleep(delay)
+
+feed_sampler = FeedHealthSampler(feed_health)
+
+# =============================================================
+# Receiver Statistics (readsb)
+# =============================================================
+
+# ultrafeeder bind-mounts readsb's run directory to the host
+READSB_RUN_DIR = Path('/run/readsb')
+
+class JSONFileCache:
+    """
+    Parsed view of a JSON file, revalidated with a stat() like ConfigStore
+    `parse` turns the decoded document into whatever the caller keeps
+    """
+
+    def __init__(self, path, parse=None):
+        self.path = Path(path)
+        self.parse = parse or (lambda doc: doc)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._value = None
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self):
+        """Cached parse result; None if the file is missing or unreadable"""
+        signature = self.signature()
+        with self._lock:
+            if signature == self._signature:
+                return self._value
+            value = None
+            if signature is not None:
+                try:
+                    with open(self.path, 'rb') as f:
+                        value = self.parse(json.load(f))
+                except (OSError, ValueError):
+                    value = None  # Caught mid-rewrite; retried on next stat change
+                    signature = None
+            self._signature = signature
+            self._value = value
+            return value
+
+def summarize_readsb_stats(doc):
+    """Receiver performance over readsb's last 1-minute window"""
+    window = doc.get('last1min') or {}
+    local = window.get('local') or {}
+    duration = max((window.get('end') or 0) - (window.get('start') or 0), 1)
+    accepted = sum(local.get('accepted') or [])
+    strong = local.get('strong_signals', 0)
+    max_distance = window.get('max_distance')  # meters (READSB_STATS_RANGE)
+    return {
+        'now': doc.get('now'),
+        'messages_per_second': round(window.get('messages', 0) / duration, 1),
+        'signal_dbfs': local.get('signal'),
+        'noise_dbfs': local.get('noise'),
+        'peak_signal_dbfs': local.get('peak_signal'),
+        'strong_signals': strong,
+        'strong_signal_percent': round(100.0 * strong / accepted, 2) if accepted else 0.0,
+        'max_range_km': round(max_distance / 1000, 1) if max_distance else None,
+        'max_range_nm': round(max_distance / 1852, 1) if max_distance else None,
+        'gain_db': doc.get('gain_db')
+    }
+
+# aircraft.json is rewritten every second and can be hundreds of KB; readsb writes
+# one aircraft object per line, so the few fields we aggregate are sliced straight
+# out of each line with bytes.find() instead of decoding every aircraft
+_AIRCRAFT_NOW = re.compile(rb'"now"\s*:\s*([-0-9.eE+]+)')
+_AIRCRAFT_MESSAGES = re.compile(rb'"messages"\s*:\s*([0-9]+)')
+_AIRCRAFT_LINE = b'\n{"hex"'
+
+def _json_number(data, key, start, end, skip=(0, 0)):
+    """
+    Value of numeric `key` ('"seen":') within data[start:end], or None
+    Matches inside the `skip` span (a nested object) are ignored
+    """
+    pos = data.find(key, start, end)
+    if skip[0] <= pos < skip[1]:
+        pos = data.find(key, skip[1], end)
+    if pos < 0:
+        return None
+    pos += len(key)
+    stop = data.find(b',', pos, end)
+    brace = data.find(b'}', pos, end)
+    if stop < 0 or 0 <= brace < stop:
+        stop = brace
+    return float(data[pos:stop])  # float() takes the raw bytes as-is
+
+class AircraftJSONReader:
+    """
+    Aggregates readsb's aircraft.json without decoding it into per-aircraft dicts
+    Only seen/seen_pos/lat/rssi are projected, and nothing past the header is
+    parsed when the file's `now` hasn't advanced since the last read
+    """
+
+    HEAD_BYTES = 256
+    MAX_AGE = 60  # seconds since last message / position to count an aircraft
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._now = None
+        self._value = None
+        self.parse_count = 0
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self):
+        """Cached summary; None if the file is missing or unreadable"""
+        signature = self.signature()
+        with self._lock:
+            if signature == self._signature:
+                return self._value
+            if signature is None:
+                self._signature = self._now = self._value = None
+                return None
+            try:
+                with open(self.path, 'rb') as f:
+                    head = f.read(self.HEAD_BYTES)
+                    match = _AIRCRAFT_NOW.search(head)
+                    now = float(match.group(1)) if match else None
+                    if now is not None and now == self._now:
+                        self._signature = signature  # Rewritten with the same snapshot
+                        return self._value
+                    value = self.summarize(head + f.read())
+            except (OSError, ValueError):
+                return self._value  # Caught mid-rewrite; retried on next stat change
+            self._signature = signature
+            self._now = now
+            self._value = value
+            self.parse_count += 1
+            return value
+
+    @classmethod
+    def summarize(cls, data):
+        """Aircraft counts and mean RSSI from raw aircraft.json bytes"""
+        if _AIRCRAFT_LINE not in data and b'"hex"' in data:
+            return cls._summarize_decoded(data)  # Not readsb's line-per-aircraft layout
+
+        with_position = without_position = 0
+        rssi_sum = 0.0
+        rssi_count = 0
+        start = data.find(_AIRCRAFT_LINE)
+        while start >= 0:
+            end = data.find(_AIRCRAFT_LINE, start + 1)
+            line_end = end if end >= 0 else len(data)
+            # Stale position is a nested object; its fields must not count as current
+            skip = (0, 0)
+            nested = data.find(b'"lastPosition":', start, line_end)
+            if nested >= 0:
+                skip = (nested, data.find(b'}', nested, line_end) + 1)
+
+            seen = _json_number(data, b'"seen":', start, line_end, skip)
+            if seen is None or seen <= cls.MAX_AGE:
+                seen_pos = _json_number(data, b'"seen_pos":', start, line_end, skip)
+                lat = data.find(b'"lat":', start, line_end)
+                if skip[0] <= lat < skip[1]:
+                    lat = data.find(b'"lat":', skip[1], line_end)
+                if lat >= 0 and (seen_pos is None or seen_pos <= cls.MAX_AGE):
+                    with_position += 1
+                else:
+                    without_position += 1
+                rssi = _json_number(data, b'"rssi":', start, line_end, skip)
+                if rssi is not None:
+                    rssi_sum += rssi
+                    rssi_count += 1
+            start = end
+
+        return cls._summary(data, with_position, without_position, rssi_sum, rssi_count)
+
+    @classmethod
+    def _summarize_decoded(cls, data):
+        """Same aggregation over a fully decoded document"""
+        with_position = without_position = 0
+        rssi_sum = 0.0
+        rssi_count = 0
+        for aircraft in json.loads(data).get('aircraft') or ():
+            if aircraft.get('seen', 0) > cls.MAX_AGE:
+                continue
+            if 'lat' in aircraft and aircraft.get('seen_pos', 0) <= cls.MAX_AGE:
+                with_position += 1
+            else:
+                without_position += 1
+            if 'rssi' in aircraft:
+                rssi_sum += aircraft['rssi']
+                rssi_count += 1
+        return cls._summary(data, with_position, without_position, rssi_sum, rssi_count)
+
+    @classmethod
+    def _summary(cls, data, with_position, without_position, rssi_sum, rssi_count):
+        head = data[:cls.HEAD_BYTES]
+        now = _AIRCRAFT_NOW.search(head)
+        messages = _AIRCRAFT_MESSAGES.search(head)
+        return {
+            'now': float(now.group(1)) if now else None,
+            'messages_total': int(messages.group(1)) if messages else None,
+            'aircraft_with_position': with_position,
+            'aircraft_without_position': without_position,
+            'aircraft_total': with_position + without_position,
+            'rssi_mean_dbfs': round(rssi_sum / rssi_count, 1) if rssi_count else None
+        }
+
+readsb_stats = JSONFileCache(READSB_RUN_DIR / 'stats.json', summarize_readsb_stats)
+readsb_aircraft = AircraftJSONReader(READSB_RUN_DIR / 'aircraft.json')
+
+# =============================================================
+# Prometheus Scraper (ultrafeeder exporter)
+# =============================================================
+
+# Families we display -> our metric name; anything else in the exposition is skipped
+PROMETHEUS_FAMILIES = {
+    'readsb_aircraft_with_position': 'aircraft_with_position',
+    'readsb_aircraft_without_position': 'aircraft_without_position',
+    'readsb_messages_valid': 'messages_total',
+    'readsb_max_distance_in_metres': 'max_range_m',
+    'readsb_signal_strength': 'signal_dbfs',
+    'readsb_noise_level': 'noise_dbfs',
+    'readsb_strong_signals': 'strong_signals'
+}
+
+class PrometheusScraper:
+    """
+    Pulls ultrafeeder's Prometheus exposition text over kept-alive connections
+    Only lines whose family is in `families` are split and converted; series of
+    one family (different labels) are summed
+    """
+
+    def __init__(self, targets, families=PROMETHEUS_FAMILIES, timeout=3):
+        self.targets = list(targets)  # [(host, port, path), ...]
+        self.families = dict(families)
+        self.timeout = timeout
+        self._prefixes = tuple(self.families)
+        self._connections = {}
+        self._lock = threading.Lock()
+        self.latest = None  # (scraped_at, {metric: value})
+
+    def _fetch(self, host, port, path):
+        """GET one exposition page, reusing (or re-opening once) the target's connection"""
+        for attempt in range(2):
+            conn = self._connections.get((host, port))
+            if conn is None:
+                conn = self._connections[(host, port)] = http.client.HTTPConnection(host, port, timeout=self.timeout)
+            try:
+                conn.request('GET', path, headers={'Accept': 'text/plain'})
+                response = conn.getresponse()
+                body = response.read()
+                if response.status != 200:
+                    raise http.client.HTTPException(f"HTTP {response.status} from :{port}{path}")
+                return body
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                self._connections.pop((host, port), None)
+                if attempt:
+                    raise
+
+    def parse(self, text):
+        """{metric: value} for the wanted families in exposition `text` (bytes)"""
+        values = {}
+        families = self.families
+        prefixes = self._prefixes
+        for line in text.decode('utf-8', 'replace').splitlines():
+            if not line.startswith(prefixes):
+                continue  # Comments, HELP/TYPE and unwanted families
+            end = line.find('{')
+            if end < 0:
+                end = line.find(' ')
+            metric = families.get(line[:end])
+            if metric is None:
+                continue  # Longer family sharing a wanted prefix
+            fields = line[line.rfind('}') + 1 if '}' in line else end:].split()
+            try:
+                value = float(fields[0])
+            except (IndexError, ValueError):
+                continue
+            values[metric] = values.get(metric, 0.0) + value
+        return values
+
+    def scrape(self):
+        """Scrape every target once; returns the merged values (also kept in .latest)"""
+        values = {}
+        with self._lock:
+            for host, port, path in self.targets:
+                try:
+                    target_values = self.parse(self._fetch(host, port, path))
+                except (OSError, http.client.HTTPException):
+                    continue  # Exporter not up (ultrafeeder stopped / starting)
+                for metric, value in target_values.items():
+                    values.setdefault(metric, value)  # First target exporting a family wins
+        if values:
+            self.latest = (time.time(), values)
+        return values
+
+prometheus_scraper = PrometheusScraper([
+    ('127.0.0.1', 9273, '/metrics'),
+    ('127.0.0.1', 9274, '/metrics')
+])
+
+# =============================================================
+# Receiver Metric History
+# =============================================================
+
+RECEIVER_HISTORY_FILE = Path("/opt/adsb/config/.receiver-history.bin")
+CPU_TEMP_FILE = Path("/sys/class/thermal/thermal_zone0/temp")
+
+class TieredTimeSeries:
+    """
+    Fixed-size, multi-resolution metric history
+    Each tier is a ring of `slots` buckets of `step` seconds: one array('i') of
+    bucket numbers plus one array('f') per metric (NaN = no data). Samples are
+    folded into every tier (mean, or max for 'max' metrics), so coarse tiers
+    are downsampled as data arrives rather than rebuilt on read
+    """
+
+    MAGIC = b'TKRH'
+    FORMAT_VERSION = 1
+    NAN = float('nan')
+
+    def __init__(self, metrics, tiers):
+        self.metrics = dict(metrics)  # name -> 'mean' | 'max'
+        self.tiers = []
+        for step, slots in tiers:
+            self.tiers.append({
+                'step': step,
+                'slots': slots,
+                'buckets': array('i', [-1]) * slots,
+                'values': {name: array('f', [self.NAN]) * slots for name in self.metrics},
+                'pending': None  # [bucket, {name: [sum_or_max, count]}]
+            })
+        self.last_update = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, timestamp, values):
+        """Fold one sample ({metric: value or None}) into every tier"""
+        with self._lock:
+            for tier in self.tiers:
+                bucket = int(timestamp // tier['step'])
+                pending = tier['pending']
+                if pending is None or pending[0] != bucket:
+                    pending = tier['pending'] = [bucket, {name: [0.0, 0] for name in self.metrics}]
+                for name, value in values.items():
+                    if value is None or name not in self.metrics:
+                        continue
+                    acc = pending[1][name]
+                    if self.metrics[name] == 'max':
+                        acc[0] = value if acc[1] == 0 else max(acc[0], value)
+                    else:
+                        acc[0] += value
+                    acc[1] += 1
+                # The open bucket is always written through, so reads see it immediately
+                slot = bucket % tier['slots']
+                tier['buckets'][slot] = bucket
+                for name, (total, count) in pending[1].items():
+                    if count:
+                        tier['values'][name][slot] = total if self.metrics[name] == 'max' else total / count
+                    else:
+                        tier['values'][name][slot] = self.NAN
+            self.last_update = timestamp
+
+    def tier_for(self, window):
+        """Finest tier that covers `window` seconds"""
+        for tier in self.tiers:
+            if tier['step'] * tier['slots'] >= window:
+                return tier
+        return self.tiers[-1]
+
+    def query(self, window, now=None, metrics=None):
+        """{metric: [[timestamp, value], ...]} over the last `window` seconds, oldest first"""
+        now = now or time.time()
+        with self._lock:
+            tier = self.tier_for(window)
+            step, slots = tier['step'], tier['slots']
+            last = int(now // step)
+            first = max(last - min(int(window // step), slots - 1), last - slots + 1)
+            names = [name for name in (metrics or self.metrics) if name in self.metrics]
+            result = {name: [] for name in names}
+            for bucket in range(first, last + 1):
+                slot = bucket % slots
+                if tier['buckets'][slot] != bucket:
+                    continue
+                for name in names:
+                    value = tier['values'][name][slot]
+                    if value == value:  # Skip NaN
+                        result[name].append([bucket * step, round(value, 2)])
+            return step, result
+
+    def dump(self):
+        """Compact binary image: header, then per tier buckets + one float32 array per metric"""
+        names = sorted(self.metrics)
+        with self._lock:
+            parts = [self.MAGIC, struct.pack('<HHHd', self.FORMAT_VERSION, len(names), len(self.tiers), self.last_update)]
+            parts.append(json.dumps(names).encode().ljust(256))
+            for tier in self.tiers:
+                parts.append(struct.pack('<II', tier['step'], tier['slots']))
+                parts.append(tier['buckets'].tobytes())
+                for name in names:
+                    parts.append(tier['values'][name].tobytes())
+        return b''.join(parts)
+
+    def load(self, data):
+        """Restore from dump(); tiers or metrics that no longer match are skipped"""
+        if data[:4] != self.MAGIC:
+            raise ValueError('Not a receiver history file')
+        version, metric_count, tier_count, last_update = struct.unpack_from('<HHHd', data, 4)
+        if version != self.FORMAT_VERSION:
+            raise ValueError(f'Unsupported history format {version}')
+        offset = 4 + struct.calcsize('<HHHd')
+        names = json.loads(data[offset:offset + 256].decode().strip())
+        offset += 256
+        with self._lock:
+            for _ in range(tier_count):
+                step, slots = struct.unpack_from('<II', data, offset)
+                offset += 8
+                buckets = array('i')
+                buckets.frombytes(data[offset:offset + 4 * slots])
+                offset += 4 * slots
+                values = {}
+                for name in names:
+                    values[name] = array('f')
+                    values[name].frombytes(data[offset:offset + 4 * slots])
+                    offset += 4 * slots
+                for tier in self.tiers:
+                    if tier['step'] == step and tier['slots'] == slots:
+                        tier['buckets'] = buckets
+                        for name in self.metrics:
+                            if name in values:
+                                tier['values'][name] = values[name]
+            self.last_update = last_update
+
+def read_cpu_temperature():
+    """SoC temperature in °C (None if the board doesn't expose one)"""
+    try:
+        return int(CPU_TEMP_FILE.read_text().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+class ReceiverHistorySampler:
+    """
+    Records receiver metrics every `interval` seconds into a TieredTimeSeries
+    and writes it to disk every `persist_interval` seconds, and once more on exit
+    """
+
+    METRICS = {
+        'messages_per_second': 'mean',
+        'aircraft_total': 'mean',
+        'aircraft_with_position': 'mean',
+        'max_range_km': 'max',
+        'cpu_temp_c': 'mean'
+    }
+    TIERS = [(10, 360), (60, 1440), (600, 4320)]  # 1 h, 24 h, 30 days
+
+    def __init__(self, path=RECEIVER_HISTORY_FILE, interval=10, persist_interval=300):
+        self.path = Path(path)
+        self.interval = interval
+        self.persist_interval = persist_interval
+        self.store = TieredTimeSeries(self.METRICS, self.TIERS)
+        self._previous_messages = None  # (source, now, messages_total) for the rate
+        self.latest = None  # Most recent sample, for the dashboard
+        self._thread = None
+
+    def start(self):
+        """Load saved history and start the background sampler thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        try:
+            self.store.load(self.path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠ Receiver history not restored: {e}")
+        atexit.register(self.flush)
+        self._thread = threading.Thread(target=self._run, name='receiver-history', daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """Final save at shutdown, so a restart loses no samples since the last persist"""
+        try:
+            self.persist()
+            print("✓ Receiver history saved")
+        except Exception as e:
+            print(f"⚠ Receiver history not saved: {e}")
+
+    def sample(self):
+        sampled_at = time.time()
+        stats = readsb_stats.get() or {}
+        aircraft = readsb_aircraft.get() or {}
+        exported = prometheus_scraper.scrape()  # Fills in whatever /run/readsb lacks
+
+        # Message rate from a running total (per second, not readsb's per minute)
+        rate = stats.get('messages_per_second')
+        if aircraft.get('messages_total') is not None:
+            counter = ('aircraft.json', aircraft.get('now') or sampled_at, aircraft['messages_total'])
+        elif 'messages_total' in exported:
+            counter = ('prometheus', sampled_at, exported['messages_total'])
+        else:
+            counter = None
+        if counter:
+            previous = self._previous_messages
+            if previous and previous[0] == counter[0] and counter[1] > previous[1] and counter[2] >= previous[2]:
+                rate = (counter[2] - previous[2]) / (counter[1] - previous[1])
+            self._previous_messages = counter
+
+        with_position = aircraft.get('aircraft_with_position', exported.get('aircraft_with_position'))
+        total = aircraft.get('aircraft_total')
+        if total is None and with_position is not None:
+            total = with_position + exported.get('aircraft_without_position', 0)
+        max_range = stats.get('max_range_km')
+        if max_range is None and exported.get('max_range_m'):
+            max_range = round(exported['max_range_m'] / 1000, 1)
+
+        values = {
+            'messages_per_second': round(rate, 1) if rate is not None else None,
+            'aircraft_total': total,
+            'aircraft_with_position': with_position,
+            'max_range_km': max_range,
+            'cpu_temp_c': read_cpu_temperature()
+        }
+        self.store.record(sampled_at, values)
+        self.latest = values
+
+    def persist(self):
+        """Atomically replace the history file"""
+        data = self.store.dump()
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.name}.tmp.")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _run(self):
+        next_run = time.monotonic()
+        last_persist = time.monotonic()
+        while True:
+            try:
+                self.sample()
+                if time.monotonic() - last_persist >= self.persist_interval:
+                    last_persist = time.monotonic()
+                    self.persist()
+            except Exception as e:
+                print(f"⚠ Receiver history sampler: {e}")
+            next_run += self.interval
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                next_run = time.monotonic()  # Fell behind - don't burst to catch up
+                delay = 0
+            time.sleep(delay)
+
+receiver_history = ReceiverHistorySampler()
 
 def get_service_state(service_name):
     """Get detailed service state: downloading, starting, running, stopped, or not_installed"""
-    global service_progress, service_state_cache, service_state_cache_time
-    
-    # Return cached state if still valid
-    current_time = time.time()
-    if service_name in service_state_cache:
-        cache_age = current_time - service_state_cache_time.get(service_name, 0)
-        if cache_age < SERVICE_STATE_CACHE_DURATION:
-            return service_state_cache[service_name]
-    
-    # Check if currently being downloaded/started (tracked by progress system)
-    with progress_lock:
-        if service_progress['service'] == service_name:
-            if service_progress['progress'] < 100:
-                state = 'downloading' if service_progress['progress'] < 85 else 'starting'
-                service_state_cache[service_name] = state
-                service_state_cache_time[service_name] = current_time
-                return state
-    
-    # Single atomic Docker check - get ALL container statuses at once
+    # Check if currently being downloaded/started (tracked by the deploy job)
+    _, progress = deploy_progress()
+    if progress['service'] == service_name:
+        if progress['progress'] < 100:
+            return 'downloading' if progress['progress'] < 85 else 'starting'
+    
+    # Container table is kept current by the events watcher - no Docker round trip
     docker_status_all = get_docker_status_all()
     container_name = service_name
     
@@ -253,35 +1873,425 @@ def get_service_state(service_name):
         # Container doesn't exist
         state = 'not_installed'
     
-    # Cache the result
-    service_state_cache[service_name] = state
-    service_state_cache_time[service_name] = current_time
-    
     return state
 
+# =============================================================
+# Image Pull Progress (Engine API pull stream)
+# =============================================================
+
+def _format_duration(seconds):
+    """90 -> '1m30s'"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+class PullProgress:
+    """
+    Byte-accurate progress across image pulls, fed raw Engine API pull events
+    Layers are keyed by id, so a layer shared by several images counts once in
+    the totals; throughput is a smoothed rate over downloaded bytes
+    """
+
+    def __init__(self, images, rate_interval=1.0):
+        self._lock = threading.Lock()
+        self.images = {image: 'waiting' for image in images}  # waiting, pulling, done, failed
+        self.layers = {}  # layer id -> {'size', 'downloaded', 'extracted', 'done', 'images'}
+        self.started = time.monotonic()
+        self.rate_interval = rate_interval
+        self._rate = None
+        self._rate_at = self.started
+        self._rate_bytes = 0
+
+    def handle(self, image, event):
+        """Apply one pull-stream event for `image`"""
+        status = event.get('status', '')
+        layer = event.get('id')
+        detail = event.get('progressDetail') or {}
+        with self._lock:
+            if self.images.get(image) == 'waiting':
+                self.images[image] = 'pulling'
+            # Image-level lines ("Pulling from ...", "Digest: ...", "Status: ...") carry no bytes
+            if not layer or status.startswith(('Pulling from', 'Digest', 'Status')):
+                return
+            entry = self.layers.get(layer)
+            if entry is None:
+                entry = self.layers[layer] = {'size': 0, 'downloaded': 0, 'extracted': 0, 'done': False, 'images': set()}
+            entry['images'].add(image)
+            
+            if status == 'Downloading':
+                entry['size'] = max(detail.get('total') or 0, entry['size'])
+                entry['downloaded'] = detail.get('current') or 0
+            elif status in ('Verifying Checksum', 'Download complete'):
+                entry['downloaded'] = entry['size']
+            elif status == 'Extracting':
+                entry['downloaded'] = entry['size']
+                entry['extracted'] = detail.get('current') or 0
+            elif status == 'Pull complete':
+                entry['downloaded'] = entry['extracted'] = entry['size']
+                entry['done'] = True
+            elif status == 'Already exists':
+                entry['done'] = True
+
+    def finish(self, image, ok=True):
+        with self._lock:
+            self.images[image] = 'done' if ok else 'failed'
+
+    def _image_fraction(self, image, state):
+        if state == 'done':
+            return 1.0
+        layers = [entry for entry in self.layers.values() if image in entry['images']]
+        if not layers:
+            return 0.0
+        # Unsized layers (not started yet) count as not done; extraction is the last 20%
+        done = sum(1 for entry in layers if entry['done'])
+        sized = [entry for entry in layers if entry['size'] and not entry['done']]
+        partial = sum((0.8 * entry['downloaded'] + 0.2 * entry['extracted']) / entry['size'] for entry in sized)
+        return min((done + partial) / len(layers), 0.99)
+
+    def snapshot(self):
+        """Totals, rate and ETA across all images, plus a per-image breakdown"""
+        with self._lock:
+            size = sum(entry['size'] for entry in self.layers.values())
+            downloaded = sum(entry['downloaded'] for entry in self.layers.values())
+            
+            now = time.monotonic()
+            if now - self._rate_at >= self.rate_interval:
+                rate = max(downloaded - self._rate_bytes, 0) / (now - self._rate_at)
+                self._rate = rate if self._rate is None else 0.7 * self._rate + 0.3 * rate
+                self._rate_at, self._rate_bytes = now, downloaded
+            rate = self._rate or 0.0
+            
+            images = {}
+            for image, state in self.images.items():
+                layers = [entry for entry in self.layers.values() if image in entry['images']]
+                images[image] = {
+                    'status': state,
+                    'progress': round(self._image_fraction(image, state) * 100, 1),
+                    'downloaded_bytes': sum(entry['downloaded'] for entry in layers),
+                    'total_bytes': sum(entry['size'] for entry in layers),
+                    'layers': len(layers)
+                }
+            fraction = sum(image['progress'] for image in images.values()) / (100 * len(images)) if images else 1.0
+            
+            return {
+                'fraction': fraction,
+                'downloaded_bytes': downloaded,
+                'total_bytes': size,  # Known so far - grows as queued layers start
+                'layers': len(self.layers),
+                'rate_bytes_per_sec': round(rate),
+                'eta_seconds': round((size - downloaded) / rate) if rate > 0 and size > downloaded else None,
+                'elapsed_seconds': round(now - self.started, 1),
+                'images': images
+            }
+
+    @staticmethod
+    def describe(snapshot):
+        """Human-readable (status, details) lines for the progress bar"""
+        images = snapshot['images']
+        finished = sum(1 for image in images.values() if image['status'] == 'done')
+        pulling = [split_image_ref(name)[0].rsplit('/', 1)[-1] for name, image in images.items()
+                   if image['status'] == 'pulling']
+        status = f"Pulling {', '.join(pulling)}... ({finished}/{len(images)} images ready)" if pulling \
+            else f"{finished}/{len(images)} images ready"
+        details = f"{snapshot['downloaded_bytes'] / 1e6:.1f} / {snapshot['total_bytes'] / 1e6:.1f} MB"
+        if snapshot['rate_bytes_per_sec']:
+            details += f" · {snapshot['rate_bytes_per_sec'] / 1e6:.2f} MB/s"
+        if snapshot['eta_seconds'] is not None:
+            details += f" · ETA {_format_duration(snapshot['eta_seconds'])}"
+        return status, details
+
+def compose_services(build, services):
+    """services plus everything they depend on, in compose file order"""
+    definitions = build.compose.get('services', {})
+    wanted = set()
+    pending = list(services)
+    while pending:
+        name = pending.pop()
+        if name in wanted or name not in definitions:
+            continue
+        wanted.add(name)
+        pending.extend(definitions[name].get('depends_on') or [])  # list or dict form
+    return [name for name in definitions if name in wanted]
+
+def compose_images(build, services):
+    """Distinct images `docker compose up -d <services>` needs"""
+    definitions = build.compose.get('services', {})
+    images = []
+    for name in compose_services(build, services):
+        image = definitions[name].get('image')
+        if image and image not in images:
+            images.append(image)
+    return images
+
+def pull_images(images, report=None, report_interval=0.5, concurrency=1, max_rate=0):
+    """
+    Pull images through the Engine API, up to `concurrency` at once, reporting
+    aggregate progress (PullProgress.snapshot()) at most every report_interval s
+    max_rate (bytes/s, 0 = unlimited) holds back further pulls while measured
+    throughput is at the cap. Returns the final snapshot; raises DockerAPIError
+    if any pull failed (the others still run to completion), with the per-image
+    messages in its `failed` dict
+    """
+    progress = PullProgress(images)
+    report_lock = threading.Lock()
+    last_report = [0.0]
+    errors = {}
+    
+    def maybe_report(force=False):
+        with report_lock:
+            now = time.monotonic()
+            if not force and now - last_report[0] < report_interval:
+                return None
+            last_report[0] = now
+        snapshot = progress.snapshot()
+        if report:
+            report(snapshot)
+        return snapshot
+    
+    def worker(image):
+        try:
+            docker_client.pull_image(image, lambda event: (progress.handle(image, event), maybe_report()))
+            progress.finish(image)
+        except Exception as e:
+            progress.finish(image, ok=False)
+            errors[image] = str(e) or type(e).__name__
+        maybe_report(force=True)
+    
+    pending = list(images)
+    running = []
+    while pending or running:
+        running = [thread for thread in running if thread.is_alive()]
+        if pending and len(running) < max(concurrency, 1):
+            rate = progress.snapshot()['rate_bytes_per_sec'] if max_rate and running else 0
+            if not max_rate or not running or rate < max_rate:
+                thread = threading.Thread(target=worker, args=(pending.pop(0),), name='image-pull', daemon=True)
+                thread.start()
+                running.append(thread)
+                continue
+        time.sleep(0.25)
+    
+    if errors:
+        error = DockerAPIError('; '.join(errors.values()))
+        error.failed = errors
+        raise error
+    return progress.snapshot()
+
+IMAGE_STAGE_FILE = Path('/opt/adsb/config/.image-stage.json')
+
+class ImageStager:
+    """
+    Stages compose images before any container is touched
+    Only images that are missing (or, with refresh, behind the registry's
+    manifest digest) are pulled, in parallel per IMAGE_PULL_CONCURRENCY and
+    gated by IMAGE_PULL_MAX_MBPS. The plan is persisted until it completes,
+    so a restart picks it up again; layers the daemon already finished are
+    reused ("Already exists") and only the remainder crosses the link
+    """
+
+    def __init__(self, state_file=IMAGE_STAGE_FILE, keep=20):
+        self.state_file = state_file
+        self.keep = keep
+        self._lock = threading.Lock()  # One stage at a time; later callers wait, then skip what's done
+        self._stages = {}  # stage id -> state of that request (newest last)
+        self._stages_lock = threading.Lock()
+
+    @staticmethod
+    def settings():
+        """(concurrency, max bytes/s) from .env"""
+        env = config_store.snapshot()
+        try:
+            concurrency = min(max(int(env.get('IMAGE_PULL_CONCURRENCY') or 2), 1), 4)
+        except ValueError:
+            concurrency = 2
+        try:
+            max_rate = max(float(env.get('IMAGE_PULL_MAX_MBPS') or 0), 0) * 1e6
+        except ValueError:
+            max_rate = 0
+        return concurrency, max_rate
+
+    @staticmethod
+    def behind_registry(image):
+        """True if the registry's manifest digest for image isn't one we have locally"""
+        reference = quote(image, safe='/:@')
+        try:
+            remote = docker_client.request('GET', f'/distribution/{reference}/json')['Descriptor']['digest']
+            local = docker_client.request('GET', f'/images/{reference}/json').get('RepoDigests') or []
+        except (DockerAPIError, KeyError, TypeError, AttributeError) as e:
+            print(f"⚠ Can't check {image} against registry: {e}")
+            return False  # Keep what we have; a pull would fail the same way
+        return not any(digest.endswith(f'@{remote}') for digest in local)
+
+    def needed(self, images, refresh=False):
+        return [
+            image for image in images
+            if not docker_client.image_exists(image) or (refresh and self.behind_registry(image))
+        ]
+
+    def _save_plan(self, stage):
+        try:
+            config_builder._atomic_write_text(self.state_file, json.dumps({
+                'id': stage['id'], 'images': stage['images'], 'refresh': stage['refresh'], 'started': time.time()
+            }))
+        except OSError as e:
+            print(f"⚠ Could not save image stage plan: {e}")
+
+    def _clear_plan(self):
+        try:
+            self.state_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _new_stage(self, images, refresh, stage_id=None):
+        """Register a stage request; its state is what status(id) reports"""
+        stage = {
+            'id': stage_id or uuid.uuid4().hex[:12],
+            'images': list(images),
+            'refresh': refresh,
+            'status': 'waiting',  # waiting (for another stage), running, done, failed
+            'progress': None,
+            'pulled': [],
+            'failed': {},  # image -> error; compose pulls these itself
+            'error': None
+        }
+        with self._stages_lock:
+            self._stages[stage['id']] = stage
+            for old_id in list(self._stages)[:max(len(self._stages) - self.keep, 0)]:
+                if self._stages[old_id]['status'] in ('done', 'failed'):
+                    del self._stages[old_id]
+        return stage
+
+    def status(self, stage_id=None):
+        """One request's state (None if unknown), or without an id a summary of all"""
+        with self._stages_lock:
+            if stage_id is not None:
+                stage = self._stages.get(stage_id)
+                return dict(stage) if stage else None
+            stages = list(self._stages.values())
+        latest = stages[-1] if stages else {}
+        return {
+            'running': any(stage['status'] in ('waiting', 'running') for stage in stages),
+            'progress': latest.get('progress'),
+            'error': latest.get('error'),
+            'failed': latest.get('failed', {})
+        }
+
+    def stage(self, images, refresh=False, report=None, stage=None):
+        """
+        Pull whatever of `images` isn't staged yet (blocking); returns the stage state
+        Images whose pull fails are recorded in its 'failed' and left for compose
+        (the plan is kept, so they are retried on resume); raises DockerAPIError
+        if the daemon is unreachable
+        """
+        stage = stage or self._new_stage(images, refresh)
+        with self._lock:
+            stage['status'] = 'running'
+            try:
+                self._save_plan(stage)
+                needed = self.needed(images, refresh)
+                if needed:
+                    concurrency, max_rate = self.settings()
+                    print(f"⚙ Staging {len(needed)} image(s), {concurrency} at a time"
+                          + (f", capped at {max_rate / 1e6:g} MB/s" if max_rate else ''))
+                    
+                    def on_report(snapshot):
+                        stage['progress'] = snapshot
+                        if report:
+                            report(snapshot)
+                    try:
+                        stage['progress'] = pull_images(needed, on_report, concurrency=concurrency, max_rate=max_rate)
+                    except DockerAPIError as e:
+                        if not getattr(e, 'failed', None):
+                            raise
+                        stage['failed'] = e.failed
+                        stage['error'] = f"{len(e.failed)} of {len(needed)} image(s) not staged: {e}"
+                        print(f"⚠ {stage['error']}")
+                        stage['pulled'] = [image for image in needed if image not in e.failed]
+                        stage['status'] = 'failed'
+                        return stage
+                stage['pulled'] = needed
+                stage['status'] = 'done'
+                self._clear_plan()
+                return stage
+            except Exception as e:
+                stage['error'] = str(e)
+                stage['status'] = 'failed'
+                raise
+
+    def stage_in_background(self, images, refresh=False, stage_id=None):
+        """Start staging on a thread; returns the stage id to poll status() with"""
+        stage = self._new_stage(images, refresh, stage_id)  # Visible to pollers before the thread gets going
+        
+        def run():
+            try:
+                self.stage(images, refresh, stage=stage)
+                if stage['status'] == 'done':
+                    print(f"✓ Images staged ({len(stage['pulled'])} pulled)")
+            except Exception as e:
+                print(f"⚠ Image staging failed: {e}")
+        threading.Thread(target=run, name='image-stager', daemon=True).start()
+        return stage['id']
+
+    def start(self):
+        """Resume a plan left unfinished by a restart (under its original id)"""
+        try:
+            plan = json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return
+        print(f"⚙ Resuming image staging: {', '.join(plan.get('images', []))}")
+        self.stage_in_background(plan.get('images', []), plan.get('refresh', False), plan.get('id'))
+
+image_stager = ImageStager()
+
 def monitor_docker_progress(service_name='ultrafeeder'):
     """
-    Monitor docker-compose up in real-time by streaming its output
-    v2.40.6: No timeout - monitors until actually complete
-    Parses actual Docker output for accurate progress
+    Bring the compose project up, reporting real progress
+    Missing images are pulled first through the Engine API (byte counts per
+    layer and image, throughput and ETA), then `docker compose up -d` only has
+    containers to create and start
     """
     try:
         reset_progress()
         update_progress(service_name, 1, 100, 'Initializing...', 'Starting')
         
         # Run config builder first
-        subprocess.run(
-            ['python3', '/opt/adsb/scripts/config_builder.py'],
-            capture_output=True,
-            timeout=10,
-            cwd='/opt/adsb'
-        )
+        build = build_config_in_process()
         
-        update_progress(service_name, 5, 100, 'Starting Docker Compose...', 'Preparing')
+        # Only services whose definition changed (or that aren't running) need compose
+        targets = compose_targets(build, wanted=[service_name])
+        if not targets:
+            print("✓ Configuration unchanged and all containers running - skipping docker compose")
+            update_progress(service_name, 100, 100, 'Setup complete!', 'Configuration unchanged ✓')
+            return
+        
+        update_progress(service_name, 5, 100, 'Checking images...', 'Preparing')
+        
+        # Stage images before compose touches any container (its default pull
+        # policy is missing images only, so that's what gets pulled here)
+        try:
+            def report(snapshot):
+                status, details = PullProgress.describe(snapshot)
+                update_progress(service_name, 5 + int(snapshot['fraction'] * 65), 100, status, details,
+                                extra={'pull': snapshot})
+            stage = image_stager.stage(compose_images(build, targets), report=report)
+            pulled, final = stage['pulled'], stage['progress']
+            for image, error in stage['failed'].items():
+                jobs.log(f"Pull of {image} failed, leaving it to compose: {error}")
+            if pulled and final:
+                update_progress(service_name, 70, 100, f'{len(pulled)}/{len(pulled)} images ready',
+                                f"{final['downloaded_bytes'] / 1e6:.1f} MB in {_format_duration(final['elapsed_seconds'])}",
+                                extra={'pull': final})
+        except DockerAPIError as e:
+            # Compose pulls anything still missing itself (without byte-level progress)
+            print(f"⚠ Image pull via Docker API failed: {e}")
+        
+        update_progress(service_name, 70, 100, 'Creating containers...', 'Setting up')
         
         # Run docker compose with streaming output
         process = subprocess.Popen(
-            ['docker', 'compose', 'up', '-d'],
+            ['docker', 'compose', 'up', '-d'] + targets,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,  # Merge stderr to stdout
             text=True,
@@ -289,119 +2299,49 @@ def monitor_docker_progress(service_name='ultrafeeder'):
             cwd='/opt/adsb/config'
         )
         
-        current_image = None
-        images_pulled = set()
-        total_images = 3  # ultrafeeder, piaware, fr24
+        # Each container is created, then started: two steps over the last 70-99%
+        steps = 2 * len(compose_services(build, targets))
         containers_created = set()
         containers_started = set()
         
         # Read output line by line until process completes
         for line in process.stdout:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Image pulling started
-            if 'Pulling' in line and 'Container' not in line:
-                if 'ultrafeeder' in line.lower():
-                    current_image = 'ultrafeeder'
-                    update_progress(service_name, 10, 100, 'Pulling ultrafeeder image...', 'Downloading')
-                elif 'piaware' in line.lower():
-                    current_image = 'piaware'
-                    update_progress(service_name, 30, 100, 'Pulling piaware image...', 'Downloading')
-                elif 'fr24' in line.lower() or 'flightradar' in line.lower():
-                    current_image = 'fr24'
-                    update_progress(service_name, 50, 100, 'Pulling fr24 image...', 'Downloading')
-            
-            # Download progress (format: " 14324c29e8df Downloading  25.5MB/100MB")
-            elif 'Downloading' in line and 'MB' in line:
-                try:
-                    # Look for pattern like "25.5MB/100MB"
-                    import re
-                    match = re.search(r'(\d+\.?\d*)\s*MB\s*/\s*(\d+\.?\d*)\s*MB', line)
-                    if match:
-                        downloaded = float(match.group(1))
-                        total = float(match.group(2))
-                        
-                        # Calculate base progress based on which image
-                        base = 10 if current_image == 'ultrafeeder' else (30 if current_image == 'piaware' else 50)
-                        img_progress = int((downloaded / total) * 18) if total > 0 else 0
-                        
-                        update_progress(
-                            service_name,
-                            base + img_progress,
-                            100,
-                            f'Downloading {current_image}...',
-                            f'{downloaded:.1f}MB / {total:.1f}MB'
-                        )
-                except:
-                    pass
-            
-            # Extract progress
-            elif 'Extracting' in line:
-                if current_image:
-                    base = 10 if current_image == 'ultrafeeder' else (30 if current_image == 'piaware' else 50)
-                    update_progress(service_name, base + 15, 100, f'Extracting {current_image}...', 'Preparing')
-            
-            # Image pulled completely
-            elif 'Pull complete' in line or ('Pulled' in line and 'Image' in line):
-                if current_image and current_image not in images_pulled:
-                    images_pulled.add(current_image)
-                    progress = 10 + (len(images_pulled) * 20)
-                    update_progress(
-                        service_name,
-                        min(68, progress),
-                        100,
-                        f'{len(images_pulled)}/{total_images} images ready',
-                        f'{current_image} ✓'
-                    )
+            jobs.log(line)
+            # e.g. " ✔ Container ultrafeeder  Started"
+            parts = line.split()
+            if 'Container' not in parts:
+                continue
+            index = parts.index('Container')
+            if len(parts) < index + 3:
+                continue
+            container_name, action = parts[index + 1], parts[-1]
             
-            # Network creation
-            elif 'Network' in line and ('Creating' in line or 'Created' in line):
-                update_progress(service_name, 70, 100, 'Creating network...', 'Setting up')
-            
-            # Container creation
-            elif 'Container' in line and 'Creating' in line:
-                parts = line.split()
-                container_name = parts[1] if len(parts) > 1 else 'container'
-                update_progress(service_name, 75, 100, f'Creating {container_name}...', 'Initializing')
-            
-            elif 'Container' in line and 'Created' in line:
-                parts = line.split()
-                container_name = parts[1] if len(parts) > 1 else 'container'
-                if container_name not in containers_created:
-                    containers_created.add(container_name)
-                    progress = 75 + (len(containers_created) * 5)
-                    update_progress(service_name, progress, 100, f'{container_name} created', 'Ready')
-            
-            # Container starting
-            elif 'Container' in line and 'Starting' in line:
-                parts = line.split()
-                container_name = parts[1] if len(parts) > 1 else 'container'
-                update_progress(service_name, 90, 100, f'Starting {container_name}...', 'Almost done')
-            
-            elif 'Container' in line and 'Started' in line:
-                parts = line.split()
-                container_name = parts[1] if len(parts) > 1 else 'container'
-                if container_name not in containers_started:
-                    containers_started.add(container_name)
-                    progress = 90 + (len(containers_started) * 3)
-                    update_progress(service_name, min(99, progress), 100, f'{container_name} started', '✓')
+            if action in ('Created', 'Recreated'):
+                containers_created.add(container_name)
+            elif action in ('Started', 'Running'):
+                containers_created.add(container_name)
+                containers_started.add(container_name)
+            progress = min(99, 70 + 29 * (len(containers_created) + len(containers_started)) // steps)
+            
+            if action in ('Creating', 'Recreate'):
+                update_progress(service_name, progress, 100, f'Creating {container_name}...', 'Initializing')
+            elif action == 'Starting':
+                update_progress(service_name, progress, 100, f'Starting {container_name}...', 'Almost done')
+            elif action in ('Created', 'Recreated'):
+                update_progress(service_name, progress, 100, f'{container_name} created', 'Ready')
+            elif action in ('Started', 'Running'):
+                update_progress(service_name, progress, 100, f'{container_name} started', '✓')
         
         # Wait for process to complete
         process.wait()
+        if process.returncode == 0:
+            config_builder.mark_deployed(build, targets)
+        elif jobs.current() is not None:
+            jobs.current().fail(f'docker compose exited with status {process.returncode}')
         
         # Final verification - check if ultrafeeder is actually running
-        import time
         time.sleep(2)
-        result = subprocess.run(
-            ['docker', 'ps', '--filter', 'name=ultrafeeder', '--filter', 'status=running', '--format', '{{.Names}}'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        if 'ultrafeeder' in result.stdout:
+        if container_running('ultrafeeder'):
             update_progress(service_name, 100, 100, 'Setup complete!', 'All containers running ✓')
         else:
             # Containers created but may still be initializing
@@ -412,52 +2352,60 @@ def monitor_docker_progress(service_name='ultrafeeder'):
         import traceback
         traceback.print_exc()
         update_progress(service_name, 85, 100, 'Starting...', 'Please check dashboard')
+        job = jobs.current()
+        if job is not None:
+            job.fail(e)
 
 def restart_service():
-    """Restart ultrafeeder service - with real-time Docker progress monitoring (v2.40.6)"""
-    import time
+    """Restart ultrafeeder service - queues a deploy job with real-time Docker progress"""
     try:
-        # Brief delay to prevent rapid-fire restarts
-        time.sleep(1)
-        
-        # Reset progress before starting
-        reset_progress()
+        # Rapid-fire restarts fold into the deploy that hasn't started yet
+        job = jobs.submit('deploy', monitor_docker_progress, ('ultrafeeder',),
+                          progress=IDLE_PROGRESS, dedupe='queued', group=COMPOSE_JOBS)
         
-        # Start progress monitoring in background thread
-        # v2.40.6: This thread now runs docker-compose directly and monitors its output
-        # No more systemctl - we stream docker-compose output for real progress
-        monitor_thread = threading.Thread(target=monitor_docker_progress, args=('ultrafeeder',), daemon=True)
-        monitor_thread.start()
-        
-        print("✓ Docker Compose starting with real-time progress monitoring (v2.40.6)")
+        print(f"✓ Docker Compose deploy queued (job {job.id})")
         return True
         
     except Exception as e:
         print(f"✗ Failed to initiate restart: {e}")
         return False
 
+config_build_lock = threading.Lock()
+
+def build_config_in_process():
+    """
+    Run config_builder in this process (no interpreter/yaml startup per call)
+    Returns the BuildResult; raises on failure
+    """
+    with config_build_lock:
+        try:
+            return config_builder.run(ENV_FILE, COMPOSE_FILE)
+        finally:
+            config_store.invalidate()
+
+def compose_targets(build, services=None, wanted=()):
+    """
+    Services `docker compose up -d` actually has work to do for: definition
+    changed since last deploy, no container yet, or - for `wanted` services the
+    caller is explicitly bringing up - not running
+    Every service restarts unless-stopped, so any other container that isn't Up
+    is crash-looping (Docker is already restarting it; an unconfigured feed) or
+    was stopped on purpose; neither makes a redeploy necessary
+    """
+    existing = get_docker_status_all()
+    candidates = services if services is not None else list(build.service_digests)
+    return [
+        name for name in candidates
+        if name in build.changed_services or name not in existing
+        or (name in wanted and not existing[name].startswith('Up'))
+    ]
+
 def rebuild_config():
-    """Run config_builder.py"""
+    """Rebuild ULTRAFEEDER_CONFIG and docker-compose.yml"""
     try:
-        result = subprocess.run(
-            ['python3', CONFIG_BUILDER],
-            timeout=10,
-            capture_output=True,
-            text=True,
-            cwd='/opt/adsb'
-        )
-        if result.returncode == 0:
-            print("✓ Config rebuilt successfully")
-            print(result.stdout)
-            return True
-        else:
-            print(f"✗ Config rebuild failed (code {result.returncode})")
-            print(f"stderr: {result.stderr}")
-            print(f"stdout: {result.stdout}")
-            return False
-    except subprocess.TimeoutExpired:
-        print("✗ Config rebuild timed out after 10 seconds")
-        return False
+        result = build_config_in_process()
+        print(f"✓ Config rebuilt successfully ({result.active_feeds} active feeds)")
+        return True
     except Exception as e:
         print(f"✗ Config rebuild exception: {e}")
         return False
@@ -522,6 +2470,8 @@ def install_tailscale(auth_key=None, hostname=None):
             if result.returncode != 0:
                 return {'success': False, 'message': f'Failed to start Tailscale: {result.stderr}'}
         
+        tailscale_provider.invalidate()
+        
         # SECURITY: Automatically configure SSH for Tailscale-only access
         # Run the configure-ssh-tailscale.sh script
         try:
@@ -542,75 +2492,334 @@ def install_tailscale(auth_key=None, hostname=None):
     except Exception as e:
         return {'success': False, 'message': str(e)}
 
+# =============================================================
+# Tailscale Status Provider
+# =============================================================
+
+TAILSCALE_BIN = '/usr/bin/tailscale'
+TAILSCALED_SOCKET = '/var/run/tailscale/tailscaled.sock'
+
+def _tailscale_cli_status(cmd):
+    """Run a `tailscale status --json` command; None if tailscaled is not running"""
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout)
+
+def _tailscale_localapi_status():
+    """
+    Query tailscaled's LocalAPI (/localapi/v0/status) over its Unix socket
+    Returns the same document as `tailscale status --json`, None if tailscaled
+    is not running, and raises FileNotFoundError if Tailscale is not installed
+    """
+    if not os.path.exists(TAILSCALED_SOCKET):
+        if not os.path.exists(TAILSCALE_BIN):
+            raise FileNotFoundError(TAILSCALE_BIN)
+        return None
+    
+    conn = UnixHTTPConnection(TAILSCALED_SOCKET, timeout=5)
+    try:
+        conn.request('GET', '/localapi/v0/status', headers={
+            'Host': 'local-tailscaled.sock',
+            'Sec-Tailscale': 'localapi'
+        })
+        resp = conn.getresponse()
+        data = resp.read()
+        if resp.status == 200:
+            return json.loads(data)
+    except (OSError, http.client.HTTPException, ValueError):
+        pass
+    finally:
+        conn.close()
+    
+    # Older tailscaled / permission problems: fall back to the CLI
+    return _tailscale_cli_status([TAILSCALE_BIN, 'status', '--json'])
+
+class TailscaleStatusProvider:
+    """
+    Cached Tailscale status shared by every caller in the process
+    Parsed status is reused for `ttl` seconds; concurrent refreshes are coalesced
+    """
+    
+    def __init__(self, name, fetch, ttl=5):
+        self.name = name
+        self.ttl = ttl
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._status = None
+        self._installed = True
+        self._fetched_at = 0.0
+        self._live = False  # True while a bus watcher is pushing updates
+    
+    def _refresh(self):
+        try:
+            status = self._fetch()
+            installed = True
+        except FileNotFoundError:
+            status, installed = None, False
+        with self._lock:
+            self._status = status
+            self._installed = installed
+            self._fetched_at = time.monotonic()
+    
+    def raw(self, max_age=None):
+        """
+        Parsed status dict, or None if tailscaled is not running
+        Raises FileNotFoundError if Tailscale is not installed
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            fresh = self._live or time.monotonic() - self._fetched_at < max_age
+        if not fresh:
+            probe_flights.do(('tailscale_status', self.name), self._refresh)
+        with self._lock:
+            if not self._installed:
+                raise FileNotFoundError(self.name)
+            return self._status
+    
+    def summary(self, max_age=None):
+        """summarize_tailscale_status() of the cached status (tailnet validated)"""
+        return config_builder.summarize_tailscale_status(self.raw(max_age))
+    
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = 0.0
+    
+    def publish(self, status):
+        """Install pushed status; it stays current (no fetches) until detach()"""
+        with self._lock:
+            self._status = status
+            self._installed = True
+            self._fetched_at = time.monotonic()
+            self._live = True
+    
+    def detach(self):
+        """Push source went away - fall back to TTL fetches"""
+        with self._lock:
+            self._live = False
+            self._fetched_at = 0.0
+
+tailscale_provider = TailscaleStatusProvider('host', _tailscale_localapi_status)
+
+# tailscaled inside the tailscale-private container does not expose its socket to the host
+private_tailscale_provider = TailscaleStatusProvider(
+    'private',
+    lambda: _tailscale_cli_status(['docker', 'exec', 'tailscale-private', 'tailscale', 'status', '--json'])
+)
+
+# In-process config builds read Tailscale state from the shared cache
+config_builder.set_tailscale_status_source(tailscale_provider.raw)
+
+# ipn.State values as sent on the IPN bus
+IPN_STATES = ['NoState', 'InUseOtherUser', 'NeedsLogin', 'NeedsMachineAuth',
+              'Stopped', 'Starting', 'Running']
+
+# ipn.NotifyWatchOpt bits
+IPN_NOTIFY_INITIAL_STATE = 1 << 1
+IPN_NOTIFY_INITIAL_NETMAP = 1 << 3
+IPN_NOTIFY_NO_PRIVATE_KEYS = 1 << 4
+
+class TailscaleBusWatcher:
+    """
+    Follows tailscaled's IPN notification bus (/localapi/v0/watch-ipn-bus)
+    BackendState and self node changes are pushed into the provider as they
+    happen, so status reads never touch tailscaled while the stream is up
+    """
+    
+    SUMMARY_FIELDS = ('backend_state', 'ip', 'dns_name', 'wrong_tailnet', 'connected')
+    
+    def __init__(self, provider, socket_path=TAILSCALED_SOCKET):
+        self.provider = provider
+        self.socket_path = socket_path
+        self._status = {}
+        self._summary = None
+        self._listeners = []
+        self._delivered = False  # The current bus connection has produced a notification
+        self._thread = None
+    
+    def start(self):
+        """Start the background watcher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='tailscale-watcher', daemon=True)
+        self._thread.start()
+    
+    def add_listener(self, fn):
+        """fn(old_summary, new_summary) runs on the watcher thread when state changes"""
+        self._listeners.append(fn)
+    
+    def _apply(self, notify):
+        """Fold one ipn.Notify into the status document"""
+        updated = False
+        
+        if 'State' in notify:
+            state = notify['State']
+            if isinstance(state, int) and 0 <= state < len(IPN_STATES):
+                state = IPN_STATES[state]
+            self._status['BackendState'] = str(state)
+            if self._status['BackendState'] != 'Running':
+                self._status.pop('Self', None)  # Logged out / stopped: the old node is gone
+            updated = True
+        
+        netmap = notify.get('NetMap')
+        if netmap:
+            self_node = netmap.get('SelfNode') or {}
+            self._status['Self'] = {
+                # Addresses are prefixes ("100.x.y.z/32")
+                'TailscaleIPs': [addr.split('/')[0] for addr in self_node.get('Addresses') or []],
+                'DNSName': self_node.get('Name', '')
+            }
+            updated = True
+        
+        if not updated:
+            return
+        
+        self.provider.publish(dict(self._status))
+        
+        if self._status.get('BackendState') == 'Running' and 'Self' not in self._status:
+            return  # Running but no netmap yet - compare once the node is known
+        
+        summary = config_builder.summarize_tailscale_status(self._status)
+        old = self._summary
+        self._summary = summary
+        if old is None:
+            return  # Initial state after startup seeds the comparison; nothing changed
+        if any(old[k] != summary[k] for k in self.SUMMARY_FIELDS):
+            for fn in self._listeners:
+                try:
+                    fn(old, summary)
+                except Exception as e:
+                    print(f"⚠ Tailscale watcher listener failed: {e}")
+    
+    def _follow_bus(self):
+        """Block on the IPN bus, applying each notification"""
+        mask = IPN_NOTIFY_INITIAL_STATE | IPN_NOTIFY_INITIAL_NETMAP | IPN_NOTIFY_NO_PRIVATE_KEYS
+        conn = UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            conn.request('GET', f'/localapi/v0/watch-ipn-bus?mask={mask}', headers={
+                'Host': 'local-tailscaled.sock',
+                'Sec-Tailscale': 'localapi'
+            })
+            response = conn.getresponse()
+            if response.status != 200:
+                raise ConnectionError(f"IPN bus failed: HTTP {response.status}")
+            # _status and _summary survive reconnects: the initial notification
+            # refreshes them, and changes made while we were away still fire
+            while True:
+                line = response.readline()
+                if not line:
+                    raise ConnectionError('IPN bus closed')
+                self._delivered = True
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except ValueError:
+                    continue
+        finally:
+            conn.close()
+    
+    def _run(self):
+        backoff = 1
+        while True:
+            try:
+                if not os.path.exists(self.socket_path):
+                    raise FileNotFoundError('tailscaled socket not found')
+                self._delivered = False
+                self._follow_bus()
+            except FileNotFoundError:
+                pass  # Not installed / not started yet - check again later
+            except Exception as e:
+                print(f"⚠ Tailscale watcher: {e} (retrying in {backoff}s)")
+            self.provider.detach()
+            if self._delivered:
+                backoff = 1  # The stream worked; only refused/failed connects back off
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+tailscale_watcher = TailscaleBusWatcher(tailscale_provider)
+
+TAKNET_RECONCILE_DELAY = 5  # seconds of stable Tailscale state before redeploying
+_taknet_reconcile_timer = None
+_taknet_reconcile_lock = threading.Lock()
+
+def reconcile_taknet_host():
+    """
+    Auto mode: redeploy ultrafeeder if Tailscale state changed the selected
+    TAKNET-PS host (primary over Tailscale, fallback otherwise)
+    """
+    env = config_store.snapshot()
+    if env.get('TAKNET_PS_CONNECTION_MODE', 'auto').lower() != 'auto':
+        return
+    if not container_running('ultrafeeder'):
+        return  # Not deployed yet (or being deployed) - the next build picks it up
+    
+    deploy = jobs.latest('deploy')
+    if deploy is not None and deploy.active:
+        return  # A deploy is queued or in flight and builds with current state
+    
+    try:
+        build = build_config_in_process()
+        if compose_targets(build, ['ultrafeeder']):
+            print("⚙ Tailscale state changed - redeploying ultrafeeder")
+            subprocess.run(['docker', 'compose', 'up', '-d', 'ultrafeeder'],
+                         cwd='/opt/adsb/config',
+                         timeout=60,
+                         check=True)
+            config_builder.mark_deployed(build, ['ultrafeeder'])
+    except Exception as e:
+        print(f"⚠ TAKNET-PS host reconcile failed: {e}")
+
+def _on_tailscale_change(old, new):
+    """Debounce flaps: reconcile once state has been stable for a few seconds"""
+    global _taknet_reconcile_timer
+    if old is not None and old['connected'] == new['connected']:
+        return
+    with _taknet_reconcile_lock:
+        if _taknet_reconcile_timer:
+            _taknet_reconcile_timer.cancel()
+        # Runs as a job so its compose call waits for (or folds into) any other compose job
+        _taknet_reconcile_timer = threading.Timer(TAKNET_RECONCILE_DELAY, lambda: jobs.submit(
+            'taknet-reconcile', reconcile_taknet_host, dedupe='queued', group=COMPOSE_JOBS))
+        _taknet_reconcile_timer.daemon = True
+        _taknet_reconcile_timer.start()
+
+tailscale_watcher.add_listener(_on_tailscale_change)
+
 def get_tailscale_status():
     """Get Tailscale connection status with tailnet validation"""
     try:
-        tailscale_bin = '/usr/bin/tailscale'
-        
-        # Check if installed
-        if not os.path.exists(tailscale_bin):
+        status_data = tailscale_provider.raw()
+        if status_data is None:
             return {
-                'installed': False,
+                'installed': True,
                 'connected': False,
-                'message': 'Tailscale not installed'
+                'message': 'Tailscale installed but not running'
             }
         
-        # Get status
-        result = subprocess.run([tailscale_bin, 'status', '--json'], 
-                               capture_output=True, text=True, timeout=5)
+        summary = config_builder.summarize_tailscale_status(status_data)
         
-        if result.returncode == 0:
-            try:
-                status_data = json.loads(result.stdout)
-                
-                # Check if connected (BackendState should be "Running")
-                backend_state = status_data.get('BackendState', '')
-                connected = backend_state == 'Running'
-                
-                # Get self info
-                self_info = status_data.get('Self', {})
-                ip = self_info.get('TailscaleIPs', [''])[0] if self_info.get('TailscaleIPs') else None
-                hostname = self_info.get('DNSName', '').rstrip('.')
-                
-                # CRITICAL: Validate we're on TAKNET-PS tailnet
-                expected_suffix = 'tail4d77be.ts.net'
-                on_correct_tailnet = hostname.endswith(expected_suffix) if hostname else False
-                
-                if connected and not on_correct_tailnet:
-                    # Connected but to WRONG tailnet
-                    return {
-                        'installed': True,
-                        'connected': False,  # Treat as not connected
-                        'wrong_tailnet': True,
-                        'ip': ip,
-                        'hostname': hostname,
-                        'backend_state': backend_state,
-                        'message': f'Connected to wrong tailnet: {hostname}. Expected: *.{expected_suffix}'
-                    }
-                
-                return {
-                    'installed': True,
-                    'connected': connected and on_correct_tailnet,
-                    'ip': ip,
-                    'hostname': hostname,
-                    'backend_state': backend_state,
-                    'on_correct_tailnet': on_correct_tailnet
-                }
-            except json.JSONDecodeError:
-                # Fall back to non-JSON status
-                result = subprocess.run([tailscale_bin, 'status'], 
-                                       capture_output=True, text=True, timeout=5)
-                return {
-                    'installed': True,
-                    'connected': 'running' in result.stdout.lower(),
-                    'message': 'Connected' if result.returncode == 0 else 'Not connected'
-                }
-        else:
+        if summary['wrong_tailnet']:
+            # Connected but to WRONG tailnet
             return {
                 'installed': True,
-                'connected': False,
-                'message': 'Tailscale installed but not running'
+                'connected': False,  # Treat as not connected
+                'wrong_tailnet': True,
+                'ip': summary['ip'],
+                'hostname': summary['dns_name'],
+                'backend_state': summary['backend_state'],
+                'message': f"Connected to wrong tailnet: {summary['dns_name']}. Expected: *.{config_builder.TAKNET_TAILNET_SUFFIX}"
             }
+        
+        return {
+            'installed': True,
+            'connected': summary['running'] and summary['on_correct_tailnet'],
+            'ip': summary['ip'],
+            'hostname': summary['dns_name'],
+            'backend_state': summary['backend_state'],
+            'on_correct_tailnet': summary['on_correct_tailnet']
+        }
             
     except FileNotFoundError:
         return {
@@ -625,18 +2834,38 @@ def get_tailscale_status():
             'error': str(e)
         }
 
+# /api/tailscale/progress shape, before any install job
+TAILSCALE_IDLE_PROGRESS = {
+    'status': 'idle',  # idle, downloading, installing, registering, completed, failed
+    'download_progress': 0,
+    'install_progress': 0,
+    'register_progress': 0,
+    'message': '',
+    'download_bytes': 0,
+    'total_bytes': 0,
+    'error': None
+}
+
 def update_tailscale_progress(status, download_progress=0, install_progress=0, register_progress=0, message='', download_bytes=0, total_bytes=0):
-    """Update global Tailscale progress state"""
-    global tailscale_progress
-    with tailscale_progress_lock:
-        tailscale_progress['status'] = status
-        tailscale_progress['download_progress'] = download_progress
-        tailscale_progress['install_progress'] = install_progress
-        tailscale_progress['register_progress'] = register_progress
-        tailscale_progress['message'] = message
-        tailscale_progress['download_bytes'] = download_bytes
-        tailscale_progress['total_bytes'] = total_bytes
-        print(f"[Tailscale Progress] {status}: {message} (download: {download_progress}%, install: {install_progress}%, register: {register_progress}%)")
+    """Update the running Tailscale install job's progress (each new message also goes to its log)"""
+    print(f"[Tailscale Progress] {status}: {message} (download: {download_progress}%, install: {install_progress}%, register: {register_progress}%)")
+    job = jobs.current()
+    if job is None:
+        return
+    if message and job.progress.get('message') != message:
+        job.log(message)
+    job.update(
+        status=status,
+        download_progress=download_progress,
+        install_progress=install_progress,
+        register_progress=register_progress,
+        message=message,
+        download_bytes=download_bytes,
+        total_bytes=total_bytes,
+        error=message if status == 'failed' else None
+    )
+    if status == 'failed':
+        job.fail(message)
 
 def install_tailscale_with_progress(auth_key=None, hostname=None):
     """Install and configure Tailscale with progress tracking"""
@@ -789,19 +3018,11 @@ def install_tailscale_with_progress(auth_key=None, hostname=None):
         connected = False
         for attempt in range(30):
             try:
-                status_result = subprocess.run([tailscale_bin, 'status', '--json'], 
-                                             capture_output=True, text=True, timeout=5)
-                if status_result.returncode == 0:
-                    try:
-                        status_data = json.loads(status_result.stdout)
-                        backend_state = status_data.get('BackendState', '')
-                        if backend_state == 'Running':
-                            connected = True
-                            update_tailscale_progress('registering', 100, 100, 95, 
-                                                    'Connection verified!', 0, 0)
-                            break
-                    except:
-                        pass
+                if tailscale_provider.summary(max_age=0)['running']:
+                    connected = True
+                    update_tailscale_progress('registering', 100, 100, 95, 
+                                            'Connection verified!', 0, 0)
+                    break
             except:
                 pass
             
@@ -833,9 +3054,7 @@ def install_tailscale_with_progress(auth_key=None, hostname=None):
         # Save hostname to .env file if it was provided
         if hostname:
             try:
-                env = read_env()
-                env['TAILSCALE_HOSTNAME'] = hostname
-                write_env(env)
+                update_env_var('TAILSCALE_HOSTNAME', hostname)
                 print(f"✓ Tailscale hostname saved: {hostname}")
             except Exception as e:
                 print(f"⚠️ Could not save Tailscale hostname: {e}")
@@ -859,7 +3078,6 @@ def install_tailscale_with_progress(auth_key=None, hostname=None):
         update_tailscale_progress('failed', 0, 0, 0, 'Installation timed out', 0, 0)
     except Exception as e:
         update_tailscale_progress('failed', 0, 0, 0, str(e), 0, 0)
-        update_tailscale_progress('failed', 0, 0, str(e))
 
 def get_network_connection_mode():
     """Detect current internet connection type: wifi, ethernet, usb, or none"""
@@ -968,7 +3186,7 @@ def get_network_connection_mode():
 @app.route('/')
 def index():
     """Main page - check if configured"""
-    env = read_env()
+    env = config_store.snapshot()
     
     # ALWAYS check SDR first (even on fresh install)
     # If no SDR device configured, go to SDR wizard
@@ -1001,7 +3219,7 @@ def setup_sdr():
 @app.route('/setup')
 def setup():
     """Setup wizard - Step 2: Location Configuration"""
-    env = read_env()
+    env = config_store.snapshot()
     feeder_uuid = get_or_create_feeder_uuid()
     return render_template('setup.html', config=env, feeder_uuid=feeder_uuid)
 
@@ -1013,7 +3231,7 @@ def loading():
 @app.route('/dashboard')
 def dashboard():
     """Status dashboard"""
-    env = read_env()
+    env = config_store.snapshot()
     docker_status = get_docker_status()
     taknet_status = get_taknet_connection_status(env)
     feeder_uuid = get_or_create_feeder_uuid()
@@ -1042,19 +3260,22 @@ def about():
 
 @app.route('/api/logs/<source>')
 def get_logs(source):
-    """Fetch logs from various sources"""
+    """
+    Fetch logs from various sources, filtered server-side
+    Query: include/exclude (substring, repeatable), since/until (epoch or 15m/2h/1d,
+    timestamped sources only), max_lines (last N matches returned), tail (lines
+    read from the source)
+    """
     try:
-        if source == 'ultrafeeder':
-            # Get ultrafeeder logs from docker
-            result = subprocess.run(['docker', 'logs', '--tail', '500', 'ultrafeeder'],
-                                  capture_output=True, text=True, timeout=10)
-            logs = result.stdout + result.stderr
-            
-        elif source == 'tailscale':
-            # Get tailscale logs from journalctl
-            result = subprocess.run(['journalctl', '-u', 'tailscaled', '-n', '500', '--no-pager'],
-                                  capture_output=True, text=True, timeout=10)
-            logs = result.stdout
+        log_filter = LogFilter.from_args(request.args, timed=source in LOG_TIMED_SOURCES)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        if source in LOG_STREAMS:
+            # ultrafeeder (Docker API) / tailscale (journald): one pass, never held whole
+            entries = LOG_STREAMS[source](tail=log_filter.tail, follow=False,
+                                          since=log_filter.since, until=log_filter.until).read()
             
         elif source == 'vnstat':
             # Get vnstat hour and day reports
@@ -1062,23 +3283,60 @@ def get_logs(source):
                                        capture_output=True, text=True, timeout=10)
             day_result = subprocess.run(['vnstat', '-d'],
                                       capture_output=True, text=True, timeout=10)
-            logs = "=== HOURLY REPORT ===\n" + hour_result.stdout + "\n\n=== DAILY REPORT ===\n" + day_result.stdout
+            report = "=== HOURLY REPORT ===\n" + hour_result.stdout + "\n\n=== DAILY REPORT ===\n" + day_result.stdout
+            entries = ((None, line) for line in report.splitlines())
             
         else:
             return jsonify({'success': False, 'message': f'Unknown log source: {source}'})
         
+        # Only the newest max_lines matches are ever kept
+        lines = deque((line for _, line in log_filter.apply(entries) if line is not LOG_RESET),
+                      maxlen=log_filter.max_lines)
+        logs = '\n'.join(lines)
+        
         if not logs or logs.strip() == '':
-            logs = f'No logs available for {source}'
+            logs = f'No matching log lines for {source}' if log_filter.active else f'No logs available for {source}'
         
-        return jsonify({'success': True, 'logs': logs})
+        return jsonify({'success': True, 'logs': logs, **log_filter.summary()})
         
     except subprocess.TimeoutExpired:
         return jsonify({'success': False, 'message': 'Timeout while fetching logs'})
+    except socket.timeout:
+        return jsonify({'success': False, 'message': 'Timeout while fetching logs'})
     except FileNotFoundError:
         return jsonify({'success': False, 'message': f'Service {source} not found or not installed'})
+    except (DockerAPIError, OSError) as e:
+        return jsonify({'success': False, 'message': f'Log source unavailable: {e}'})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/logs/<source>/stream')
+def stream_logs(source):
+    """
+    Server-Sent Events log stream. Starts at ?cursor= (or the last ?tail= lines),
+    then follows new lines unless ?follow=0; reconnects resume via Last-Event-ID.
+    Takes the same include/exclude/since/until filters as /api/logs/<source>
+    """
+    factory = LOG_STREAMS.get(source)
+    if factory is None:
+        return jsonify({'success': False, 'message': f'Log source {source} cannot be streamed'}), 404
+    
+    try:
+        log_filter = LogFilter.from_args(request.args, timed=source in LOG_TIMED_SOURCES)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('cursor') or None
+    tail = min(max(request.args.get('tail', 500, type=int), 0), 5000)
+    follow = request.args.get('follow', '1') != '0'
+    follower = factory(cursor=cursor, tail=tail, follow=follow, since=log_filter.since,
+                       until=log_filter.until, log_filter=log_filter).start()
+    
+    return Response(stream_log_events(follower), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/feeds/toggle', methods=['POST'])
 def api_feeds_toggle():
     """Toggle feed on/off"""
@@ -1109,34 +3367,36 @@ def api_feeds_toggle():
         if feed_name in ['adsblol', 'adsbexchange'] and enabled:
             get_or_create_feeder_uuid()
         
-        # Regenerate docker-compose.yml with updated feed configuration
-        try:
-            subprocess.run(
-                ['python3', '/opt/adsb/scripts/config_builder.py'],
-                cwd='/opt/adsb/config',
-                timeout=30,
-                check=True,
-                capture_output=True
-            )
-        except subprocess.CalledProcessError as e:
-            return jsonify({
-                'success': False, 
-                'message': f'Failed to regenerate config: {e.stderr.decode()}'
-            })
+        # Rebuild + restart runs as a job; toggles made while one is queued ride along with it
+        job = jobs.submit('feeds-toggle', apply_feed_config, dedupe='queued', group=COMPOSE_JOBS)
+        return jsonify({'success': True, 'pending': True, 'job_id': job.id, 'message': f'Feed {feed_name} updated'})
         
-        # Restart ultrafeeder with updated configuration
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+def apply_feed_config():
+    """Regenerate docker-compose.yml from .env and restart ultrafeeder if it changed (background job)"""
+    # Regenerate docker-compose.yml with updated feed configuration
+    try:
+        build = build_config_in_process()
+    except Exception as e:
+        return {
+            'success': False, 
+            'message': f'Failed to regenerate config: {e}'
+        }
+    
+    # Restart ultrafeeder with updated configuration (skipped if nothing changed)
+    if compose_targets(build, ['ultrafeeder'], wanted=['ultrafeeder']):
         try:
             subprocess.run(['docker', 'compose', 'up', '-d', 'ultrafeeder'], 
                          cwd='/opt/adsb/config',
                          timeout=30, 
                          check=True)
+            config_builder.mark_deployed(build, ['ultrafeeder'])
         except:
-            pass  # Continue even if restart fails
-        
-        return jsonify({'success': True, 'message': f'Feed {feed_name} updated'})
-        
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)})
+            jobs.log('Restart of ultrafeeder failed')  # Config is saved; continue as before
+    
+    return {'success': True, 'message': 'Feed configuration applied'}
 
 @app.route('/api/feeds/fr24/setup', methods=['POST'])
 def api_fr24_setup():
@@ -1149,8 +3409,7 @@ def api_fr24_setup():
             return jsonify({'success': False, 'message': 'Feeder ID is required'})
         
         # Update .env with FR24 key
-        update_env_var('FR24_KEY', feeder_id)
-        update_env_var('FR24_ENABLED', 'true')
+        update_env({'FR24_KEY': feeder_id, 'FR24_ENABLED': 'true'})
         
         # Start FR24 container using docker compose
         # Use the correct paths - config is at /opt/adsb not /opt/taknet-ps
@@ -1207,7 +3466,11 @@ def api_fr24_test():
 
 @app.route('/api/feeds/fr24/register', methods=['POST'])
 def api_fr24_register():
-    """Register new FR24 account - smart registration with coordinate formatting"""
+    """
+    Register new FR24 account - smart registration with coordinate formatting
+    Input is validated here; the signup itself (up to 2 minutes) runs as a
+    background job whose result is the registration outcome
+    """
     try:
         data = request.json
         email = data.get('email', '').strip()
@@ -1248,6 +3511,24 @@ def api_fr24_register():
         lon_formatted = f"{lon:.4f}"
         alt_formatted = str(int(alt_ft))  # Altitude in feet, no decimals
         
+        job = jobs.submit('fr24-register', register_fr24, (email, lat_formatted, lon_formatted, alt_formatted),
+                          dedupe='active')
+        return jsonify({'success': True, 'pending': True, 'job_id': job.id, 'message': 'Registration started'})
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error_type': 'exception',
+            'message': f'Unexpected error during registration: {str(e)}\n\nYou can register manually:\n1. Visit the FR24 registration page (link below)\n2. Complete registration with your email\n3. Copy your sharing key and paste it above',
+            'url': 'https://www.flightradar24.com/share-your-data'
+        })
+
+
+def register_fr24(email, lat_formatted, lon_formatted, alt_formatted):
+    """Run fr24feed --signup (background job); returns the registration outcome payload"""
+    try:
+        jobs.log(f"Registering {email} at {lat_formatted}, {lon_formatted} ({alt_formatted} ft)")
+        
         # Prepare answers for fr24feed --signup
         signup_inputs = f'''{email}
 
@@ -1288,25 +3569,25 @@ no
             if key_match:
                 # SUCCESS: Key found and extracted
                 sharing_key = key_match.group(1)
-                return jsonify({
+                return {
                     'success': True,
                     'sharing_key': sharing_key,
                     'message': f'Registration successful! Your sharing key: {sharing_key}'
-                })
+                }
             
             # If we get here, no key was extracted
             # Check for CLEAR FAILURE indicators
             
             # ERROR 1: Three-key limit reached
             if 'limit' in output.lower() or 'maximum' in output.lower() or ('three' in output.lower() and 'feeder' in output.lower()):
-                return jsonify({
+                return {
                     'success': False,
                     'error_type': 'key_limit',
                     'message': f'Your FlightRadar24 account has reached the 3-feeder limit.\n\nTo add this feeder, you need to:\n1. Log in to your FR24 account with: {email}\n2. Remove an old feeder or request additional keys from FR24 support\n3. Copy your sharing key and paste it in the field above',
                     'url': 'https://www.flightradar24.com/account/data-sharing',
                     'email': email,
                     'debug_output': output[:1000]
-                })
+                }
             
             # ERROR 2: Clear failure messages
             clear_failures = [
@@ -1317,18 +3598,18 @@ no
             ]
             
             if any(clear_failures):
-                return jsonify({
+                return {
                     'success': False,
                     'error_type': 'network_error',
                     'message': f'Network error during registration.\n\nYou can register manually:\n1. Log in or create account with: {email}\n2. Complete the FR24 feeder registration\n3. Copy your sharing key and paste it in the field above',
                     'url': 'https://www.flightradar24.com/share-your-data',
                     'email': email,
                     'debug_output': output[:1000]
-                })
+                }
             
             # DEFAULT: Assume registration succeeded but we couldn't extract the key
             # This is the "fail-open" approach - better to assume success and let user verify
-            return jsonify({
+            return {
                 'success': False,
                 'error_type': 'key_extraction_failed',
                 'message': f'We couldn\'t automatically retrieve your sharing key.\n\nNext steps:\n1. Log in with: {email}\n2. Copy your sharing key\n3. Paste it in the field above and click "Save & Enable FR24"',
@@ -1336,24 +3617,24 @@ no
                 'email': email,
                 'registration_successful': True,
                 'debug_output': output[:1000]
-            })
+            }
                 
         except subprocess.TimeoutExpired:
-            return jsonify({
+            return {
                 'success': False,
                 'error_type': 'timeout',
                 'message': f'Registration process timed out (took over 2 minutes).\n\nThe registration may have completed successfully.\n\nNext steps:\n1. Log in to your FR24 account with: {email}\n2. Check if your feeder was registered\n3. If yes, copy your sharing key and paste it above',
                 'url': 'https://www.flightradar24.com/account/data-sharing',
                 'email': email
-            })
+            }
         
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error_type': 'exception',
             'message': f'Unexpected error during registration: {str(e)}\n\nYou can register manually:\n1. Visit the FR24 registration page (link below)\n2. Complete registration with your email\n3. Copy your sharing key and paste it above',
             'url': 'https://www.flightradar24.com/share-your-data'
-        })
+        }
 
 @app.route('/api/feeds/fr24/status', methods=['GET'])
 def api_fr24_status():
@@ -1437,8 +3718,7 @@ def api_piaware_setup():
                 })
             
             # Save feeder ID and enable
-            update_env_var('PIAWARE_FEEDER_ID', feeder_id_input)
-            update_env_var('PIAWARE_ENABLED', 'true')
+            update_env({'PIAWARE_FEEDER_ID': feeder_id_input, 'PIAWARE_ENABLED': 'true'})
             
             # Start PiAware container
             compose_file = '/opt/adsb/config/docker-compose.yml'
@@ -1457,144 +3737,157 @@ def api_piaware_setup():
                     'message': f'.env file not found at: {env_file}\n\nPlease run the installer to create the .env file.'
                 })
             
-            result = subprocess.run(
-                ['docker', 'compose', '-f', compose_file, '--env-file', env_file, 'up', '-d', 'piaware'],
-                capture_output=True, text=True, timeout=60
-            )
-            
-            if result.returncode == 0:
-                return jsonify({
-                    'success': True,
-                    'message': 'FlightAware feed configured successfully! Container is starting...',
-                    'feeder_id': feeder_id_input,
-                    'mode': 'existing'
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': f'Failed to start PiAware: {result.stderr}'
-                })
+            job = jobs.submit('piaware-start', start_piaware, (feeder_id_input,), dedupe='active',
+                              group=COMPOSE_JOBS)
+            return jsonify({'success': True, 'pending': True, 'job_id': job.id, 'message': 'Starting PiAware...'})
         
         else:
             # No feeder ID provided - GENERATE NEW ONE
             # Run PiAware container temporarily to get a new feeder ID
             
-            # Read location from env
-            env = read_env()
-            lat = env.get('FEEDER_LAT', '0')
-            lon = env.get('FEEDER_LONG', '0')
+            # Read location from env
+            env = read_env()
+            lat = env.get('FEEDER_LAT', '0')
+            lon = env.get('FEEDER_LONG', '0')
+            
+            job = jobs.submit('piaware-generate', generate_piaware_id, (lat, lon), dedupe='active')
+            return jsonify({'success': True, 'pending': True, 'job_id': job.id,
+                            'message': 'Generating FlightAware Feeder ID...'})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)})
+
+def start_piaware(feeder_id):
+    """Bring up the piaware container for a saved feeder ID (background job)"""
+    result = subprocess.run(
+        ['docker', 'compose', '-f', '/opt/adsb/config/docker-compose.yml', '--env-file', str(ENV_FILE), 'up', '-d', 'piaware'],
+        capture_output=True, text=True, timeout=60
+    )
+    
+    if result.returncode == 0:
+        return {
+            'success': True,
+            'message': 'FlightAware feed configured successfully! Container is starting...',
+            'feeder_id': feeder_id,
+            'mode': 'existing'
+        }
+    else:
+        return {
+            'success': False,
+            'message': f'Failed to start PiAware: {result.stderr}'
+        }
+
+def generate_piaware_id(lat, lon):
+    """Run a throwaway PiAware container until it reports a new feeder ID (background job)"""
+    try:
+        # v2.40.5: Real-time streaming implementation (like adsb.im method)
+        # Use Popen to stream output line-by-line and exit early when ID found
+        # This matches the official method: timeout 60 docker run ... | grep "my feeder ID"
+        import re
+        import time
+        
+        docker_cmd = [
+            'docker', 'run', '--rm',
+            '-e', f'LAT={lat}',
+            '-e', f'LONG={lon}',
+            'ghcr.io/sdr-enthusiasts/docker-piaware:latest'
+        ]
+        
+        # Start process with line-buffered output
+        process = subprocess.Popen(
+            docker_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,  # Line buffered
+            universal_newlines=True
+        )
+        
+        start_time = time.time()
+        timeout = 90  # Reduced from 120 to 90 seconds (adsb.im uses 60)
+        feeder_id = None
+        full_output = []
+        
+        # Pattern to match feeder ID
+        id_pattern = re.compile(r'my feeder[- ]?id is ([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', re.IGNORECASE)
+        
+        # Read output line by line in real-time
+        while True:
+            # Check timeout
+            if time.time() - start_time > timeout:
+                process.kill()
+                process.wait()
+                raise subprocess.TimeoutExpired(docker_cmd, timeout)
+            
+            # Read next line (with timeout)
+            line = process.stdout.readline()
+            
+            if not line:
+                # Process ended
+                break
+            
+            full_output.append(line)
+            jobs.log(line.rstrip())
             
-            try:
-                # v2.40.5: Real-time streaming implementation (like adsb.im method)
-                # Use Popen to stream output line-by-line and exit early when ID found
-                # This matches the official method: timeout 60 docker run ... | grep "my feeder ID"
-                import re
-                import time
-                
-                docker_cmd = [
-                    'docker', 'run', '--rm',
-                    '-e', f'LAT={lat}',
-                    '-e', f'LONG={lon}',
-                    'ghcr.io/sdr-enthusiasts/docker-piaware:latest'
-                ]
-                
-                # Start process with line-buffered output
-                process = subprocess.Popen(
-                    docker_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,  # Line buffered
-                    universal_newlines=True
-                )
-                
-                start_time = time.time()
-                timeout = 90  # Reduced from 120 to 90 seconds (adsb.im uses 60)
-                feeder_id = None
-                full_output = []
-                
-                # Pattern to match feeder ID
-                id_pattern = re.compile(r'my feeder[- ]?id is ([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', re.IGNORECASE)
-                
-                # Read output line by line in real-time
-                while True:
-                    # Check timeout
-                    if time.time() - start_time > timeout:
-                        process.kill()
-                        process.wait()
-                        raise subprocess.TimeoutExpired(docker_cmd, timeout)
-                    
-                    # Read next line (with timeout)
-                    line = process.stdout.readline()
-                    
-                    if not line:
-                        # Process ended
-                        break
-                    
-                    full_output.append(line)
-                    
-                    # Check for feeder ID in this line
-                    match = id_pattern.search(line)
-                    if match:
-                        feeder_id = match.group(1)
-                        # Found it! Kill the container immediately (like grep does)
-                        process.kill()
-                        process.wait()
-                        break
-                
-                # Wait for process to complete (if it hasn't been killed already)
-                if process.poll() is None:
-                    process.wait(timeout=5)
-                
-                if feeder_id:
-                    # Success! Got the ID
-                    elapsed = time.time() - start_time
-                    return jsonify({
-                        'success': True,
-                        'feeder_id': feeder_id,
-                        'mode': 'generated',
-                        'message': f'New FlightAware Feeder ID generated in {int(elapsed)} seconds: {feeder_id}',
-                        'next_steps': [
-                            f'Your new Feeder ID: {feeder_id}',
-                            'Claim this feeder at FlightAware (link below)',
-                            'Come back and enter the Feeder ID above',
-                            'Click "Save & Enable FlightAware"'
-                        ],
-                        'claim_url': f'https://flightaware.com/adsb/piaware/claim/{feeder_id}'
-                    })
-                else:
-                    # Failed to extract ID
-                    output_str = ''.join(full_output)
-                    return jsonify({
-                        'success': False,
-                        'error_type': 'id_extraction_failed',
-                        'message': 'Could not generate Feeder ID. Please try again or get one manually from FlightAware.',
-                        'url': 'https://flightaware.com/adsb/piaware/claim',
-                        'debug_output': output_str[:1000] if output_str else 'No output captured'
-                    })
-                    
-            except subprocess.TimeoutExpired:
-                return jsonify({
-                    'success': False,
-                    'error_type': 'timeout',
-                    'message': 'Timeout while generating Feeder ID (took longer than 90 seconds). This can happen if Docker image is downloading (~500MB, 5-10 min) or network is slow. Please wait for download to complete and try again.',
-                    'url': 'https://flightaware.com/adsb/piaware/claim',
-                    'manual_method': [
-                        'Check if image is downloading: docker images | grep piaware',
-                        'Or run manually: cd /tmp && bash generate-piaware-feederid.sh',
-                        'Or get ID from FlightAware website (link above)'
-                    ]
-                })
-            except Exception as e:
-                return jsonify({
-                    'success': False,
-                    'error_type': 'exception',
-                    'message': f'Error generating Feeder ID: {str(e)}',
-                    'url': 'https://flightaware.com/adsb/piaware/claim'
-                })
+            # Check for feeder ID in this line
+            match = id_pattern.search(line)
+            if match:
+                feeder_id = match.group(1)
+                # Found it! Kill the container immediately (like grep does)
+                process.kill()
+                process.wait()
+                break
         
+        # Wait for process to complete (if it hasn't been killed already)
+        if process.poll() is None:
+            process.wait(timeout=5)
+        
+        if feeder_id:
+            # Success! Got the ID
+            elapsed = time.time() - start_time
+            return {
+                'success': True,
+                'feeder_id': feeder_id,
+                'mode': 'generated',
+                'message': f'New FlightAware Feeder ID generated in {int(elapsed)} seconds: {feeder_id}',
+                'next_steps': [
+                    f'Your new Feeder ID: {feeder_id}',
+                    'Claim this feeder at FlightAware (link below)',
+                    'Come back and enter the Feeder ID above',
+                    'Click "Save & Enable FlightAware"'
+                ],
+                'claim_url': f'https://flightaware.com/adsb/piaware/claim/{feeder_id}'
+            }
+        else:
+            # Failed to extract ID
+            output_str = ''.join(full_output)
+            return {
+                'success': False,
+                'error_type': 'id_extraction_failed',
+                'message': 'Could not generate Feeder ID. Please try again or get one manually from FlightAware.',
+                'url': 'https://flightaware.com/adsb/piaware/claim',
+                'debug_output': output_str[:1000] if output_str else 'No output captured'
+            }
+            
+    except subprocess.TimeoutExpired:
+        return {
+            'success': False,
+            'error_type': 'timeout',
+            'message': 'Timeout while generating Feeder ID (took longer than 90 seconds). This can happen if Docker image is downloading (~500MB, 5-10 min) or network is slow. Please wait for download to complete and try again.',
+            'url': 'https://flightaware.com/adsb/piaware/claim',
+            'manual_method': [
+                'Check if image is downloading: docker images | grep piaware',
+                'Or run manually: cd /tmp && bash generate-piaware-feederid.sh',
+                'Or get ID from FlightAware website (link above)'
+            ]
+        }
     except Exception as e:
-        return jsonify({'success': False, 'message': str(e)})
+        return {
+            'success': False,
+            'error_type': 'exception',
+            'message': f'Error generating Feeder ID: {str(e)}',
+            'url': 'https://flightaware.com/adsb/piaware/claim'
+        }
 
 @app.route('/api/feeds/piaware/status', methods=['GET'])
 def api_piaware_status():
@@ -1674,8 +3967,7 @@ def api_adsbhub_setup():
             return jsonify({'success': False, 'message': 'Station key is required'})
         
         # Update .env file
-        update_env_var('ADSBHUB_STATION_KEY', station_key)
-        update_env_var('ADSBHUB_ENABLED', 'true')
+        update_env({'ADSBHUB_STATION_KEY': station_key, 'ADSBHUB_ENABLED': 'true'})
         
         # Use the correct paths
         compose_file = '/opt/adsb/config/docker-compose.yml'
@@ -1776,20 +4068,23 @@ def api_adsbhub_toggle():
 @app.route('/settings')
 def settings():
     """Settings page"""
-    env = read_env()
+    env = config_store.snapshot()
     return render_template('settings.html', config=env, version=VERSION)
 
 @app.route('/feeds')
 def feeds():
     """Feeds configuration page"""
-    env = read_env()
+    env = config_store.snapshot()
     feeder_uuid = get_or_create_feeder_uuid()
     return render_template('feeds.html', config=env, feeder_uuid=feeder_uuid, version=VERSION)
 
 @app.route('/feeds/account-required')
 def feeds_account_required():
     """Account-required feeds configuration page"""
-    env = read_env()
+    env = config_store.snapshot()
+    
+    # One Docker API call covers all three account-based containers
+    running = get_docker_status()
     
     # Check FR24 status
     fr24_key = env.get('FR24_KEY', '')
@@ -1797,12 +4092,7 @@ def feeds_account_required():
     fr24_status = False
     if fr24_key and fr24_enabled:
         # Check if FR24 container is running
-        try:
-            result = subprocess.run(['docker', 'ps', '--filter', 'name=fr24', '--format', '{{.Names}}'],
-                                  capture_output=True, text=True, timeout=5)
-            fr24_status = 'fr24' in result.stdout
-        except:
-            fr24_status = False
+        fr24_status = 'Up' in running.get('fr24', '')
     
     # Check PiAware status
     piaware_feeder_id = env.get('PIAWARE_FEEDER_ID', '')
@@ -1810,12 +4100,7 @@ def feeds_account_required():
     piaware_status = False
     if piaware_feeder_id and piaware_enabled:
         # Check if PiAware container is running
-        try:
-            result = subprocess.run(['docker', 'ps', '--filter', 'name=piaware', '--format', '{{.Names}}'],
-                                  capture_output=True, text=True, timeout=5)
-            piaware_status = 'piaware' in result.stdout
-        except:
-            piaware_status = False
+        piaware_status = 'Up' in running.get('piaware', '')
     
     # Check ADSBHub status
     adsbhub_key = env.get('ADSBHUB_STATION_KEY', '')
@@ -1823,12 +4108,7 @@ def feeds_account_required():
     adsbhub_status = False
     if adsbhub_key and adsbhub_enabled:
         # Check if ADSBHub container is running
-        try:
-            result = subprocess.run(['docker', 'ps', '--filter', 'name=adsbhub', '--format', '{{.Names}}'],
-                                  capture_output=True, text=True, timeout=5)
-            adsbhub_status = 'adsbhub' in result.stdout
-        except:
-            adsbhub_status = False
+        adsbhub_status = 'Up' in running.get('adsbhub', '')
     
     return render_template('feeds-account-required.html', 
                          fr24_key=fr24_key,
@@ -1905,7 +4185,8 @@ def api_sdr_configure():
         data = request.json
         devices = data.get('devices', [])
         
-        env = read_env()
+        env = config_store.snapshot()
+        changes = {}
         
         # Save each configured device
         for device in devices:
@@ -1916,16 +4197,16 @@ def api_sdr_configure():
                 biastee = 'true' if device.get('biastee', False) else 'false'
                 
                 # Store as SDR_0=1090,autogain,false
-                env[f'SDR_{index}'] = f"{use_for},{gain},{biastee}"
+                changes[f'SDR_{index}'] = f"{use_for},{gain},{biastee}"
                 
                 # Set primary device (first 1090 device found)
-                if use_for == '1090' and 'READSB_DEVICE' not in env:
-                    env['READSB_DEVICE'] = str(index)
-                    env['READSB_GAIN'] = gain
+                if use_for == '1090' and 'READSB_DEVICE' not in env and 'READSB_DEVICE' not in changes:
+                    changes['READSB_DEVICE'] = str(index)
+                    changes['READSB_GAIN'] = gain
                     if biastee == 'true':
-                        env['READSB_ENABLE_BIASTEE'] = 'ON'
+                        changes['READSB_ENABLE_BIASTEE'] = 'ON'
         
-        write_env(env)
+        update_env(changes)
         return jsonify({'success': True})
         
     except Exception as e:
@@ -1934,7 +4215,7 @@ def api_sdr_configure():
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get current configuration"""
-    return jsonify(read_env())
+    return conditional_json(config_store.version(), read_env)
 
 @app.route('/api/config', methods=['POST'])
 def save_config():
@@ -1945,7 +4226,7 @@ def save_config():
     """
     try:
         data = request.json
-        env = read_env()
+        changes = {}
         
         # PROTECT TAK CONNECTION SETTINGS
         # User can only change TAKNET_PS_ENABLED (on/off), nothing else
@@ -1960,14 +4241,14 @@ def save_config():
         
         # Update env with user data (protected TAK settings excluded)
         for key, value in data.items():
-            env[key] = str(value)
+            changes[key] = str(value)
         
         # Force protected TAK connection settings (always these values)
         for key, value in TAK_PROTECTED_SETTINGS.items():
-            env[key] = value
+            changes[key] = value
         
-        # Write to file
-        write_env(env)
+        # Write to file (single atomic pass, comments preserved)
+        update_env(changes)
         
         # Rebuild ULTRAFEEDER_CONFIG
         rebuild_config()
@@ -1984,29 +4265,14 @@ def api_install_tailscale():
         auth_key = data.get('auth_key', None)
         hostname = data.get('hostname', None)
         
-        # Reset progress
-        global tailscale_progress
-        with tailscale_progress_lock:
-            tailscale_progress = {
-                'status': 'downloading',
-                'download_progress': 0,
-                'install_progress': 0,
-                'register_progress': 0,
-                'message': 'Starting installation...',
-                'download_bytes': 0,
-                'total_bytes': 0,
-                'error': None
-            }
-        
-        # Start installation in background thread
-        install_thread = threading.Thread(
-            target=install_tailscale_with_progress, 
-            args=(auth_key, hostname),
-            daemon=True
+        # Install runs as a background job (a second request joins the running one)
+        job = jobs.submit(
+            'tailscale-install', install_tailscale_with_progress, (auth_key, hostname),
+            progress=dict(TAILSCALE_IDLE_PROGRESS, status='downloading', message='Starting installation...'),
+            dedupe='active'
         )
-        install_thread.start()
         
-        return jsonify({'success': True, 'message': 'Installation started'})
+        return jsonify({'success': True, 'message': 'Installation started', 'job_id': job.id})
             
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -2015,25 +4281,25 @@ def api_install_tailscale():
 def api_tailscale_status():
     """Get Tailscale connection status"""
     try:
+        # Served from the shared provider cache; the ETag just spares the transfer
         result = get_tailscale_status()
-        return jsonify(result)
+        return conditional_json(sorted(result.items()), lambda: result)
     except Exception as e:
         return jsonify({'success': False, 'status': str(e)}), 500
 
 @app.route('/api/tailscale/progress', methods=['GET'])
 def api_tailscale_progress():
-    """Get Tailscale installation progress"""
-    global tailscale_progress
-    with tailscale_progress_lock:
-        return jsonify(tailscale_progress)
+    """Get Tailscale installation progress (latest install job)"""
+    job = jobs.latest('tailscale-install')
+    if job is None:
+        return jsonify(TAILSCALE_IDLE_PROGRESS)
+    return jsonify(dict(job.snapshot(log_since=None)['progress'], job_id=job.id))
 
 @app.route('/api/tailscale/enable', methods=['POST'])
 def api_tailscale_enable():
     """Enable Tailscale VPN"""
     try:
-        env = read_env()
-        env['TAILSCALE_ENABLED'] = 'true'
-        write_env(env)
+        update_env_var('TAILSCALE_ENABLED', 'true')
         
         # Rebuild config to activate Tailscale connection
         if rebuild_config():
@@ -2059,11 +4325,10 @@ def api_tailscale_disable():
             print("✓ Tailscale logged out")
         except Exception as e:
             print(f"⚠️ Could not logout from Tailscale: {e}")
+        tailscale_provider.invalidate()
         
         # Update config to disable
-        env = read_env()
-        env['TAILSCALE_ENABLED'] = 'false'
-        write_env(env)
+        update_env_var('TAILSCALE_ENABLED', 'false')
         
         # Rebuild config to use public IP fallback
         if rebuild_config():
@@ -2099,14 +4364,7 @@ def api_private_tailscale_status():
             })
         
         # Check if container is running
-        result = subprocess.run(
-            ['docker', 'ps', '--filter', 'name=tailscale-private', '--format', '{{.Status}}'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        if result.returncode != 0 or not result.stdout.strip():
+        if not container_running('tailscale-private'):
             return jsonify({
                 'success': True,
                 'enabled': True,
@@ -2115,30 +4373,16 @@ def api_private_tailscale_status():
             })
         
         # Get Tailscale status from container
-        status_result = subprocess.run(
-            ['docker', 'exec', 'tailscale-private', 'tailscale', 'status', '--json'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        summary = private_tailscale_provider.summary()
         
-        if status_result.returncode == 0:
-            status_data = json.loads(status_result.stdout)
-            backend_state = status_data.get('BackendState', '')
-            connected = backend_state == 'Running'
-            
-            if connected:
-                self_info = status_data.get('Self', {})
-                ip = self_info.get('TailscaleIPs', [''])[0] if self_info.get('TailscaleIPs') else None
-                hostname = self_info.get('DNSName', '').rstrip('.')
-                
-                return jsonify({
-                    'success': True,
-                    'enabled': True,
-                    'connected': True,
-                    'ip': ip,
-                    'hostname': hostname
-                })
+        if summary['running']:
+            return jsonify({
+                'success': True,
+                'enabled': True,
+                'connected': True,
+                'ip': summary['ip'],
+                'hostname': summary['dns_name']
+            })
         
         return jsonify({
             'success': True,
@@ -2168,12 +4412,13 @@ def api_private_tailscale_enable():
             return jsonify({'success': False, 'message': 'Auth key is required'}), 400
         
         # Update environment
-        env = read_env()
-        env['PRIVATE_TAILSCALE_ENABLED'] = 'true'
-        env['PRIVATE_TS_KEY'] = auth_key
+        changes = {
+            'PRIVATE_TAILSCALE_ENABLED': 'true',
+            'PRIVATE_TS_KEY': auth_key
+        }
         if hostname:
-            env['PRIVATE_TS_HOSTNAME'] = hostname
-        write_env(env)
+            changes['PRIVATE_TS_HOSTNAME'] = hostname
+        update_env(changes)
         
         # Start Private Tailscale container with profile
         result = subprocess.run(
@@ -2194,20 +4439,12 @@ def api_private_tailscale_enable():
         print("Waiting for Private Tailscale to connect...")
         for i in range(20):
             time.sleep(0.5)
-            check_result = subprocess.run(
-                ['docker', 'exec', 'tailscale-private', 'tailscale', 'status', '--json'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if check_result.returncode == 0:
-                try:
-                    status_data = json.loads(check_result.stdout)
-                    if status_data.get('BackendState') == 'Running':
-                        print("✓ Private Tailscale connected")
-                        break
-                except:
-                    pass
+            try:
+                if private_tailscale_provider.summary(max_age=0)['running']:
+                    print("✓ Private Tailscale connected")
+                    break
+            except:
+                pass
         
         # Configure SSH for dual Tailscale access
         print("Configuring SSH for dual Tailscale access...")
@@ -2256,9 +4493,7 @@ def api_private_tailscale_disable():
         )
         
         # Update environment
-        env = read_env()
-        env['PRIVATE_TAILSCALE_ENABLED'] = 'false'
-        write_env(env)
+        update_env_var('PRIVATE_TAILSCALE_ENABLED', 'false')
         
         # Reconfigure SSH to remove private Tailscale listener
         print("Reconfiguring SSH to remove Private Tailscale access...")
@@ -2303,110 +4538,787 @@ def api_activate_fr24():
         # Rebuild config to update docker-compose.yml
         rebuild_config()
         
-        # Start FR24 container using docker compose
-        subprocess.Popen(
-            ['docker', 'compose', '-f', '/opt/adsb/config/docker-compose.yml', 'up', '-d', 'fr24'],
-            cwd='/opt/adsb/config',
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Start FR24 progress monitoring in background thread
-        monitor_thread = threading.Thread(target=monitor_docker_progress, args=('fr24',), daemon=True)
-        monitor_thread.start()
-        print("✓ Started FR24 container and download monitoring")
+        # Bring up FR24 as a deploy job (pull progress, one compose run at a time)
+        job = jobs.submit('deploy', monitor_docker_progress, ('fr24',), progress=IDLE_PROGRESS, group=COMPOSE_JOBS)
+        print(f"✓ FR24 deploy queued (job {job.id})")
         
-        return jsonify({'success': True, 'message': 'FR24 service activation started'})
+        return jsonify({'success': True, 'message': 'FR24 service activation started', 'job_id': job.id})
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
-@app.route('/api/service/restart', methods=['POST'])
-def api_restart_service():
-    """Restart ultrafeeder service"""
-    try:
-        # Rebuild config first
-        config_ok = rebuild_config()
-        if not config_ok:
-            return jsonify({
-                'success': False, 
-                'message': 'Configuration rebuild failed. Check logs for details.'
-            }), 500
-        
-        # Restart service
-        if restart_service():
-            return jsonify({'success': True, 'message': 'Service restarting'})
-        else:
-            return jsonify({
-                'success': False, 
-                'message': 'Failed to restart ultrafeeder service. Check journalctl -u ultrafeeder for details.'
-            }), 500
-    except Exception as e:
-        return jsonify({'success': False, 'message': f'Exception: {str(e)}'}), 500
+@app.route('/api/service/restart', methods=['POST'])
+def api_restart_service():
+    """Restart ultrafeeder service"""
+    try:
+        # Rebuild config first
+        config_ok = rebuild_config()
+        if not config_ok:
+            return jsonify({
+                'success': False, 
+                'message': 'Configuration rebuild failed. Check logs for details.'
+            }), 500
+        
+        # Restart service
+        if restart_service():
+            return jsonify({'success': True, 'message': 'Service restarting'})
+        else:
+            return jsonify({
+                'success': False, 
+                'message': 'Failed to restart ultrafeeder service. Check journalctl -u ultrafeeder for details.'
+            }), 500
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Exception: {str(e)}'}), 500
+
+@app.route('/api/service/ready', methods=['GET'])
+def api_service_ready():
+    """Check if ultrafeeder container is running and ready"""
+    try:
+        docker_status = get_docker_status()
+        
+        # Check if ultrafeeder container exists and is running
+        ultrafeeder_running = False
+        for container_name, status in docker_status.items():
+            if 'ultrafeeder' in container_name.lower():
+                # Check if status contains "Up" (Docker shows "Up X seconds/minutes")
+                if 'Up' in status:
+                    ultrafeeder_running = True
+                    break
+        
+        return jsonify({
+            'ready': ultrafeeder_running,
+            'containers': docker_status
+        })
+    except Exception as e:
+        return jsonify({
+            'ready': False,
+            'error': str(e)
+        }), 500
+
+# =============================================================
+# Log Streaming (follow mode with resumable cursors)
+# =============================================================
+
+UPDATE_LOG_FILE = Path('/tmp/taknet_update.log')
+
+FILE_CURSOR_PREFIX = 64  # Bytes at the head of a file fingerprinted into its cursors
+
+def _file_identity(f, inode, prefix=FILE_CURSOR_PREFIX):
+    """inode-length-hash of the file's first `prefix` bytes (fewer while it's shorter)"""
+    f.seek(0)
+    head = f.read(prefix)
+    return f"{inode:x}-{len(head)}-{hashlib.blake2s(head, digest_size=4).hexdigest()}"
+
+def file_cursor(identity, offset):
+    return f"{identity}-{offset}"
+
+def split_file_cursor(cursor):
+    """(identity, offset) of a tail_file cursor, or None if it isn't one"""
+    identity, _, offset = (cursor or '').rpartition('-')
+    if identity.count('-') != 2 or not offset.isdigit():
+        return None
+    return identity, int(offset)
+
+def tail_file(path, lines=50, since=None, block_size=8192, max_bytes=1 << 20):
+    """
+    Tail of a growing log file without reading it whole
+    since=None: the last `lines` lines, read backwards from EOF in fixed blocks.
+    since=<cursor>: just the bytes appended after that cursor. A cursor carries
+    the file's inode and a fingerprint of its first bytes besides the offset, so
+    a replaced or truncated-and-regrown file is caught even once it's past the
+    offset again. Then (or with an offset past EOF, or more than max_bytes
+    behind) it falls back to the tail, flagged with reset=True so the caller
+    replaces instead of appends
+    Returns (data bytes, end cursor, reset)
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        start = split_file_cursor(since)
+        if start is not None:
+            identity, offset = start
+            prefix = int(identity.split('-')[1])
+            if (identity == _file_identity(f, stat.st_ino, prefix)
+                    and offset <= size and size - offset <= max_bytes):
+                f.seek(offset)
+                data = f.read(size - offset)
+                return data, file_cursor(_file_identity(f, stat.st_ino), size), False
+        
+        # Walk back until the window holds `lines` complete lines (one extra
+        # newline, since a trailing newline doesn't start a line)
+        pos = size
+        blocks = []
+        newlines = 0
+        while pos > 0 and newlines <= lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+        data = b''.join(reversed(blocks))
+        kept = data.splitlines(keepends=True)[-lines:] if lines else []
+        return b''.join(kept), file_cursor(_file_identity(f, stat.st_ino), size), True
+
+LOG_LEVELS = {
+    'errors': re.compile(r'\b(error|errors|failed|failure|fatal|critical)\b', re.I),
+    'warnings': re.compile(r'\bwarn(ing)?\b', re.I),
+    'mlat_clock': re.compile(r'clock (unstable|reset|jump|drift)|(unstable|bad) clock', re.I),
+    'disconnects': re.compile(r'disconnect|connection (lost|closed|reset|refused)|lost connection|timed? ?out', re.I)
+}
+
+_LOG_AGE = re.compile(r'^(\d+)([smhd])$')
+
+def parse_log_time(value):
+    """Epoch seconds, or an age like 30s / 15m / 2h / 1d (that long ago)"""
+    match = _LOG_AGE.match(value)
+    if match:
+        return time.time() - int(match.group(1)) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[match.group(2)]
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r} (use epoch seconds or e.g. 15m, 2h, 1d)")
+
+# Line value a follower yields when its source was rewritten: what the client
+# has shown is stale and the lines that follow replace it
+LOG_RESET = object()
+
+class LogFilter:
+    """
+    grep-style include/exclude over (cursor, line) entries, applied lazily as
+    the source is read. Level counts cover every scanned line, so a request
+    with max_lines=0 is a cheap triage summary of the window
+    Patterns are case-insensitive substrings, never regular expressions: they
+    run against every line on the server, so matching stays linear. Length
+    and count are capped
+    """
+
+    MAX_PATTERNS = 10
+    MAX_PATTERN_LENGTH = 200
+
+    def __init__(self, include=(), exclude=(), since=None, until=None, max_lines=500, tail=None):
+        patterns = list(include) + list(exclude)
+        if len(patterns) > self.MAX_PATTERNS:
+            raise ValueError(f"Too many patterns (max {self.MAX_PATTERNS})")
+        if any(len(p) > self.MAX_PATTERN_LENGTH for p in patterns):
+            raise ValueError(f"Pattern too long (max {self.MAX_PATTERN_LENGTH} characters)")
+        self.include = [p.lower() for p in include]
+        self.exclude = [p.lower() for p in exclude]
+        self.since = since
+        self.until = until
+        self.max_lines = max_lines
+        self.tail = tail
+        self.counts = dict.fromkeys(LOG_LEVELS, 0)
+        self.scanned = 0
+        self.matched = 0
+        self.cursor = None
+
+    @property
+    def active(self):
+        return bool(self.include or self.exclude or self.since or self.until)
+
+    @classmethod
+    def from_args(cls, args, timed=True):
+        """
+        Build from query args (include/exclude repeatable); ValueError on bad input
+        timed=False: the source's lines carry no timestamps, so since/until are refused
+        """
+        if not timed and (args.get('since') or args.get('until')):
+            raise ValueError('This log source has no timestamps; since/until are not supported')
+        include = [p for p in args.getlist('include') if p]
+        exclude = [p for p in args.getlist('exclude') if p]
+        log_filter = cls(
+            include, exclude,
+            since=parse_log_time(args['since']) if args.get('since') else None,
+            until=parse_log_time(args['until']) if args.get('until') else None,
+            max_lines=min(max(args.get('max_lines', 500, type=int), 0), 5000)
+        )
+        # Lines read from the source before filtering; a filtered view digs deeper
+        default_tail = 5000 if log_filter.active else 500
+        log_filter.tail = min(max(args.get('tail', default_tail, type=int), 0), 50000)
+        return log_filter
+
+    def apply(self, entries):
+        for cursor, line in entries:
+            if line is LOG_RESET:
+                yield cursor, line
+                continue
+            self.scanned += 1
+            if cursor:
+                self.cursor = cursor
+            for level, pattern in LOG_LEVELS.items():
+                if pattern.search(line):
+                    self.counts[level] += 1
+            lowered = line.lower()
+            if self.include and not any(p in lowered for p in self.include):
+                continue
+            if any(p in lowered for p in self.exclude):
+                continue
+            self.matched += 1
+            yield cursor, line
+
+    def summary(self):
+        return {'counts': self.counts, 'scanned': self.scanned, 'matched': self.matched, 'cursor': self.cursor}
+
+class LogFollower:
+    """
+    Reads one log source on a background thread into a bounded queue
+    Subclasses implement read() yielding (cursor, line); the cursor of the
+    last line sent lets a reconnecting client resume without re-reading.
+    read() can also be iterated directly for one-shot reads (follow=False)
+    """
+
+    END = object()
+
+    def __init__(self, cursor=None, tail=500, follow=True, since=None, until=None, log_filter=None):
+        self.cursor = cursor
+        self.tail = tail
+        self.follow = follow
+        self.since = since
+        self.until = until
+        self.log_filter = log_filter
+        self.queue = queue.Queue(maxsize=2000)
+        self._closed = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._pump, name=f'log-{type(self).__name__}', daemon=True)
+        self._thread.start()
+        return self
+
+    def _put(self, item):
+        # Bounded wait so a vanished client can't wedge the reader forever
+        while not self._closed.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pump(self):
+        try:
+            entries = self.read()
+            if self.log_filter is not None:
+                entries = self.log_filter.apply(entries)
+            for item in entries:
+                if not self._put(item):
+                    break
+        except Exception as e:
+            if not self._closed.is_set():
+                self._put(e)
+        finally:
+            self._put(self.END)
+
+    def read(self):
+        raise NotImplementedError
+
+    def close(self):
+        self._closed.set()
+
+class DockerLogFollower(LogFollower):
+    """Container logs from the Engine API; cursor = RFC 3339 timestamp of the last line"""
+
+    def __init__(self, container, **kwargs):
+        super().__init__(**kwargs)
+        self.container = container
+        self._conn = None
+
+    @staticmethod
+    def since_after(cursor):
+        """Docker `since` value 1 ns after an RFC 3339 timestamp (since is inclusive)"""
+        base, _, frac = cursor.rstrip('Z').partition('.')
+        seconds = calendar.timegm(time.strptime(base, '%Y-%m-%dT%H:%M:%S'))
+        nanos = int(frac.ljust(9, '0')[:9]) + 1
+        return f"{seconds + nanos // 1000000000}.{nanos % 1000000000:09d}"
+
+    def read(self):
+        params = {'stdout': 1, 'stderr': 1, 'timestamps': 1, 'follow': int(self.follow)}
+        if self.cursor:
+            params['since'] = self.since_after(self.cursor)
+        elif self.since:
+            params['since'] = f"{self.since:.9f}"  # The window bounds the read; no tail
+        else:
+            params['tail'] = self.tail
+        if self.until:
+            params['until'] = f"{self.until:.9f}"
+        self._conn = UnixHTTPConnection(docker_client.socket_path, timeout=None if self.follow else 10)
+        try:
+            self._conn.request('GET', f'/containers/{quote(self.container)}/logs?{urlencode(params)}',
+                               headers={'Host': 'docker'})
+            response = self._conn.getresponse()
+            if response.status != 200:
+                raise DockerAPIError(f"Logs failed: HTTP {response.status} {response.read()[:200]!r}")
+            for raw in self._frames(response):
+                for line in raw.decode('utf-8', 'replace').splitlines():
+                    timestamp, _, message = line.partition(' ')
+                    yield timestamp, message
+        finally:
+            self._conn.close()
+
+    @staticmethod
+    def _frames(response):
+        """Demultiplex the stdout/stderr stream (8-byte frame headers); TTY streams are raw"""
+        header = response.read(8)
+        multiplexed = len(header) == 8 and header[0] in (0, 1, 2) and header[1:4] == b'\0\0\0'
+        if not multiplexed:
+            # Raw stream - whole lines only
+            pending = header
+            while True:
+                line = response.readline()
+                if not line:
+                    if pending:
+                        yield pending
+                    return
+                yield pending + line
+                pending = b''
+        while len(header) == 8:
+            size = int.from_bytes(header[4:8], 'big')
+            yield response.read(size)
+            header = response.read(8)
+
+    def close(self):
+        super().close()
+        if self._conn is not None:
+            try:
+                self._conn.sock and self._conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+class JournalLogFollower(LogFollower):
+    """journald unit logs via `journalctl -o json`; cursor = journald __CURSOR"""
+
+    def __init__(self, unit, **kwargs):
+        super().__init__(**kwargs)
+        self.unit = unit
+        self._process = None
+
+    @staticmethod
+    def format_entry(entry):
+        """journalctl's default 'short' layout: Mon DD HH:MM:SS host ident[pid]: message"""
+        message = entry.get('MESSAGE', '')
+        if isinstance(message, list):  # Non-UTF-8 messages arrive as byte arrays
+            message = bytes(message).decode('utf-8', 'replace')
+        stamp = time.strftime('%b %d %H:%M:%S', time.localtime(int(entry.get('__REALTIME_TIMESTAMP', 0)) / 1e6))
+        ident = entry.get('SYSLOG_IDENTIFIER') or entry.get('_COMM') or ''
+        pid = f"[{entry['_PID']}]" if entry.get('_PID') else ''
+        return f"{stamp} {entry.get('_HOSTNAME', '')} {ident}{pid}: {message}"
+
+    def read(self):
+        cmd = ['journalctl', '-u', self.unit, '-o', 'json', '--no-pager']
+        if self.cursor:
+            cmd += ['--after-cursor', self.cursor]
+        elif self.since:
+            cmd += ['--since', f"@{int(self.since)}"]
+        else:
+            cmd += ['-n', str(self.tail)]
+        if self.until:
+            cmd += ['--until', f"@{int(self.until)}"]
+        if self.follow:
+            cmd.append('-f')
+        self._process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            for raw in self._process.stdout:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                yield entry.get('__CURSOR'), self.format_entry(entry)
+        finally:
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+
+    def close(self):
+        super().close()
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+
+class FileLogFollower(LogFollower):
+    """Plain log file via tail_file(); cursor = file identity and byte offset just past the line"""
+
+    def __init__(self, path, poll_interval=1, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.poll_interval = poll_interval
+
+    def read(self):
+        since = self.cursor
+        while True:
+            try:
+                data, cursor, reset = tail_file(self.path, self.tail, since)
+            except FileNotFoundError:
+                if not self.follow:
+                    raise
+                # Gone (rotated away): what was shown is stale; pick up the tail once it's back
+                if since is not None:
+                    yield '', LOG_RESET
+                since = None
+                if self._closed.wait(self.poll_interval):
+                    return
+                continue
+            identity, offset = split_file_cursor(cursor)
+            if reset and since is not None:
+                # Replaced/truncated (or too far behind): the tail below replaces, not appends
+                yield file_cursor(identity, offset - len(data)), LOG_RESET
+            
+            # While following, hold back a partial last line until it completes
+            end = data.rfind(b'\n') + 1 if self.follow else len(data)
+            position = offset - len(data)
+            for line in data[:end].splitlines(keepends=True):
+                position += len(line)
+                yield file_cursor(identity, position), line.decode('utf-8', 'replace').rstrip('\r\n')
+            since = file_cursor(identity, offset - (len(data) - end))
+            
+            if not self.follow or self._closed.wait(self.poll_interval):
+                return
+
+# Sources whose lines carry timestamps (since/until apply); update and vnstat have none
+LOG_TIMED_SOURCES = {'ultrafeeder', 'tailscale'}
+
+# Streamable sources: name -> follower factory
+LOG_STREAMS = {
+    'ultrafeeder': lambda **kwargs: DockerLogFollower('ultrafeeder', **kwargs),
+    'tailscale': lambda **kwargs: JournalLogFollower('tailscaled', **kwargs),
+    'update': lambda **kwargs: FileLogFollower(UPDATE_LOG_FILE, **kwargs)
+}
+
+# SSE ends a data field at any of these; an entry's own breaks become separate fields
+SSE_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+def _log_lines_event(batch):
+    """One `lines` event: a data field per physical line, id = cursor of the last entry"""
+    cursor = next((c for c, _ in reversed(batch) if c), '')
+    data = ''.join(f"data: {part}\n" for _, line in batch for part in SSE_LINE_BREAK.split(line.rstrip()))
+    return f"id: {cursor}\nevent: lines\n{data}\n"
+
+def stream_log_events(follower, batch_size=500):
+    """
+    SSE body for a follower: whatever lines are queued go out as one event whose
+    id is the cursor of its last line (EventSource echoes it as Last-Event-ID)
+    """
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                item = follower.queue.get(timeout=15)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+
+            batch = []
+            while item is not LogFollower.END and not isinstance(item, Exception):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = follower.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            pending = []
+            for cursor, line in batch:
+                if line is LOG_RESET:
+                    if pending:
+                        yield _log_lines_event(pending)
+                        pending = []
+                    yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+                else:
+                    pending.append((cursor, line))
+            if pending:
+                yield _log_lines_event(pending)
+            if isinstance(item, Exception):
+                yield f"event: failed\ndata: {json.dumps(str(item))}\n\n"
+                return
+            if item is LogFollower.END:
+                summary = follower.log_filter.summary() if follower.log_filter else {}
+                yield f"event: end\ndata: {json.dumps(summary)}\n\n"
+                return
+    finally:
+        follower.close()
+
+# =============================================================
+# Conditional GET (ETag / If-None-Match)
+# =============================================================
+
+# Version counters restart with the process; salt ETags so old ones never match
+_ETAG_SALT = uuid.uuid4().hex
+
+def conditional_json(version, build):
+    """
+    JSON response tagged with an ETag derived from `version`, a cheap key of
+    the backing state. build() (and serialization) only runs when the client's
+    If-None-Match doesn't already name that version; otherwise 304
+    """
+    etag = hashlib.sha1(f"{_ETAG_SALT}:{version!r}".encode()).hexdigest()[:20]
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate
+    return response
+
+# =============================================================
+# Dashboard Event Stream (Server-Sent Events)
+# =============================================================
+
+class StatusEventHub:
+    """
+    One producer samples dashboard state and fans changes out to every client
+    Each client gets a full snapshot on connect, then only fields that changed;
+    server work is the same for one open tab or twenty
+    """
+
+    def __init__(self, interval=2, network_interval=30, queue_size=64):
+        self.interval = interval
+        self.network_interval = network_interval
+        self.queue_size = queue_size
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._state = {}
+        self._event_id = 0
+        self._network_checked = 0.0
+        self._thread = None
 
-@app.route('/api/service/ready', methods=['GET'])
-def api_service_ready():
-    """Check if ultrafeeder container is running and ready"""
-    try:
+    def _collect(self):
+        """Current dashboard state; slow network probes run on their own cadence"""
+        env = config_store.snapshot()
+        state = dict(self._state)
         docker_status = get_docker_status()
-        
-        # Check if ultrafeeder container exists and is running
-        ultrafeeder_running = False
-        for container_name, status in docker_status.items():
-            if 'ultrafeeder' in container_name.lower():
-                # Check if status contains "Up" (Docker shows "Up X seconds/minutes")
-                if 'Up' in status:
-                    ultrafeeder_running = True
-                    break
-        
-        return jsonify({
-            'ready': ultrafeeder_running,
-            'containers': docker_status
-        })
-    except Exception as e:
-        return jsonify({
-            'ready': False,
-            'error': str(e)
-        }), 500
+        state['docker'] = {'ultrafeeder': docker_status.get('ultrafeeder')}
+        state['service_states'] = get_service_states(env)
+        state['taknet'] = get_taknet_ps_stats(env)
+
+        latest = feed_sampler.latest
+        if latest is not None:
+            state['feed_health'] = {agg['name']: agg['status'] for agg in latest[2]}
+        if receiver_history.latest is not None:
+            state['receiver'] = receiver_history.latest
+
+        # Deploy progress reaches the page through service_states (downloading/starting)
+
+        now = time.monotonic()
+        if 'network' not in state or now - self._network_checked >= self.network_interval:
+            self._network_checked = now
+            mode = get_network_connection_mode()
+            state['network'] = {
+                'connection_mode': mode.get('mode', 'unknown'),
+                'connection_details': mode.get('details', 'Unknown'),
+                'interface': mode.get('interface'),
+                **get_network_status()
+            }
+        return state
+
+    @staticmethod
+    def _diff(old, new):
+        """Changed top-level fields; dict fields carry only their changed keys"""
+        changes = {}
+        for field, value in new.items():
+            previous = old.get(field)
+            if value == previous:
+                continue
+            if isinstance(value, dict) and isinstance(previous, dict):
+                changes[field] = {k: v for k, v in value.items() if k not in previous or previous[k] != v}
+                changes[field].update({k: None for k in previous if k not in value})
+            else:
+                changes[field] = value
+        return changes
+
+    def _publish(self, state, event, data):
+        """Adopt the new state and queue one event for every client"""
+        with self._lock:
+            self._state = state
+            self._event_id += 1
+            message = (self._event_id, event, data)
+            for client in list(self._clients):
+                try:
+                    client.put_nowait(message)
+                except queue.Full:
+                    # Stalled client - drop it; its stream ends, EventSource reconnects and resyncs
+                    client.dropped = True
+                    self._clients.discard(client)
+
+    def subscribe(self):
+        """Register a client queue, primed with a full snapshot"""
+        client = queue.Queue(maxsize=self.queue_size)
+        client.dropped = False  # Set by _publish when the client falls a full queue behind
+        with self._lock:
+            if self._state:
+                client.put_nowait((self._event_id, 'snapshot', self._state))
+            self._clients.add(client)
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='status-events', daemon=True)
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._clients:
+                    self._thread = None
+                    return  # Nobody listening - restarted by the next subscribe()
+            progress_changed.clear()
+            try:
+                state = self._collect()
+                changes = self._diff(self._state, state)
+                if changes:
+                    # Very first sample goes out as the snapshot early subscribers missed
+                    if self._state:
+                        self._publish(state, 'update', changes)
+                    else:
+                        self._publish(state, 'snapshot', state)
+            except Exception as e:
+                print(f"⚠ Status events: {e}")
+            # Progress updates wake the producer early
+            progress_changed.wait(self.interval)
+
+status_events = StatusEventHub()
+
+@app.route('/api/events')
+def api_events():
+    """Server-Sent Events: dashboard snapshot, then changed fields only"""
+    client = status_events.subscribe()
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while not client.dropped:
+                try:
+                    event_id, event, data = client.get(timeout=15)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            status_events.unsubscribe(client)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/api/service/progress', methods=['GET'])
 def api_service_progress():
-    """Get current service installation progress"""
-    global service_progress
-    with progress_lock:
-        return jsonify(service_progress)
+    """Get current service installation progress (latest deploy job)"""
+    version, progress = deploy_progress()
+    return conditional_json(version, lambda: progress)
 
-@app.route('/api/status', methods=['GET'])
-def api_status():
-    """Get system status"""
-    docker_status = get_docker_status()
-    env = read_env()
-    
-    # Parse ULTRAFEEDER_CONFIG to show active feeds
-    config_str = env.get('ULTRAFEEDER_CONFIG', '')
-    feeds = []
-    if config_str:
-        for part in config_str.split(';'):
-            if part.startswith('adsb,'):
-                parts = part.split(',')
-                if len(parts) >= 2:
-                    feeds.append(parts[1])  # hostname
-    
-    # Get service states
-    service_states = {
+@app.route('/api/jobs', methods=['GET'])
+def api_jobs():
+    """Recent background jobs (newest first), without their logs"""
+    return jsonify({'success': True, 'jobs': [job.snapshot(log_since=None) for job in jobs.list()]})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job(job_id):
+    """One job's state; log lines from ?since= (the previous response's log_next)"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+    since = max(request.args.get('since', 0, type=int), 0)
+    snapshot = job.snapshot(since)
+    return conditional_json((job.id, snapshot['version'], since), lambda: dict(snapshot, success=True))
+
+@app.route('/api/jobs/<job_id>/events')
+def api_job_events(job_id):
+    """
+    Server-Sent Events for one job: a `job` event per change carrying new log
+    lines only, then the stream ends once the job has finished
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+    since = max(request.args.get('since', 0, type=int), 0)
+
+    def stream():
+        log_next = since
+        yield 'retry: 3000\n\n'
+        while True:
+            snapshot = job.snapshot(log_next)
+            log_next = snapshot['log_next']
+            yield f"id: {snapshot['version']}\nevent: job\ndata: {json.dumps(snapshot)}\n\n"
+            if snapshot['finished_at'] is not None:
+                return
+            while not jobs.wait(job, snapshot['version'], 15):
+                yield ': keepalive\n\n'
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/images/stage', methods=['GET', 'POST'])
+def api_images_stage():
+    """
+    GET ?id=<stage id>: that request's status (waiting/running/done/failed) and
+    pull progress; without an id, a summary of the most recent stage
+    POST {"refresh": true}: pre-pull newer images for deployed services without
+    touching containers, so the following restart only swaps containers.
+    Returns the stage id
+    """
+    if request.method == 'GET':
+        stage_id = request.args.get('id')
+        if stage_id is None:
+            return jsonify({'success': True, **image_stager.status()})
+        stage = image_stager.status(stage_id)
+        if stage is None:
+            return jsonify({'success': False, 'message': 'Unknown stage id'}), 404
+        return jsonify({'success': True, **stage})
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        build = config_builder.build(config_store.snapshot())
+        # Services with a container (running or not), plus ultrafeeder always
+        existing = get_docker_status_all()
+        services = [name for name in build.compose.get('services', {}) if name in existing or name == 'ultrafeeder']
+        images = compose_images(build, services)
+        stage_id = image_stager.stage_in_background(images, refresh=data.get('refresh', True))
+        return jsonify({'success': True, 'message': 'Image staging started', 'id': stage_id, 'images': images})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+def get_service_states(env):
+    """State of each optional service (None when the feed is disabled)"""
+    return {
         'ultrafeeder': get_service_state('ultrafeeder'),
         'fr24': get_service_state('fr24') if env.get('FR24_ENABLED') == 'true' else None,
         'piaware': get_service_state('piaware') if env.get('PIAWARE_ENABLED') == 'true' else None,
         'adsbx': get_service_state('adsbx') if env.get('ADSBX_ENABLED') == 'true' else None,
         'adsblol': get_service_state('adsblol') if env.get('ADSBLOL_ENABLED') == 'true' else None
     }
+
+@app.route('/api/status', methods=['GET'])
+def api_status():
+    """Get system status"""
+    # All in-memory (container table, config snapshot, progress) - no probes
+    docker_status = get_docker_status()
+    env = config_store.snapshot()
+    service_states = get_service_states(env)
+    version = (config_store.generation, sorted(docker_status.items()), sorted(service_states.items()))
     
-    return jsonify({
-        'docker': docker_status,
-        'feeds': feeds,
-        'configured': env.get('FEEDER_LAT', '0.0') != '0.0',
-        'service_states': service_states
-    })
+    def build():
+        # Parse ULTRAFEEDER_CONFIG to show active feeds
+        config_str = env.get('ULTRAFEEDER_CONFIG', '')
+        feeds = []
+        if config_str:
+            for part in config_str.split(';'):
+                if part.startswith('adsb,'):
+                    parts = part.split(',')
+                    if len(parts) >= 2:
+                        feeds.append(parts[1])  # hostname
+        
+        return {
+            'docker': docker_status,
+            'feeds': feeds,
+            'configured': env.get('FEEDER_LAT', '0.0') != '0.0',
+            'service_states': service_states
+        }
+    
+    return conditional_json(version, build)
 
 @app.route('/api/service/<service_name>/state', methods=['GET'])
 def api_service_state(service_name):
@@ -2516,22 +5428,19 @@ def taknet_ps_status():
 def api_taknet_ps_connection():
     """Get TAKNET-PS connection information"""
     try:
-        env = read_env()
+        env = config_store.snapshot()
         
         # Get Tailscale status
         tailscale_running = False
         tailscale_ip = None
+        wrong_tailnet = False
         try:
-            result = subprocess.run(['tailscale', 'status', '--json'],
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                status_data = json.loads(result.stdout)
-                if status_data.get('BackendState') == 'Running':
-                    tailscale_running = True
-                    self_info = status_data.get('Self', {})
-                    tailscale_ips = self_info.get('TailscaleIPs', [])
-                    if tailscale_ips:
-                        tailscale_ip = tailscale_ips[0]
+            summary = tailscale_provider.summary()
+            tailscale_running = summary['connected']
+            tailscale_ip = summary['ip']
+            wrong_tailnet = summary['wrong_tailnet']
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"⚠ Tailscale status check failed: {e}")
             pass
@@ -2550,6 +5459,7 @@ def api_taknet_ps_connection():
             'connection_host': connection_host,
             'tailscale_running': tailscale_running,
             'tailscale_ip': tailscale_ip,
+            'wrong_tailnet': wrong_tailnet,
             'mode': env.get('TAKNET_PS_CONNECTION_MODE', 'auto')
         })
         
@@ -2559,104 +5469,182 @@ def api_taknet_ps_connection():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def get_taknet_ps_stats(env):
+    """TAKNET-PS Beast/MLAT state from ultrafeeder's established connections"""
+    # Get aggregator host based on Tailscale status
+    connection_host = env.get('TAKNET_PS_SERVER_HOST_FALLBACK', 'adsb.tak-solutions.com')
+    try:
+        if tailscale_provider.summary()['connected']:
+            connection_host = env.get('TAKNET_PS_SERVER_HOST_PRIMARY', 'secure.tak-solutions.com')
+    except:
+        pass
+    
+    # Get ports
+    beast_port = env.get('TAKNET_PS_SERVER_PORT', '30004')
+    mlat_port = env.get('TAKNET_PS_MLAT_PORT', '30105')
+    mlat_enabled = env.get('TAKNET_PS_MLAT_ENABLED') == 'true'
+    
+    # ESTABLISHED connections of the ultrafeeder container, all ports in one pass
+    ports = [beast_port, mlat_port] if mlat_enabled else [beast_port]
+    try:
+        peers = connection_inspector.established('ultrafeeder', ports)
+    except Exception as e:
+        print(f"⚠ Error checking ultrafeeder connections: {e}")
+        peers = None
+    if peers is None:
+        peers = {}  # ultrafeeder container not running
+    
+    # Check BEAST connection (data feed)
+    data_feed_active = bool(peers.get(int(beast_port)))
+    
+    # Check MLAT connection (only if enabled)
+    mlat_active = False
+    if mlat_enabled:
+        mlat_active = bool(peers.get(int(mlat_port)))
+    
+    return {
+        'data_feed_active': data_feed_active,
+        'mlat_active': mlat_active,
+        'mlat_enabled': mlat_enabled,
+        'connection_host': connection_host,
+        'beast_port': beast_port,
+        'mlat_port': mlat_port
+    }
+
 @app.route('/api/taknet-ps/stats', methods=['GET'])
 def api_taknet_ps_stats():
     """Get TAKNET-PS feed status by checking ultrafeeder container connections"""
     try:
-        env = read_env()
-        
-        # Get aggregator host based on Tailscale status
-        connection_host = env.get('TAKNET_PS_SERVER_HOST_FALLBACK', 'adsb.tak-solutions.com')
-        try:
-            ts_result = subprocess.run(['tailscale', 'status', '--json'],
-                                     capture_output=True, text=True, timeout=5)
-            if ts_result.returncode == 0:
-                status_data = json.loads(ts_result.stdout)
-                if status_data.get('BackendState') == 'Running':
-                    connection_host = env.get('TAKNET_PS_SERVER_HOST_PRIMARY', 'secure.tak-solutions.com')
-        except:
-            pass
-        
-        # Get ports
-        beast_port = env.get('TAKNET_PS_SERVER_PORT', '30004')
-        mlat_port = env.get('TAKNET_PS_MLAT_PORT', '30105')
-        mlat_enabled = env.get('TAKNET_PS_MLAT_ENABLED') == 'true'
-        
-        # Check for connections inside the ultrafeeder Docker container
-        def check_container_connection(port):
-            """Check if ultrafeeder container has connection to aggregator on port"""
-            try:
-                # First, check if container is running
-                container_check = subprocess.run(
-                    ['docker', 'ps', '--filter', 'name=ultrafeeder', '--format', '{{.Names}}'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if 'ultrafeeder' not in container_check.stdout:
-                    print("⚠ ultrafeeder container not running")
-                    return False
-                
-                # Check for ESTABLISHED connections inside the container
-                result = subprocess.run(
-                    ['docker', 'exec', 'ultrafeeder', 'ss', '-tn', 'state', 'established'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.returncode == 0:
-                    # Look for connection to our port
-                    for line in result.stdout.split('\n'):
-                        if f':{port}' in line:
-                            # Found a connection on this port
-                            print(f"✓ Found connection to port {port}: {line.strip()}")
-                            return True
-                    print(f"⚠ No connection found to port {port}")
-                    return False
-                else:
-                    print(f"⚠ Failed to check connections in container: {result.stderr}")
-                    return False
-                    
-            except subprocess.TimeoutExpired:
-                print(f"⚠ Timeout checking connection to port {port}")
-                return False
-            except Exception as e:
-                print(f"⚠ Error checking connection to port {port}: {e}")
-                return False
-        
-        # Check BEAST connection (data feed)
-        data_feed_active = check_container_connection(beast_port)
-        
-        # Check MLAT connection (only if enabled)
-        mlat_active = False
-        if mlat_enabled:
-            mlat_active = check_container_connection(mlat_port)
+        stats = get_taknet_ps_stats(config_store.snapshot())
+        return jsonify({'success': True, **stats})
         
+    except Exception as e:
+        print(f"❌ Error in api_taknet_ps_stats: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/feeds/health', methods=['GET'])
+def api_feeds_health():
+    """Connected/disconnected and uptime for every aggregator ultrafeeder feeds"""
+    try:
+        latest = feed_sampler.latest
+        if latest is None:
+            # Sampler hasn't run yet (first seconds after startup); it fills this in shortly
+            return jsonify({
+                'success': True,
+                'pending': True,
+                'sampled_at': None,
+                'ultrafeeder_running': None,
+                'aggregators': []
+            })
+        sampled_at, running, aggregators = latest
         return jsonify({
             'success': True,
-            'data_feed_active': data_feed_active,
-            'mlat_active': mlat_active,
-            'mlat_enabled': mlat_enabled,
-            'connection_host': connection_host,
-            'beast_port': beast_port,
-            'mlat_port': mlat_port
+            'pending': False,
+            'sampled_at': sampled_at,
+            'ultrafeeder_running': running,
+            'aggregators': aggregators
+        })
+    except Exception as e:
+        print(f"❌ Error in api_feeds_health: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/feeds/history', methods=['GET'])
+def api_feeds_history():
+    """
+    Feed uptime history from the sampler's ring buffer
+    Optional ?window=<seconds> (default: everything kept, up to 24 h)
+    """
+    try:
+        window = request.args.get('window', type=int)
+        return jsonify({
+            'success': True,
+            'interval_seconds': feed_sampler.interval,
+            'window_seconds': window,
+            'feeds': feed_sampler.history.stats(window)
         })
+    except Exception as e:
+        print(f"❌ Error in api_feeds_history: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/receiver/stats', methods=['GET'])
+def api_receiver_stats():
+    """readsb receiver statistics (message rate, aircraft, range, signal/noise)"""
+    try:
+        version = (readsb_stats.signature(), readsb_aircraft.signature())
+        if version == (None, None):
+            return jsonify({
+                'success': False,
+                'error': f'No readsb statistics in {READSB_RUN_DIR} (is ultrafeeder running?)'
+            }), 404
         
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Connection check timed out'}), 504
+        def build():
+            stats = readsb_stats.get() or {}
+            aircraft = readsb_aircraft.get() or {}
+            return {'success': True, **stats, **aircraft, 'now': aircraft.get('now') or stats.get('now')}
+        
+        return conditional_json(version, build)
     except Exception as e:
-        print(f"❌ Error in api_taknet_ps_stats: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ Error in api_receiver_stats: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/network-status', methods=['GET'])
-def api_network_status():
-    """Get network connectivity status"""
-    import socket
-    
+@app.route('/api/receiver/metrics', methods=['GET'])
+def api_receiver_metrics():
+    """Latest values scraped from ultrafeeder's Prometheus exporter"""
+    latest = prometheus_scraper.latest
+    if latest is None:
+        return jsonify({'success': False, 'error': 'No Prometheus metrics scraped yet'}), 404
+    scraped_at, values = latest
+    return conditional_json(scraped_at, lambda: {'success': True, 'scraped_at': scraped_at, 'metrics': values})
+
+@app.route('/api/receiver/history', methods=['GET'])
+def api_receiver_history():
+    """
+    Receiver metric history from the in-app time-series store
+    ?window=<seconds> (default 3600; picks 10 s / 1 min / 10 min resolution)
+    ?metric=<name> (repeatable; default all)
+    """
+    try:
+        window = request.args.get('window', 3600, type=int)
+        metrics = request.args.getlist('metric') or None
+        store = receiver_history.store
+        version = (store.last_update, window, metrics)
+        
+        def build():
+            step, series = store.query(window, metrics=metrics)
+            return {
+                'success': True,
+                'window_seconds': window,
+                'step_seconds': step,
+                'series': series
+            }
+        
+        return conditional_json(version, build)
+    except Exception as e:
+        print(f"❌ Error in api_receiver_history: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/probes/stats', methods=['GET'])
+def api_probe_stats():
+    """Per-probe coalescing counters (calls vs. actual executions)"""
+    return jsonify({'success': True, 'probes': probe_flights.stats()})
+
+NETWORK_STATUS_TTL = 10  # seconds a network probe result is reused
+
+_network_status = (0.0, None)  # (probed_at, result)
+
+def get_network_status(max_age=NETWORK_STATUS_TTL):
+    """Internet reachability, primary IP and hostname (probed at most every max_age s)"""
+    global _network_status
+    probed_at, result = _network_status
+    if result is None or time.monotonic() - probed_at >= max_age:
+        result = probe_flights.do('network_status', _probe_network_status)
+        _network_status = (time.monotonic(), result)
+    return result
+
+def _probe_network_status():
+    """Internet reachability, primary IP and hostname"""
     def check_internet():
         """Check if internet is accessible"""
         try:
@@ -2681,11 +5669,17 @@ def api_network_status():
     ip_address = get_primary_ip()
     hostname = socket.gethostname()
     
-    return jsonify({
+    return {
         'internet': has_internet,
         'ip_address': ip_address,
         'hostname': hostname
-    })
+    }
+
+@app.route('/api/network-status', methods=['GET'])
+def api_network_status():
+    """Get network connectivity status"""
+    result = get_network_status()
+    return conditional_json(sorted(result.items()), lambda: result)
 
 # ========================================
 # WiFi Management API Endpoints
@@ -3121,9 +6115,140 @@ def wifi_disable():
 # SYSTEM UPDATE ENDPOINTS
 # ============================================================================
 
+UPDATE_MANIFEST_URL = 'https://raw.githubusercontent.com/cfd2474/TAKNET-PS_ADS-B_Feeder/main/version.json'
+
+def is_newer_version(current_version, latest_version):
+    """True if latest_version (X.Y.Z) is newer than current_version"""
+    if current_version == 'unknown' or latest_version == 'unknown':
+        return False
+    try:
+        # Parse version strings (format: X.Y.Z)
+        current_parts = [int(x) for x in current_version.split('.')]
+        latest_parts = [int(x) for x in latest_version.split('.')]
+        
+        # Pad to same length if needed (handle 2.47 vs 2.47.0)
+        while len(current_parts) < len(latest_parts):
+            current_parts.append(0)
+        while len(latest_parts) < len(current_parts):
+            latest_parts.append(0)
+        
+        return latest_parts > current_parts
+    
+    except (ValueError, AttributeError) as e:
+        print(f"Version comparison error: {e}")
+        # If can't parse, do string comparison as fallback
+        return latest_version != current_version
+
+class UpdateChecker:
+    """
+    Keeps the published version.json cached, refreshed on a background thread
+    Refreshes are conditional (ETag / If-Modified-Since), so an unchanged
+    manifest costs a 304; readers only ever see the cache, so an offline
+    feeder never stalls a page on the GitHub timeout
+    """
+
+    def __init__(self, url, ttl=6 * 3600, retry=300, min_interval=30, timeout=10):
+        self.url = url
+        self.ttl = ttl
+        self.retry = retry
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._info = None
+        self._etag = None
+        self._last_modified = None
+        self._checked_at = None
+        self._error = None
+        self._checking = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            with self._lock:
+                self._checking = True
+            self._thread = threading.Thread(target=self._run, name='update-checker', daemon=True)
+            self._thread.start()
+
+    def request_refresh(self):
+        """Wake the refresher early (rate-limited); never waits for the result"""
+        with self._lock:
+            if self._checking or (self._checked_at and time.time() - self._checked_at < self.min_interval):
+                return
+            self._checking = True
+        self._wake.set()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'info': self._info,
+                'checked_at': self._checked_at,
+                'error': self._error,
+                'checking': self._checking
+            }
+
+    def refresh(self):
+        """One conditional GET of the manifest; raises on network/HTTP errors"""
+        parts = urlsplit(self.url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        headers = {'User-Agent': f'TAKNET-PS/{VERSION}', 'Accept': 'application/json'}
+        with self._lock:
+            if self._info is not None:
+                if self._etag:
+                    headers['If-None-Match'] = self._etag
+                if self._last_modified:
+                    headers['If-Modified-Since'] = self._last_modified
+        
+        conn = connection_class(parts.netloc, timeout=self.timeout)
+        try:
+            conn.request('GET', parts.path + (f'?{parts.query}' if parts.query else ''), headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        finally:
+            conn.close()
+        
+        if response.status == 304:
+            info = None
+        elif response.status == 200:
+            info = json.loads(body)
+        else:
+            raise RuntimeError(f"HTTP {response.status}")
+        
+        with self._lock:
+            if info is not None:
+                if info != self._info:
+                    print(f"✓ Latest version from GitHub: {info.get('version', 'unknown')}")
+                self._info = info
+                self._etag = response.getheader('ETag')
+                self._last_modified = response.getheader('Last-Modified')
+            self._error = None
+        return response.status
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+                delay = self.ttl
+            except Exception as e:
+                print(f"⚠ Update check failed: {e}")
+                with self._lock:
+                    self._error = str(e)
+                delay = self.retry
+            
+            with self._lock:
+                self._checked_at = time.time()
+                self._checking = False
+            self._wake.wait(delay)
+            self._wake.clear()
+
+update_checker = UpdateChecker(UPDATE_MANIFEST_URL)
+
 @app.route('/api/system/version', methods=['GET'])
 def get_system_version():
-    """Get current version and check for updates"""
+    """
+    Get current version and the cached update check (never blocks on GitHub)
+    ?refresh=1 asks the background checker to re-check now; poll while `checking`
+    """
     try:
         # Read current version
         version_file = Path('/opt/adsb/VERSION')
@@ -3131,77 +6256,32 @@ def get_system_version():
         if version_file.exists():
             current_version = version_file.read_text().strip()
         
-        print(f"Current version from file: {current_version}")
+        if request.args.get('refresh') == '1':
+            update_checker.request_refresh()
+        state = update_checker.snapshot()
         
-        # Fetch latest version from GitHub
-        repo_url = 'https://raw.githubusercontent.com/cfd2474/TAKNET-PS_ADS-B_Feeder/main/version.json'
+        result = {
+            'success': True,
+            'current_version': current_version,
+            'latest_version': 'unknown',
+            'update_available': False,
+            'checked_at': state['checked_at'],
+            'checking': state['checking']
+        }
         
-        try:
-            import requests
-            response = requests.get(repo_url, timeout=10)
-            
-            if response.status_code == 200:
-                latest_info = response.json()
-                latest_version = latest_info.get('version', 'unknown')
-                
-                print(f"Latest version from GitHub: {latest_version}")
-                
-                # Compare versions
-                update_available = False
-                if current_version != 'unknown' and latest_version != 'unknown':
-                    try:
-                        # Parse version strings (format: X.Y.Z)
-                        current_parts = [int(x) for x in current_version.split('.')]
-                        latest_parts = [int(x) for x in latest_version.split('.')]
-                        
-                        # Pad to same length if needed (handle 2.47 vs 2.47.0)
-                        while len(current_parts) < len(latest_parts):
-                            current_parts.append(0)
-                        while len(latest_parts) < len(current_parts):
-                            latest_parts.append(0)
-                        
-                        # Compare major.minor.patch
-                        print(f"Comparing: {current_parts} vs {latest_parts}")
-                        
-                        if latest_parts > current_parts:
-                            update_available = True
-                            print(f"Update available: {current_version} → {latest_version}")
-                        else:
-                            print(f"No update needed: current={current_version}, latest={latest_version}")
-                    
-                    except (ValueError, AttributeError) as e:
-                        print(f"Version comparison error: {e}")
-                        # If can't parse, do string comparison as fallback
-                        update_available = (latest_version != current_version)
-                
-                return jsonify({
-                    'success': True,
-                    'current_version': current_version,
-                    'latest_version': latest_version,
-                    'update_available': update_available,
-                    'release_info': latest_info
-                })
-            else:
-                # Couldn't fetch from GitHub
-                print(f"GitHub fetch failed: HTTP {response.status_code}")
-                return jsonify({
-                    'success': True,
-                    'current_version': current_version,
-                    'latest_version': 'unknown',
-                    'update_available': False,
-                    'error': 'Could not check for updates'
-                })
-                
-        except Exception as e:
+        latest_info = state['info']
+        if latest_info is not None:
+            # Last good answer, even if the latest re-check failed
+            latest_version = latest_info.get('version', 'unknown')
+            result['latest_version'] = latest_version
+            result['update_available'] = is_newer_version(current_version, latest_version)
+            result['release_info'] = latest_info
+            result['stale'] = state['error'] is not None
+        elif state['error']:
             # Network error or GitHub unavailable
-            print(f"Update check error: {e}")
-            return jsonify({
-                'success': True,
-                'current_version': current_version,
-                'latest_version': 'unknown',
-                'update_available': False,
-                'error': f'Update check failed: {str(e)}'
-            })
+            result['error'] = f"Update check failed: {state['error']}"
+        
+        return jsonify(result)
     
     except Exception as e:
         print(f"❌ Error in get_system_version: {e}")
@@ -3238,14 +6318,14 @@ def trigger_system_update():
         # Output will be logged to /tmp/taknet_update.log
         subprocess.Popen(
             ['sudo', 'bash', str(updater_script)],
-            stdout=open('/tmp/taknet_update.log', 'w'),
+            stdout=open(UPDATE_LOG_FILE, 'w'),
             stderr=subprocess.STDOUT
         )
         
         return jsonify({
             'success': True,
             'message': 'Update started',
-            'log_file': '/tmp/taknet_update.log'
+            'log_file': str(UPDATE_LOG_FILE)
         })
     
     except Exception as e:
@@ -3260,23 +6340,29 @@ def trigger_system_update():
 
 @app.route('/api/system/update/status', methods=['GET'])
 def get_update_status():
-    """Get status of ongoing update"""
+    """
+    Get status of ongoing update
+    ?since=<cursor> (the previous response's cursor) returns only new log bytes;
+    reset=true means the log was replaced and `log` is a fresh 50-line tail
+    """
     try:
         update_lock = Path('/tmp/taknet_update.lock')
-        log_file = Path('/tmp/taknet_update.log')
         
         is_updating = update_lock.exists()
         
-        # Read last 50 lines of log
-        log_tail = []
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                log_tail = f.readlines()[-50:]
+        # Last 50 lines of log, or only what was appended since the client's cursor
+        since = request.args.get('since')
+        try:
+            data, cursor, reset = tail_file(UPDATE_LOG_FILE, 50, since)
+        except FileNotFoundError:
+            data, cursor, reset = b'', None, True
         
         return jsonify({
             'success': True,
             'is_updating': is_updating,
-            'log': ''.join(log_tail)
+            'log': data.decode('utf-8', 'replace'),
+            'cursor': cursor,
+            'reset': reset
         })
     
     except Exception as e:
@@ -3284,5 +6370,16 @@ def get_update_status():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 if __name__ == '__main__':
+    # Background workers
+    container_watcher.start()
+    tailscale_watcher.start()
+    feed_sampler.start()
+    receiver_history.start()
+    update_checker.start()
+    image_stager.start()
+    
+    # systemd stops us with SIGTERM; exit normally so atexit hooks (history flush) run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     # Run on all interfaces, port 5000
     app.run(host='0.0.0.0', port=5000, debug=False)
@@ -1,11 +1,7 @@
-// Auto-refresh status every 10 seconds
-let autoRefresh = setInterval(updateStatus, 10000);
+// Dashboard widgets are updated from the /api/events stream (see dashboard.html)
 
-async function updateNetworkStatus() {
+function applyNetworkStatus(data) {
     try {
-        const response = await fetch('/api/network-status');
-        const data = await response.json();
-        
         // Update internet status
         const internetStatus = document.getElementById('internet-status');
         if (internetStatus) {
@@ -38,41 +34,19 @@ async function updateNetworkStatus() {
         }
         
     } catch (error) {
-        console.error('Error fetching network status:', error);
+        console.error('Error updating network status:', error);
     }
 }
 
-// Update network status on load and every 10 seconds
-updateNetworkStatus();
-setInterval(updateNetworkStatus, 10000);
-
-async function updateStatus() {
+function applyContainerStatus(docker) {
     try {
-        const response = await fetch('/api/status');
-        const data = await response.json();
-        
-        // Update container status
+        // Update ultrafeeder status line (keeps the UUID block below it)
         const container = document.getElementById('container-status');
-        if (container && data.docker && data.docker.ultrafeeder) {
-            const isRunning = data.docker.ultrafeeder.includes('Up');
-            container.innerHTML = `
-                <div class="status-item">
-                    <span class="status-dot ${isRunning ? 'active' : 'inactive'}"></span>
-                    <span>ultrafeeder</span>
-                    <span class="status-text">${data.docker.ultrafeeder}</span>
-                </div>
-            `;
-        }
-        
-        // Update feeds (if element exists)
-        const feedsContainer = document.getElementById('active-feeds');
-        if (feedsContainer && data.feeds && data.feeds.length > 0) {
-            feedsContainer.innerHTML = data.feeds.map(feed => `
-                <div class="feed-item">
-                    <span class="status-dot active"></span>
-                    ${feed}
-                </div>
-            `).join('');
+        const statusItem = container ? container.querySelector('.status-item') : null;
+        if (statusItem && docker && docker.ultrafeeder) {
+            const isRunning = docker.ultrafeeder.includes('Up');
+            statusItem.querySelector('.status-dot').className = `status-dot ${isRunning ? 'active' : 'inactive'}`;
+            statusItem.querySelector('.status-text').textContent = docker.ultrafeeder;
         }
         
     } catch (error) {
@@ -94,9 +68,6 @@ async function restartService() {
         
         showStatus('✓ Service restarted successfully', 'success');
         
-        // Refresh status after a delay
-        setTimeout(updateStatus, 3000);
-        
     } catch (error) {
         showStatus('Error: ' + error.message, 'error');
     }
@@ -0,0 +1,58 @@
+// Background jobs: long operations return {job_id} and finish on the server
+// waitForJob() follows /api/jobs/<id>/events (polling /api/jobs/<id> if the
+// stream is unavailable) and resolves with the job's result payload
+
+function jobOutcome(job) {
+    return job.result || { success: false, message: job.error || 'Operation failed' };
+}
+
+function pollJob(jobId, onUpdate, since = 0) {
+    return new Promise((resolve) => {
+        const poll = async () => {
+            try {
+                const job = await (await fetch(`/api/jobs/${jobId}?since=${since}`)).json();
+                if (job.success === false) {
+                    resolve({ success: false, message: job.message || 'Job not found' });
+                    return;
+                }
+                since = job.log_next;
+                if (onUpdate) onUpdate(job);
+                if (job.finished_at) {
+                    resolve(jobOutcome(job));
+                    return;
+                }
+            } catch (error) {
+                // Server busy or restarting - keep polling
+            }
+            setTimeout(poll, 1000);
+        };
+        poll();
+    });
+}
+
+function waitForJob(jobId, onUpdate) {
+    if (!window.EventSource) {
+        return pollJob(jobId, onUpdate);
+    }
+
+    return new Promise((resolve) => {
+        const source = new EventSource(`/api/jobs/${jobId}/events`);
+        let since = 0;
+
+        source.addEventListener('job', (event) => {
+            const job = JSON.parse(event.data);
+            since = job.log_next;
+            if (onUpdate) onUpdate(job);
+            if (job.finished_at) {
+                source.close();
+                resolve(jobOutcome(job));
+            }
+        });
+
+        source.onerror = () => {
+            // Stream dropped (proxy, restart): finish by polling from where we were
+            source.close();
+            pollJob(jobId, onUpdate, since).then(resolve);
+        };
+    });
+}